@@ -0,0 +1,97 @@
+-- Multi-table full-text search used by SupabaseDatabaseClient.search
+--
+-- Run once in the Supabase SQL editor. Searches every requested table in a
+-- single UNION ALL statement so the client needs one HTTP round trip.
+--
+-- Security:
+--   * Only tables in the public schema are searchable (auth, storage, realtime
+--     and system schemas can never be reached), and pg_* names are rejected.
+--   * If search_allowed_tables has rows, only those tables are searchable,
+--     whatever the client asks for.
+--   * The function runs as the caller (SECURITY INVOKER) so RLS still applies.
+--   * Restricted columns passed in `excluded` are removed before the records
+--     leave the database.
+
+CREATE TABLE IF NOT EXISTS search_allowed_tables (
+    table_name TEXT PRIMARY KEY
+);
+
+DROP FUNCTION IF EXISTS multi_table_search(TEXT, TEXT[], TEXT[], INT);
+
+-- excluded maps table name -> array of column names stripped from returned records
+CREATE OR REPLACE FUNCTION multi_table_search(
+    q TEXT,
+    tables TEXT[],
+    fields TEXT[],
+    lim INT DEFAULT 10,
+    excluded JSONB DEFAULT '{}'::JSONB
+)
+RETURNS TABLE (source_table TEXT, record JSONB)
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+AS $$
+DECLARE
+    t TEXT;
+    cols TEXT[];
+    where_clause TEXT;
+    rank_document TEXT;
+    excluded_columns TEXT[];
+    parts TEXT[] := '{}';
+    whitelist_enabled BOOLEAN;
+BEGIN
+    SELECT EXISTS (SELECT 1 FROM search_allowed_tables) INTO whitelist_enabled;
+
+    FOREACH t IN ARRAY tables LOOP
+        IF t LIKE 'pg\_%' THEN
+            CONTINUE;
+        END IF;
+
+        IF whitelist_enabled AND NOT EXISTS (
+            SELECT 1 FROM search_allowed_tables a WHERE a.table_name = t
+        ) THEN
+            CONTINUE;
+        END IF;
+
+        -- Requested fields that exist as text columns on this public table
+        SELECT array_agg(c.column_name::TEXT ORDER BY c.ordinal_position)
+          INTO cols
+          FROM information_schema.columns c
+         WHERE c.table_schema = 'public'
+           AND c.table_name = t
+           AND c.column_name = ANY (fields)
+           AND c.data_type IN ('character varying', 'varchar', 'text', 'char', 'character');
+
+        IF cols IS NULL THEN
+            CONTINUE;
+        END IF;
+
+        SELECT string_agg(format('to_tsvector(''simple'', coalesce(%I, '''')) @@ _q', col), ' OR '),
+               string_agg(format('coalesce(%I, '''')', col), ' || '' '' || ')
+          INTO where_clause, rank_document
+          FROM unnest(cols) AS col;
+
+        SELECT coalesce(array_agg(col), '{}')
+          INTO excluded_columns
+          FROM jsonb_array_elements_text(coalesce(excluded -> t, '[]'::JSONB)) AS col;
+
+        parts := parts || format(
+            '(SELECT %L::TEXT AS source_table, to_jsonb(_t) - %L::TEXT[] AS record, '
+            'ts_rank_cd(to_tsvector(''simple'', %s), _q) AS _rank '
+            'FROM public.%I _t, plainto_tsquery(''simple'', $1) _q '
+            'WHERE %s ORDER BY _rank DESC LIMIT $2)',
+            t, excluded_columns, rank_document, t, where_clause
+        );
+    END LOOP;
+
+    IF coalesce(array_length(parts, 1), 0) = 0 THEN
+        RETURN;
+    END IF;
+
+    RETURN QUERY EXECUTE
+        'SELECT source_table, record FROM ('
+        || array_to_string(parts, ' UNION ALL ')
+        || ') _u ORDER BY _rank DESC LIMIT $2'
+    USING q, lim;
+END;
+$$;
@@ -4,8 +4,43 @@ PostgreSQL database client adapter for Fantastic Router
 
 import asyncpg
 import json
-from typing import List, Dict, Any, Optional
+import re
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, FrozenSet, Tuple
 import asyncio
+import time
+import weakref
+
+
+def _is_valid_identifier(name: str) -> bool:
+    """Check that a table/column name is safe to interpolate into SQL"""
+    return bool(name) and name.replace('_', '').isalnum()
+
+
+# Supported values for PostgreSQLDatabaseClient(search_mode=...)
+SEARCH_MODES = ("fts", "ilike", "similarity")
+
+# Fallback columns searched when none of the requested fields exist on a table
+_COMMON_SEARCH_FIELDS = ('name', 'email', 'address', 'title')
+
+# Connection pools shared by every client with the same DSN: event loop -> DSN -> [pool task, ref count].
+# Keyed by loop because asyncpg pools are bound to the loop that created them.
+_SHARED_POOLS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, list]]" = weakref.WeakKeyDictionary()
+
+# Connection probes per DSN (same per-loop keying): DSN -> (probe task, started at). Successful
+# probes are trusted for _HEALTH_TTL seconds so clients sharing a DSN don't repeat SELECT 1;
+# failed ones are dropped and retried.
+_HEALTH_PROBES: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Tuple[asyncio.Task, float]]]" = weakref.WeakKeyDictionary()
+_HEALTH_TTL = 30.0
+
+
+def _pool_ready(task: "asyncio.Future") -> Optional[asyncpg.Pool]:
+    """Return the pool a creation task produced, or None if it is pending, failed or closing"""
+    if not task.done() or task.cancelled() or task.exception() is not None:
+        return None
+    pool = task.result()
+    return None if pool.is_closing() else pool
+
 
 class PostgreSQLDatabaseClient:
     """PostgreSQL client that implements the DatabaseClient protocol"""
@@ -17,13 +52,39 @@ class PostgreSQLDatabaseClient:
         timeout: int = 30,
         restricted_tables: Optional[List[str]] = None,
         restricted_columns: Optional[Dict[str, List[str]]] = None,
-        allowed_tables: Optional[List[str]] = None
+        allowed_tables: Optional[List[str]] = None,
+        searchable_columns: Optional[Dict[str, List[str]]] = None,
+        search_mode: str = "fts",
+        min_connections: Optional[int] = None,
+        max_inactive_connection_lifetime: float = 600,
+        schema_ttl: float = 300,
+        batch_window_ms: Optional[float] = None,
+        max_batch: int = 32
     ):
+        if search_mode not in SEARCH_MODES:
+            raise ValueError(f"Invalid search mode: {search_mode}. Expected one of {SEARCH_MODES}")
+        
         self.connection_string = connection_string
         self.max_connections = max_connections
+        # Keep a warm core of connections but leave room to grow under bursts
+        self.min_connections = min_connections if min_connections is not None else max(2, max_connections // 4)
+        self.min_connections = min(self.min_connections, max_connections)
+        # Long-lived idle connections keep their prepared statement caches
+        self.max_inactive_connection_lifetime = max_inactive_connection_lifetime
         self.timeout = timeout
         self.pool: Optional[asyncpg.Pool] = None
-        self._schema_cache: Dict[str, List[str]] = {}  # Cache table columns
+        self._init_lock = asyncio.Lock()  # Concurrent first calls must not each take a pool reference
+        self._schema_cache: Dict[str, FrozenSet[str]] = {}  # Cache searchable text columns per table
+        self._search_semaphore = asyncio.Semaphore(max(1, max_connections - 1))
+        self._sql_cache: Dict[tuple, str] = {}  # (table, fields) -> search SQL
+        self._schema_full_cache: Optional[Tuple[float, Dict[str, Any]]] = None  # (loaded_at, get_schema result)
+        self._schema_ttl = schema_ttl
+        
+        # Optional coalescing of concurrent search() calls into one search_many() round trip
+        self._batch_window = batch_window_ms / 1000 if batch_window_ms else None
+        self._max_batch = max_batch
+        self._pending_searches: Dict[tuple, List[Tuple[str, asyncio.Future]]] = {}  # (tables, fields, limit) -> waiting calls
+        self._flush_tasks: set = set()  # Strong refs so running flushes aren't collected
         
         # Security: Restricted tables/columns that should never be accessed
         self.restricted_tables = set(restricted_tables or [
@@ -80,25 +141,183 @@ class PostgreSQLDatabaseClient:
         
         # Security: Whitelist of allowed tables (if specified, only these are accessible)
         self.allowed_tables = set(allowed_tables) if allowed_tables else None
+        
+        # Precompiled forms of the rules above, checked on every search
+        self._restricted_re = re.compile(
+            '|'.join(re.escape(restricted.lower()) for restricted in self.restricted_tables)
+        ) if self.restricted_tables else None
+        self._restricted_column_sets = {
+            table: frozenset(columns) for table, columns in self.restricted_columns.items()
+        }
+        
+        # Columns that get a GIN index at startup (table -> fields)
+        self.searchable_columns = searchable_columns or {}
+        
+        # "fts" (tokenized full-text), "ilike" (substring) or "similarity" (trigram ranked)
+        self.search_mode = search_mode
     
     async def initialize(self):
         """Initialize the connection pool"""
+        if self.pool:
+            return
+        
+        async with self._init_lock:
+            if not self.pool:
+                self.pool = await self._acquire_shared_pool()
+                await self._preload_schema_cache()
+                if self.search_mode == "fts":
+                    await self.ensure_indexes()
+                else:
+                    await self.ensure_trgm_indexes()
+    
+    async def ensure_indexes(self, table_fields: Optional[Dict[str, List[str]]] = None):
+        """
+        Create full-text GIN indexes for searchable columns
+        
+        The index expression matches the one emitted by _build_search_query,
+        so the per-field @@ conditions can be served by a bitmap index scan.
+        
+        Args:
+            table_fields: Mapping of table name to columns. Defaults to searchable_columns.
+        """
+        table_fields = self.searchable_columns if table_fields is None else table_fields
+        if not table_fields:
+            return
+        
+        if not self.pool:
+            await self.initialize()
+        
+        async with self.pool.acquire() as conn:
+            for table, field in self._index_targets(table_fields):
+                try:
+                    await conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS idx_{table}_{field}_fts "
+                        f"ON {table} USING GIN (to_tsvector('simple', coalesce({field}, '')))"
+                    )
+                except Exception as e:
+                    print(f"Error creating full-text index on {table}.{field}: {e}")
+    
+    async def ensure_trgm_indexes(self, table_fields: Optional[Dict[str, List[str]]] = None):
+        """
+        Create pg_trgm GIN indexes for searchable columns
+        
+        Trigram indexes serve plain `field ILIKE '%...%'` and `field % query`
+        conditions. The column must not be wrapped in lower(), or the index
+        can no longer be used.
+        
+        Args:
+            table_fields: Mapping of table name to columns. Defaults to searchable_columns.
+        """
+        table_fields = self.searchable_columns if table_fields is None else table_fields
+        if not table_fields:
+            return
+        
         if not self.pool:
-            self.pool = await asyncpg.create_pool(
+            await self.initialize()
+        
+        async with self.pool.acquire() as conn:
+            try:
+                await conn.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            except Exception as e:
+                print(f"Error creating pg_trgm extension: {e}")
+                return
+            
+            for table, field in self._index_targets(table_fields):
+                try:
+                    await conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS idx_{table}_{field}_trgm "
+                        f"ON {table} USING GIN ({field} gin_trgm_ops)"
+                    )
+                except Exception as e:
+                    print(f"Error creating trigram index on {table}.{field}: {e}")
+    
+    async def _preload_schema_cache(self):
+        """Load the text columns of every public table with a single catalog query"""
+        columns_by_table: Dict[str, List[str]] = {}
+        
+        try:
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch(
+                    """SELECT table_name, column_name 
+                       FROM information_schema.columns 
+                       WHERE table_schema = 'public'
+                       AND data_type IN ('character varying', 'varchar', 'text', 'char', 'character')"""
+                )
+        except Exception as e:
+            print(f"Error preloading schema cache: {e}")
+            return
+        
+        for row in rows:
+            columns_by_table.setdefault(row['table_name'], []).append(row['column_name'])
+        
+        for table, columns in columns_by_table.items():
+            # Security: Filter out restricted columns
+            self._schema_cache[table] = frozenset(self._filter_restricted_columns(table, columns))
+    
+    def _index_targets(self, table_fields: Dict[str, List[str]]):
+        """Yield (table, field) pairs that are safe and allowed to index"""
+        for table, fields in table_fields.items():
+            if not _is_valid_identifier(table) or not self._validate_table_access(table):
+                continue
+            
+            for field in fields:
+                if _is_valid_identifier(field) and self._validate_column_access(table, field):
+                    yield table, field
+    
+    async def _acquire_shared_pool(self) -> asyncpg.Pool:
+        """
+        Return the pool shared by all clients using this DSN, creating it on first use
+        
+        The first client to connect decides the pool's size and timeouts.
+        """
+        pools = _SHARED_POOLS.setdefault(asyncio.get_running_loop(), {})
+        entry = pools.get(self.connection_string)
+        
+        # Start a new pool unless one exists or is still being created
+        if entry is None or (entry[0].done() and _pool_ready(entry[0]) is None):
+            entry = [asyncio.ensure_future(asyncpg.create_pool(
                 self.connection_string,
+                min_size=self.min_connections,
                 max_size=self.max_connections,
-                timeout=self.timeout
-            )
+                max_inactive_connection_lifetime=self.max_inactive_connection_lifetime,
+                timeout=self.timeout,
+                command_timeout=self.timeout,  # Bound every query, not just connection setup
+                statement_cache_size=1024  # Search SQL is stable per (table, fields), so plans get reused
+            )), 0]
+            pools[self.connection_string] = entry
+        
+        try:
+            pool = await asyncio.shield(entry[0])
+        except Exception:
+            if pools.get(self.connection_string) is entry:
+                del pools[self.connection_string]
+            raise
+        
+        entry[1] += 1
+        return pool
     
     async def close(self):
-        """Close the connection pool"""
-        if self.pool:
-            await self.pool.close()
+        """Release the connection pool, closing it once no other client uses it"""
+        if not self.pool:
+            return
+        
+        pools = _SHARED_POOLS.get(asyncio.get_running_loop(), {})
+        entry = pools.get(self.connection_string)
+        if entry is not None and _pool_ready(entry[0]) is self.pool:
+            entry[1] -= 1
+            if entry[1] > 0:
+                self.pool = None
+                return
+            del pools[self.connection_string]
+        
+        _HEALTH_PROBES.get(asyncio.get_running_loop(), {}).pop(self.connection_string, None)
+        await self.pool.close()
+        self.pool = None
     
     def _validate_table_access(self, table: str) -> bool:
         """Validate if a table can be accessed based on security rules"""
         # Check if table is in restricted list
-        if any(restricted in table.lower() for restricted in self.restricted_tables):
+        if self._restricted_re is not None and self._restricted_re.search(table.lower()):
             return False
         
         # Check if table is in allowed list (whitelist mode)
@@ -110,17 +329,18 @@ class PostgreSQLDatabaseClient:
     def _validate_column_access(self, table: str, column: str) -> bool:
         """Validate if a column can be accessed based on security rules"""
         # Check if column is restricted for this table
-        if table in self.restricted_columns and column in self.restricted_columns[table]:
+        restricted = self._restricted_column_sets.get(table)
+        if restricted is not None and column in restricted:
             return False
         
         return True
     
     def _filter_restricted_columns(self, table: str, columns: List[str]) -> List[str]:
         """Filter out restricted columns from a list"""
-        if table not in self.restricted_columns:
+        restricted = self._restricted_column_sets.get(table)
+        if restricted is None:
             return columns
         
-        restricted = set(self.restricted_columns[table])
         return [col for col in columns if col not in restricted]
     
     async def search(
@@ -140,65 +360,268 @@ class PostgreSQLDatabaseClient:
             limit: Maximum number of results
             
         Returns:
-            List of matching records as dictionaries
+            List of matching records as dictionaries. Rows are built server-side with
+            to_jsonb, so values come back as their JSON equivalents: UUID, timestamp and
+            date columns are strings and numeric columns are int/float (not Decimal).
+        """
+        
+        if self._batch_window is not None:
+            return await self._search_batched(query, tables, fields, limit)
+        return await self._search(query, tables, fields, limit)
+    
+    async def _search_batched(
+        self,
+        query: str,
+        tables: List[str],
+        fields: List[str],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """Queue a search so calls arriving within the batch window share one search_many()"""
+        loop = asyncio.get_running_loop()
+        key = (tuple(tables), tuple(fields), limit)
+        
+        batch = self._pending_searches.get(key)
+        if batch is None:
+            batch = self._pending_searches[key] = []
+            loop.call_later(self._batch_window, self._flush_searches, key, batch)
+        
+        future = loop.create_future()
+        batch.append((query, future))
+        
+        if len(batch) >= self._max_batch:
+            self._flush_searches(key, batch)
+        
+        return await future
+    
+    def _flush_searches(self, key: tuple, batch: List[Tuple[str, asyncio.Future]]):
+        """Dispatch a pending batch unless it was already flushed"""
+        if self._pending_searches.get(key) is not batch:
+            return
+        del self._pending_searches[key]
+        
+        task = asyncio.ensure_future(self._run_search_batch(key, batch))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+    
+    async def _run_search_batch(self, key: tuple, batch: List[Tuple[str, asyncio.Future]]):
+        """Run one batch and resolve each caller's future"""
+        tables, fields, limit = list(key[0]), list(key[1]), key[2]
+        
+        try:
+            if len(batch) == 1:
+                results = [await self._search(batch[0][0], tables, fields, limit)]
+            else:
+                results = await self.search_many([query for query, _ in batch], tables, fields, limit)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), result in zip(batch, results):
+            if not future.done():  # Caller may have given up (e.g. cancelled)
+                future.set_result(result)
+    
+    async def _search(
+        self,
+        query: str,
+        tables: List[str],
+        fields: List[str],
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Run a single search (the unbatched path of search())"""
+        
+        if not self.pool:
+            await self.initialize()
+        
+        params = [query, limit]
+        
+        async with self.pool.acquire() as conn:
+            table_queries = await self._table_search_queries(conn, tables, fields)
+            
+            if not table_queries:
+                return []
+            
+            # Every per-table query binds the same ($1 query, $2 limit) parameters,
+            # so all tables can be searched in a single round trip
+            union = "\nUNION ALL\n".join(f"({q})" for q in table_queries.values())
+            
+            # Aggregate server-side so the whole result comes back as one JSON value:
+            # a single decode instead of materialising a Record and a dict per row
+            sql = f"""
+            SELECT coalesce(jsonb_agg(_record ORDER BY _rank DESC), '[]'::jsonb)
+            FROM ({union}\nORDER BY _rank DESC\nLIMIT $2) _u
+            """
+            
+            try:
+                return json.loads(await conn.fetchval(sql, *params))
+            except Exception as e:
+                print(f"Error searching tables {list(table_queries)}: {e}")
+        
+        # The combined statement fails as a whole if any table errors; retry each table
+        # concurrently on its own connection so the healthy ones still return results
+        results_lists = await asyncio.gather(
+            *[self._search_one(table, sql, params) for table, sql in table_queries.items()],
+            return_exceptions=True
+        )
+        
+        rows = []
+        for table, result in zip(table_queries, results_lists):
+            if isinstance(result, Exception):
+                print(f"Error searching table {table}: {result}")
+                continue
+            rows.extend(result)
+        
+        rows.sort(key=lambda row: row['_rank'], reverse=True)
+        return [json.loads(row['_record']) for row in rows[:limit]]
+    
+    async def search_many(
+        self,
+        queries: List[str],
+        tables: List[str],
+        fields: List[str],
+        limit: int = 10
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run several searches over the same tables in a single round trip
+        
+        Args:
+            queries: Search query strings
+            tables: List of table names to search
+            fields: List of field names to search in
+            limit: Maximum number of results per query
+            
+        Returns:
+            One list of matching records per query, in the same order as queries,
+            with the same JSON-typed values as search()
         """
         
+        if not queries:
+            return []
+        
         if not self.pool:
             await self.initialize()
         
-        results = []
+        results: List[List[Dict[str, Any]]] = [[] for _ in queries]
         
         async with self.pool.acquire() as conn:
-            for table in tables:
-                try:
-                    # Security: Validate table access
-                    if not self._validate_table_access(table):
-                        continue  # Skip restricted tables
-                    
-                    # Use cached columns if available
-                    if table in self._schema_cache:
-                        available_columns = self._schema_cache[table]
-                    else:
-                        # Get actual text/searchable columns for this table
-                        table_columns = await conn.fetch(
-                            """SELECT column_name, data_type 
-                               FROM information_schema.columns 
-                               WHERE table_name = $1 AND table_schema = 'public'
-                               AND data_type IN ('character varying', 'varchar', 'text', 'char', 'character')""",
-                            table
-                        )
-                        available_columns = [row['column_name'] for row in table_columns]
-                        # Security: Filter out restricted columns
-                        available_columns = self._filter_restricted_columns(table, available_columns)
-                        self._schema_cache[table] = available_columns  # Cache for next time
-                    
-                    # Filter fields to only include existing and allowed columns
-                    valid_fields = [field for field in fields if field in available_columns]
-                    
-                    if not valid_fields:
-                        # If no specified fields exist, try common search fields
-                        common_fields = ['name', 'email', 'address', 'title']
-                        valid_fields = [field for field in common_fields if field in available_columns]
-                    
-                    if not valid_fields:
-                        continue  # Skip this table if no searchable fields
-                    
-                    # Build search query with valid fields only
-                    sql, params = self._build_search_query(query, table, valid_fields, limit)
-                    
-                    # Execute query
-                    rows = await conn.fetch(sql, *params)
-                    
-                    # Convert to dictionaries
-                    for row in rows:
-                        record = dict(row)
-                        results.append(record)
-                        
-                except Exception as e:
-                    print(f"Error searching table {table}: {e}")
-                    continue
+            table_queries = await self._table_search_queries(conn, tables, fields)
+            if not table_queries:
+                return results
+            
+            # Same per-table statements as search(), but evaluated once per element of the
+            # query array via LATERAL instead of once per call
+            union = "\nUNION ALL\n".join(
+                f"({q.replace('$1', '_qs._query')})" for q in table_queries.values()
+            )
+            sql = f"""
+            SELECT _qs._idx, coalesce(jsonb_agg(_u._record ORDER BY _u._rank DESC), '[]'::jsonb) AS _records
+            FROM unnest($1::text[]) WITH ORDINALITY AS _qs(_query, _idx)
+            CROSS JOIN LATERAL ({union}\nORDER BY _rank DESC\nLIMIT $2) _u
+            GROUP BY _qs._idx
+            """
+            
+            try:
+                rows = await conn.fetch(sql, queries, limit)
+            except Exception as e:
+                print(f"Error searching tables {list(table_queries)}: {e}")
+                return results
+        
+        for row in rows:
+            results[row['_idx'] - 1] = json.loads(row['_records'])
+        
+        return results
+    
+    async def batch_search(self, requests: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Run several independent searches, each described by search() keyword arguments
+        
+        Requests with the same tables, fields and limit are grouped into one
+        search_many() statement; the groups run concurrently on separate pool
+        connections, so the whole batch costs about one round trip.
+        
+        Args:
+            requests: Dicts with "query", "tables", "fields" and optional "limit" (default 10)
+            
+        Returns:
+            One list of matching records per request, in the same order as requests
+        """
+        
+        groups: Dict[tuple, List[int]] = defaultdict(list)
+        for i, request in enumerate(requests):
+            groups[(tuple(request["tables"]), tuple(request["fields"]), request.get("limit", 10))].append(i)
+        
+        async def run_group(key: tuple, indexes: List[int]) -> List[List[Dict[str, Any]]]:
+            tables, fields, limit = list(key[0]), list(key[1]), key[2]
+            if len(indexes) == 1:
+                return [await self._search(requests[indexes[0]]["query"], tables, fields, limit)]
+            return await self.search_many([requests[i]["query"] for i in indexes], tables, fields, limit)
+        
+        if groups and not self.pool:
+            await self.initialize()
+        
+        group_results = await asyncio.gather(*[run_group(key, indexes) for key, indexes in groups.items()])
+        
+        results: List[List[Dict[str, Any]]] = [[] for _ in requests]
+        for indexes, group_result in zip(groups.values(), group_results):
+            for i, result in zip(indexes, group_result):
+                results[i] = result
+        
+        return results
+    
+    async def _table_search_queries(self, conn, tables: List[str], fields: List[str]) -> Dict[str, str]:
+        """Resolve searchable fields for each allowed table and build its search SQL"""
+        table_queries = {}
+        
+        for table in tables:
+            try:
+                # Security: Validate table access
+                if not self._validate_table_access(table):
+                    continue  # Skip restricted tables
+                
+                # Columns are preloaded at initialize(); only tables created since need a lookup
+                if table in self._schema_cache:
+                    available_columns = self._schema_cache[table]
+                else:
+                    # Get actual text/searchable columns for this table
+                    table_columns = await conn.fetch(
+                        """SELECT column_name, data_type 
+                           FROM information_schema.columns 
+                           WHERE table_name = $1 AND table_schema = 'public'
+                           AND data_type IN ('character varying', 'varchar', 'text', 'char', 'character')""",
+                        table
+                    )
+                    # Security: Filter out restricted columns
+                    available_columns = frozenset(self._filter_restricted_columns(
+                        table, [row['column_name'] for row in table_columns]
+                    ))
+                    self._schema_cache[table] = available_columns  # Cache for next time
+                
+                # Filter fields to only include existing and allowed columns
+                valid_fields = [field for field in fields if field in available_columns]
+                
+                if not valid_fields:
+                    # If no specified fields exist, try common search fields
+                    valid_fields = [field for field in _COMMON_SEARCH_FIELDS if field in available_columns]
+                
+                if not valid_fields:
+                    continue  # Skip this table if no searchable fields
+                
+                # Build search query with valid fields only (query text and limit are bound later)
+                table_queries[table], _ = self._build_search_query("", table, valid_fields, 0)
+                
+            except Exception as e:
+                print(f"Error searching table {table}: {e}")
+                continue
         
-        return results[:limit]  # Ensure we don't exceed limit
+        return table_queries
+    
+    async def _search_one(self, table: str, sql: str, params: List[Any]) -> List[Any]:
+        """Run a single table's search query on its own pool connection"""
+        # Leave one connection free for the caller and other requests
+        async with self._search_semaphore:
+            async with self.pool.acquire() as conn:
+                return await conn.fetch(sql, *params)
     
     def _build_search_query(
         self,
@@ -207,52 +630,52 @@ class PostgreSQLDatabaseClient:
         fields: List[str],
         limit: int
     ) -> tuple[str, List[Any]]:
-        """Build SQL search query with parameters"""
+        """Build a ranked search query for one table with parameters"""
+        
+        # The SQL only depends on table and fields; the query text is always bound as $1
+        cache_key = (table, tuple(fields))
+        sql = self._sql_cache.get(cache_key)
+        if sql is not None:
+            return sql, [query, limit]
         
         # Sanitize table name (basic protection)
-        if not table.replace('_', '').isalnum():
+        if not _is_valid_identifier(table):
             raise ValueError(f"Invalid table name: {table}")
         
-        # Build WHERE conditions for each field
-        where_conditions = []
-        params = []
+        # Sanitize field names
+        fields = [field for field in fields if _is_valid_identifier(field)]
+        if not fields:
+            raise ValueError(f"No valid search fields for table: {table}")
         
-        for i, field in enumerate(fields):
-            # Sanitize field name
-            if not field.replace('_', '').isalnum():
-                continue
-            
-            # Add ILIKE condition for case-insensitive search
-            where_conditions.append(f"{field} ILIKE ${len(params) + 1}")
-            params.append(f"%{query}%")
-        
-        if not where_conditions:
-            # Fallback: search all text fields
-            where_conditions = [f"CAST(column_name AS TEXT) ILIKE ${len(params) + 1}"]
-            params.append(f"%{query}%")
-        
-        # Combine conditions with OR
-        where_clause = " OR ".join(where_conditions)
+        # One condition per field so each can use its own GIN index
+        if self.search_mode == "ilike":
+            # Plain ILIKE (no lower()) so pg_trgm indexes apply
+            where_clause = " OR ".join(f"{field} ILIKE '%' || $1 || '%'" for field in fields)
+            rank = f"CASE WHEN {fields[0]} ILIKE $1 THEN 1.0 ELSE 0.5 END"
+            source = f"{table} _t"
+        elif self.search_mode == "similarity":
+            where_clause = " OR ".join(f"{field} % $1" for field in fields)
+            rank = f"GREATEST({', '.join(f'similarity({field}, $1)' for field in fields)})"
+            source = f"{table} _t"
+        else:
+            where_clause = " OR ".join(
+                f"to_tsvector('simple', coalesce({field}, '')) @@ _q" for field in fields
+            )
+            # Rank against all fields combined
+            document = " || ' ' || ".join(f"coalesce({field}, '')" for field in fields)
+            rank = f"ts_rank_cd(to_tsvector('simple', {document}), _q)"
+            source = f"{table} _t, plainto_tsquery('simple', $1) _q"
         
-        # Build final query
         sql = f"""
-        SELECT * 
-        FROM {table} 
+        SELECT to_jsonb(_t) AS _record, {rank} AS _rank
+        FROM {source}
         WHERE {where_clause}
-        ORDER BY 
-            CASE 
-                WHEN {fields[0] if fields else 'id'} ILIKE ${len(params) + 1} THEN 1
-                ELSE 2 
-            END,
-            {fields[0] if fields else 'id'}
-        LIMIT ${len(params) + 2}
+        ORDER BY _rank DESC
+        LIMIT $2
         """
         
-        # Add exact match parameter for ordering
-        params.append(query)
-        params.append(limit)
-        
-        return sql, params
+        self._sql_cache[cache_key] = sql
+        return sql, [query, limit]
     
     async def get_schema(self) -> Dict[str, Any]:
         """Get database schema information"""
@@ -260,72 +683,91 @@ class PostgreSQLDatabaseClient:
         if not self.pool:
             await self.initialize()
         
+        # Schema changes rarely; serve it from memory within the TTL
+        if self._schema_full_cache is not None:
+            cached_at, cached_schema = self._schema_full_cache
+            if time.monotonic() - cached_at < self._schema_ttl:
+                return cached_schema
+        
         schema = {"tables": {}, "relationships": {}}
         
         async with self.pool.acquire() as conn:
-            # Get table information
-            tables_query = """
+            # Columns and their foreign key target (if any) in one catalog round trip
+            schema_query = """
             SELECT 
-                table_name,
-                column_name,
-                data_type,
-                is_nullable,
-                column_default
-            FROM information_schema.columns
-            WHERE table_schema = 'public'
-            ORDER BY table_name, ordinal_position
+                c.table_name,
+                c.column_name,
+                c.data_type,
+                c.is_nullable,
+                fk.foreign_key
+            FROM information_schema.columns AS c
+            LEFT JOIN (
+                SELECT
+                    tc.table_name,
+                    kcu.column_name,
+                    max(ccu.table_name || '.' || ccu.column_name) AS foreign_key
+                FROM information_schema.table_constraints AS tc
+                JOIN information_schema.key_column_usage AS kcu
+                    ON tc.constraint_name = kcu.constraint_name
+                    AND tc.table_schema = kcu.table_schema
+                JOIN information_schema.constraint_column_usage AS ccu
+                    ON ccu.constraint_name = tc.constraint_name
+                    AND ccu.table_schema = tc.table_schema
+                WHERE tc.constraint_type = 'FOREIGN KEY'
+                    AND tc.table_schema = 'public'
+                GROUP BY tc.table_name, kcu.column_name
+            ) AS fk
+                ON fk.table_name = c.table_name
+                AND fk.column_name = c.column_name
+            WHERE c.table_schema = 'public'
+            ORDER BY c.table_name, c.ordinal_position
             """
             
-            rows = await conn.fetch(tables_query)
-            
-            # Group by table
-            for row in rows:
-                table_name = row['table_name']
-                
-                if table_name not in schema["tables"]:
-                    schema["tables"][table_name] = {
-                        "name": table_name,
-                        "columns": [],
-                        "primary_key": "id"  # Assume 'id' for now
-                    }
-                
-                schema["tables"][table_name]["columns"].append({
-                    "name": row['column_name'],
-                    "type": row['data_type'],
-                    "nullable": row['is_nullable'] == 'YES',
-                    "description": None  # Could be enhanced with comments
-                })
-            
-            # Get foreign key relationships
-            fk_query = """
-            SELECT
-                tc.constraint_name,
-                tc.table_name,
-                kcu.column_name,
-                ccu.table_name AS foreign_table_name,
-                ccu.column_name AS foreign_column_name
-            FROM information_schema.table_constraints AS tc
-            JOIN information_schema.key_column_usage AS kcu
-                ON tc.constraint_name = kcu.constraint_name
-                AND tc.table_schema = kcu.table_schema
-            JOIN information_schema.constraint_column_usage AS ccu
-                ON ccu.constraint_name = tc.constraint_name
-                AND ccu.table_schema = tc.table_schema
-            WHERE tc.constraint_type = 'FOREIGN KEY'
-                AND tc.table_schema = 'public'
-            """
+            rows = await conn.fetch(schema_query)
+        
+        # Group by table
+        tables = defaultdict(lambda: {"name": "", "columns": [], "primary_key": "id"})  # Assume 'id' for now
+        relationships = schema["relationships"]
+        type_names: Dict[str, str] = {}  # Share one string per distinct data_type
+        
+        for row in rows:
+            table_name = row['table_name']
+            column_name = row['column_name']
+            data_type = row['data_type']
             
-            fk_rows = await conn.fetch(fk_query)
+            table = tables[table_name]
+            table["name"] = table_name
+            table["columns"].append({
+                "name": column_name,
+                "type": type_names.setdefault(data_type, data_type),
+                "nullable": row['is_nullable'] == 'YES',
+                "description": None  # Could be enhanced with comments
+            })
             
-            for row in fk_rows:
-                key = f"{row['table_name']}.{row['column_name']}"
-                value = f"{row['foreign_table_name']}.{row['foreign_column_name']}"
-                schema["relationships"][key] = value
+            foreign_key = row['foreign_key']
+            if foreign_key:
+                relationships[f"{table_name}.{column_name}"] = foreign_key
+        
+        schema["tables"] = dict(tables)
         
+        self._schema_full_cache = (time.monotonic(), schema)
         return schema
     
     async def test_connection(self) -> bool:
-        """Test database connection"""
+        """Test database connection (at most once per DSN every _HEALTH_TTL seconds; concurrent callers share the probe)"""
+        
+        probes = _HEALTH_PROBES.setdefault(asyncio.get_running_loop(), {})
+        entry = probes.get(self.connection_string)
+        if entry is None or time.monotonic() - entry[1] >= _HEALTH_TTL:
+            entry = probes[self.connection_string] = (asyncio.ensure_future(self._probe_connection()), time.monotonic())
+        
+        healthy = await asyncio.shield(entry[0])
+        if not healthy and probes.get(self.connection_string) is entry:
+            del probes[self.connection_string]  # Let the next call probe again
+        return healthy
+    
+    async def _probe_connection(self) -> bool:
+        """Run SELECT 1 against the pool"""
         
         try:
             if not self.pool:
@@ -347,11 +789,18 @@ def create_postgres_client(
     database: str,
     username: str,
     password: str,
-    max_connections: int = 10,
+    max_connections: int = 25,
     timeout: int = 30,
     restricted_tables: Optional[List[str]] = None,
     restricted_columns: Optional[Dict[str, List[str]]] = None,
-    allowed_tables: Optional[List[str]] = None
+    allowed_tables: Optional[List[str]] = None,
+    searchable_columns: Optional[Dict[str, List[str]]] = None,
+    search_mode: str = "fts",
+    min_connections: Optional[int] = None,
+    max_inactive_connection_lifetime: float = 600,
+    schema_ttl: float = 300,
+    batch_window_ms: Optional[float] = None,
+    max_batch: int = 32
 ) -> PostgreSQLDatabaseClient:
     """Create a PostgreSQL database client"""
     
@@ -363,5 +812,12 @@ def create_postgres_client(
         timeout=timeout,
         restricted_tables=restricted_tables,
         restricted_columns=restricted_columns,
-        allowed_tables=allowed_tables
+        allowed_tables=allowed_tables,
+        searchable_columns=searchable_columns,
+        search_mode=search_mode,
+        min_connections=min_connections,
+        max_inactive_connection_lifetime=max_inactive_connection_lifetime,
+        schema_ttl=schema_ttl,
+        batch_window_ms=batch_window_ms,
+        max_batch=max_batch
     )
@@ -2,9 +2,9 @@
 Supabase database client adapter for Fantastic Router
 """
 
+import re
 from typing import List, Dict, Any, Optional
-from supabase import create_client, Client
-from postgrest import APIError
+import httpx
 
 class SupabaseDatabaseClient:
     """Supabase client that implements the DatabaseClient protocol"""
@@ -23,7 +23,7 @@ class SupabaseDatabaseClient:
         self.supabase_key = supabase_key
         self.max_connections = max_connections
         self.timeout = timeout
-        self.client: Optional[Client] = None
+        self.client: Optional[httpx.AsyncClient] = None  # PostgREST (/rest/v1) client
         self._schema_cache: Dict[str, List[str]] = {}
         
         # Security: Restricted tables/columns that should never be accessed
@@ -42,21 +42,42 @@ class SupabaseDatabaseClient:
         
         # Security: Whitelist of allowed tables (if specified, only these are accessible)
         self.allowed_tables = set(allowed_tables) if allowed_tables else None
+        
+        # Precompiled forms of the rules above, checked on every search
+        self._restricted_re = re.compile(
+            '|'.join(re.escape(restricted.lower()) for restricted in self.restricted_tables)
+        ) if self.restricted_tables else None
+        self._restricted_column_sets = {
+            table: frozenset(columns) for table, columns in self.restricted_columns.items()
+        }
+        self._restricted_column_lists = {
+            table: sorted(columns) for table, columns in self.restricted_columns.items()
+        }
     
     async def initialize(self):
         """Initialize the Supabase client"""
         if not self.client:
-            self.client = create_client(self.supabase_url, self.supabase_key)
+            # Talk to PostgREST directly; supabase-py's execute() is synchronous
+            self.client = httpx.AsyncClient(
+                base_url=f"{self.supabase_url.rstrip('/')}/rest/v1",
+                headers={
+                    "apikey": self.supabase_key,
+                    "Authorization": f"Bearer {self.supabase_key}"
+                },
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections)
+            )
     
     async def close(self):
         """Close the client connection"""
-        # Supabase client doesn't need explicit closing
-        pass
+        if self.client:
+            await self.client.aclose()
+            self.client = None
     
     def _validate_table_access(self, table: str) -> bool:
         """Validate if a table can be accessed based on security rules"""
         # Check if table is in restricted list
-        if any(restricted in table.lower() for restricted in self.restricted_tables):
+        if self._restricted_re is not None and self._restricted_re.search(table.lower()):
             return False
         
         # Check if table is in allowed list (whitelist mode)
@@ -68,17 +89,18 @@ class SupabaseDatabaseClient:
     def _validate_column_access(self, table: str, column: str) -> bool:
         """Validate if a column can be accessed based on security rules"""
         # Check if column is restricted for this table
-        if table in self.restricted_columns and column in self.restricted_columns[table]:
+        restricted = self._restricted_column_sets.get(table)
+        if restricted is not None and column in restricted:
             return False
         
         return True
     
     def _filter_restricted_columns(self, table: str, columns: List[str]) -> List[str]:
         """Filter out restricted columns from a list"""
-        if table not in self.restricted_columns:
+        restricted = self._restricted_column_sets.get(table)
+        if restricted is None:
             return columns
         
-        restricted = set(self.restricted_columns[table])
         return [col for col in columns if col not in restricted]
     
     async def search(
@@ -104,56 +126,44 @@ class SupabaseDatabaseClient:
         if not self.client:
             await self.initialize()
         
-        results = []
-        
-        for table in tables:
-            try:
-                # Security: Validate table access
-                if not self._validate_table_access(table):
-                    continue  # Skip restricted tables
-                
-                # Get table reference
-                table_ref = self.client.table(table)
-                
-                # Build search query
-                search_query = table_ref.select('*')
-                
-                # Add text search filters for each field
-                search_conditions = []
-                for field in fields:
-                    if self._validate_column_access(table, field):
-                        # Use ilike for case-insensitive search
-                        search_conditions.append(f"{field}.ilike.%{query}%")
-                
-                if search_conditions:
-                    # Apply search conditions
-                    for condition in search_conditions:
-                        search_query = search_query.or_(condition)
-                    
-                    # Execute query with limit
-                    response = search_query.limit(limit).execute()
-                    
-                    # Process results
-                    for row in response.data:
-                        # Filter out restricted columns
-                        filtered_row = {}
-                        for key, value in row.items():
-                            if self._validate_column_access(table, key):
-                                filtered_row[key] = value
-                        
-                        if filtered_row:
-                            results.append(filtered_row)
-                
-            except APIError as e:
-                # Log error but continue with other tables
-                print(f"Supabase API error for table {table}: {e}")
-                continue
-            except Exception as e:
-                # Log error but continue with other tables
-                print(f"Error searching table {table}: {e}")
-                continue
-        
-        return results[:limit]
+        # Security: Validate table access (also enforced inside multi_table_search)
+        allowed = [table for table in tables if self._validate_table_access(table)]
+        if not allowed:
+            return []
+        
+        # The RPC takes one field list for all tables, so drop any field restricted on any of them
+        search_fields = [
+            field for field in fields
+            if all(self._validate_column_access(table, field) for table in allowed)
+        ]
+        if not search_fields:
+            return []
+        
+        params = {
+            "q": query,
+            "tables": allowed,
+            "fields": search_fields,
+            "lim": limit,
+            # Restricted columns are stripped server-side, so they never cross the wire
+            "excluded": {
+                table: self._restricted_column_lists[table]
+                for table in allowed if table in self._restricted_column_lists
+            }
+        }
+        
+        try:
+            # One round trip for all tables; see migrations/supabase_multi_table_search.sql
+            response = await self.client.post("/rpc/multi_table_search", json=params)
+            response.raise_for_status()
+            rows = response.json()
+        except httpx.HTTPStatusError as e:
+            print(f"Supabase API error searching tables {allowed}: {e.response.text}")
+            return []
+        except Exception as e:
+            print(f"Error searching tables {allowed}: {e}")
+            return []
+        
+        return [row['record'] for row in rows or [] if row.get('record')]
     
     async def get_schema(self) -> Dict[str, Any]:
         """Get database schema information"""
@@ -184,7 +194,8 @@ class SupabaseDatabaseClient:
             
             # Try a simple query to test connection
             # Use a table that should exist in most Supabase setups
-            response = self.client.table('users').select('id').limit(1).execute()
+            response = await self.client.get("/users", params={"select": "id", "limit": 1})
+            response.raise_for_status()
             return True
             
         except Exception as e:
@@ -0,0 +1,92 @@
+"""
+Micro-batching support shared by the LLM clients
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+AnalyzeFn = Callable[[str, float], Awaitable[Dict[str, Any]]]
+
+
+class MicroBatcher:
+    """
+    Collects analyze() calls that arrive within a short window and dispatches
+    them together.
+    
+    None of the supported providers accept several independent prompts in one
+    online request, so a batch is flushed as concurrent requests over the
+    client's shared connection. At most max_batch requests are in flight at
+    once across all batches; later ones wait for a free slot.
+    """
+    
+    def __init__(self, handler: AnalyzeFn, window_ms: float = 5.0, max_batch: int = 16):
+        self.handler = handler
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._pump_task: Optional[asyncio.Task] = None
+        self._inflight: Set[asyncio.Task] = set()  # Strong refs so running batches aren't collected
+    
+    async def submit(self, prompt: str, temperature: float) -> Dict[str, Any]:
+        """Queue a prompt and wait for its result"""
+        if self._pump_task is None or self._pump_task.done():
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_batch)
+            self._pump_task = asyncio.create_task(self._pump())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((prompt, temperature, future))
+        return await future
+    
+    async def aclose(self):
+        """Stop the background pump"""
+        if self._pump_task is not None:
+            self._pump_task.cancel()
+            try:
+                await self._pump_task
+            except asyncio.CancelledError:
+                pass
+        self._pump_task = None
+    
+    async def _pump(self):
+        """Drain the queue in windows of up to max_batch items"""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Keep collecting the next window while this batch is in flight
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+    
+    async def _run(self, prompt: str, temperature: float) -> Dict[str, Any]:
+        """Call the handler once a request slot is free"""
+        async with self._slots:
+            return await self.handler(prompt, temperature)
+    
+    async def _dispatch(self, batch: List[Tuple[str, float, asyncio.Future]]):
+        """Run one batch and resolve each caller's future"""
+        results = await asyncio.gather(
+            *[self._run(prompt, temperature) for prompt, temperature, _ in batch],
+            return_exceptions=True
+        )
+        
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue  # Caller gave up (e.g. cancelled)
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
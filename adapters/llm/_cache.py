@@ -0,0 +1,181 @@
+"""
+Response cache shared by the LLM clients
+"""
+
+import hashlib
+import struct
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from ._json_utils import loads as json_loads, dumps as json_dumps
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+class InMemoryCacheBackend:
+    """LRU cache with per-entry expiry, local to the process"""
+    
+    # Keys only need to be stable within this process
+    persistent = False
+    
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+    
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    async def set(self, key: str, value: str, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    async def clear(self):
+        self._entries.clear()
+
+
+class RedisCacheBackend:
+    """Cache stored in Redis, shared between processes"""
+    
+    # Keys must stay identical across processes and library versions
+    persistent = True
+    
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "fantastic_router:llm:"):
+        if aioredis is None:
+            raise ImportError(
+                "redis package not found. "
+                "Install with: pip install redis"
+            )
+        
+        self.prefix = prefix
+        self._redis = aioredis.from_url(url)
+    
+    async def get(self, key: str) -> Optional[str]:
+        value = await self._redis.get(self.prefix + key)
+        return value.decode() if isinstance(value, bytes) else value
+    
+    async def set(self, key: str, value: str, ttl: float):
+        await self._redis.set(self.prefix + key, value, px=int(ttl * 1000))
+    
+    async def clear(self):
+        async for key in self._redis.scan_iter(match=self.prefix + "*"):
+            await self._redis.delete(key)
+
+
+class LLMCache:
+    """
+    Caches analyze() responses keyed on (model, prompt, temperature)
+    
+    Only low-temperature calls are cached, since their output is effectively
+    deterministic. Values are stored as JSON so every hit returns a fresh dict.
+    """
+    
+    def __init__(
+        self,
+        backend: Optional[Any] = None,
+        ttl: float = 300,
+        max_temperature: float = 0.2,
+        maxsize: int = 1024
+    ):
+        self.backend = backend or InMemoryCacheBackend(maxsize=maxsize)
+        self.ttl = ttl
+        self.max_temperature = max_temperature
+        self.hits = 0
+        self.misses = 0
+    
+    def cache_key(self, model: str, prompt: str, temperature: float) -> Optional[str]:
+        """Return the cache key for a call, or None if the call should not be cached"""
+        if temperature > self.max_temperature:
+            return None
+        
+        if not getattr(self.backend, "persistent", True):
+            return self._fast_key(model, prompt, temperature)
+        
+        payload = json_dumps({"model": model, "prompt": prompt, "temperature": temperature}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    @staticmethod
+    def _fast_key(model: str, prompt: str, temperature: float) -> str:
+        """Non-cryptographic key for process-local backends, hashed without a JSON intermediate"""
+        h = xxhash.xxh3_64() if xxhash is not None else hashlib.blake2b(digest_size=8)
+        h.update(model.encode())
+        h.update(b"\0")
+        h.update(prompt.encode())
+        h.update(struct.pack("<d", temperature))
+        return h.hexdigest()
+    
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            print(f"LLM cache read failed: {e}")
+            value = None
+        
+        if value is None:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return json_loads(value)
+    
+    async def set(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None):
+        # Never cache error responses
+        if not isinstance(value, dict) or "error" in value:
+            return
+        
+        try:
+            await self.backend.set(key, json_dumps(value), self.ttl if ttl is None else ttl)
+        except Exception as e:
+            print(f"LLM cache write failed: {e}")
+    
+    async def get_or_call(
+        self,
+        model: str,
+        prompt: str,
+        temperature: float,
+        call: Callable[[str, float], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Return the cached response for this call, or run call() and cache its result"""
+        key = self.cache_key(model, prompt, temperature)
+        if key is None:
+            return await call(prompt, temperature)
+        
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+        
+        result = await call(prompt, temperature)
+        await self.set(key, result)
+        return result
+    
+    async def clear(self):
+        await self.backend.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
@@ -0,0 +1,74 @@
+"""
+JSON helpers shared by the LLM clients
+"""
+
+import json
+from typing import Any, Iterator
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep catching the latter
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON with orjson when available, falling back to the stdlib"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> str:
+    """Serialize to a compact JSON string with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0).decode()
+    return json.dumps(obj, sort_keys=sort_keys, separators=(',', ':'))
+
+_OPENERS = {'{': '}', '[': ']'}
+
+
+def _iter_json_candidates(text: str) -> Iterator[str]:
+    """
+    Yield each balanced top-level {...} or [...] span in text, in order
+    
+    Single pass over the text. String literals (including escaped quotes) are
+    tracked so brackets inside JSON string values don't affect the depth.
+    """
+    depth = 0
+    start = -1
+    expected = []  # Closing brackets expected for the currently open structures
+    in_string = False
+    escape = False
+    
+    for i, char in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif char == '\\':
+                escape = True
+            elif char == '"':
+                in_string = False
+            continue
+        
+        if char == '"':
+            if depth:
+                in_string = True
+        elif char in _OPENERS:
+            if depth == 0:
+                start = i
+            expected.append(_OPENERS[char])
+            depth += 1
+        elif depth and char in ('}', ']'):
+            if char != expected[-1]:
+                # Mismatched bracket: drop this candidate and keep scanning
+                depth = 0
+                expected.clear()
+                continue
+            
+            expected.pop()
+            depth -= 1
+            if depth == 0:
+                yield text[start:i + 1]
@@ -0,0 +1,97 @@
+"""
+Rate limiting and retry helpers shared by the LLM clients
+"""
+
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional, Tuple, Type, TypeVar
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying: rate limited or a transient server-side failure
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class TransientError(Exception):
+    """A provider error that is expected to succeed on retry"""
+    
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class AsyncTokenBucket:
+    """Token bucket refilled continuously at rate_per_minute, holding at most capacity tokens"""
+    
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._condition: Optional[asyncio.Condition] = None
+    
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+    
+    async def acquire(self, n: float = 1):
+        """Wait until n tokens are available, then take them"""
+        # Never ask for more than the bucket can hold, or we'd wait forever
+        n = min(n, self.capacity)
+        
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        
+        async with self._condition:
+            while True:
+                self._refill()
+                if self._tokens >= n:
+                    self._tokens -= n
+                    self._condition.notify_all()
+                    return
+                
+                try:
+                    await asyncio.wait_for(self._condition.wait(), (n - self._tokens) / self.rate)
+                except asyncio.TimeoutError:
+                    pass
+
+
+class RateLimiter:
+    """Per-client request and token budgets; either limit may be None (unlimited)"""
+    
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None):
+        self._requests = AsyncTokenBucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = AsyncTokenBucket(tokens_per_minute) if tokens_per_minute else None
+    
+    async def acquire(self, estimated_tokens: int = 0):
+        if self._requests is not None:
+            await self._requests.acquire(1)
+        if self._tokens is not None and estimated_tokens:
+            await self._tokens.acquire(estimated_tokens)
+
+
+async def retry_with_backoff(
+    call: Callable[[], Awaitable[T]],
+    retryable: Tuple[Type[BaseException], ...],
+    max_retries: int = 3,
+    base_delay: float = 0.5,
+    max_delay: float = 8.0
+) -> T:
+    """
+    Run call(), retrying retryable errors with exponential backoff and jitter
+    
+    The original exception is re-raised once max_retries retries are used up.
+    """
+    attempt = 0
+    while True:
+        try:
+            return await call()
+        except retryable:
+            if attempt >= max_retries:
+                raise
+            
+            delay = min(max_delay, base_delay * 2 ** attempt) * random.uniform(0.5, 1.5)
+            attempt += 1
+            await asyncio.sleep(delay)
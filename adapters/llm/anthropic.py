@@ -5,13 +5,42 @@ Provides integration with Anthropic's Claude API
 
 import asyncio
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 try:
     import anthropic
 except ImportError:
     anthropic = None
 
+from ._cache import LLMCache
+from ._json_utils import loads as json_loads
+
+_json_decoder = json.JSONDecoder()
+
+# JSON-only instructions, identical on every call. Sent as the system prompt
+# rather than appended to each user prompt, so no string is built per call.
+# It is far below the minimum cacheable prompt length, so no cache_control
+# breakpoint is set on it.
+_JSON_INSTRUCTION = """You are an expert at analyzing user intents and returning structured JSON responses.
+
+CRITICAL: You must respond with valid JSON only. No markdown, no explanations, no extra text.
+Just pure JSON that can be parsed directly.
+
+Example format:
+{
+    "action_type": "NAVIGATE",
+    "entities": ["example"],
+    "confidence": 0.85,
+    "reasoning": "explanation here"
+}"""
+
+_SYSTEM_BLOCKS = [
+    {
+        "type": "text",
+        "text": _JSON_INSTRUCTION
+    }
+]
+
 
 class AnthropicLLMClient:
     """Anthropic Claude client that implements the LLMClient protocol"""
@@ -22,7 +51,9 @@ class AnthropicLLMClient:
         model: str = "claude-3-haiku-20240307",  # Fast and cost-effective
         max_tokens: int = 1000,
         timeout: int = 30,
-        temperature: float = 0.1
+        temperature: float = 0.1,
+        cache: Optional[LLMCache] = None,
+        cache_ttl: Optional[float] = 300
     ):
         if anthropic is None:
             raise ImportError(
@@ -41,8 +72,21 @@ class AnthropicLLMClient:
             api_key=api_key,
             timeout=timeout
         )
+        
+        # Response cache for low-temperature calls (pass cache_ttl=None to disable)
+        self._cache = cache if cache is not None else (LLMCache(ttl=cache_ttl) if cache_ttl else None)
     
     async def analyze(self, prompt: str, temperature: float = 0.1) -> Dict[str, Any]:
+        """
+        Analyze a prompt and return the structured JSON response
+        
+        Served from the response cache when possible.
+        """
+        if self._cache is None:
+            return await self._analyze(prompt, temperature)
+        return await self._cache.get_or_call(self.model, prompt, temperature, self._analyze)
+    
+    async def _analyze(self, prompt: str, temperature: float = 0.1) -> Dict[str, Any]:
         """
         Analyze a prompt using Claude and return structured JSON response
         
@@ -55,50 +99,23 @@ class AnthropicLLMClient:
         """
         
         try:
-            # Enhance prompt to ensure JSON output
-            enhanced_prompt = f"""
-{prompt}
-
-CRITICAL: You must respond with valid JSON only. No markdown, no explanations, no extra text.
-Just pure JSON that can be parsed directly.
-
-Example format:
-{{
-    "action_type": "NAVIGATE",
-    "entities": ["example"],
-    "confidence": 0.85,
-    "reasoning": "explanation here"
-}}
-
-Respond with JSON now:
-"""
-            
-            # Make the request to Claude
-            response = await asyncio.wait_for(
-                self.client.messages.create(
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    temperature=temperature,
-                    system="You are an expert at analyzing user intents and returning structured JSON responses. Always respond with valid JSON only, no extra text.",
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": enhanced_prompt
-                        }
-                    ]
-                ),
+            # Stream the response and stop as soon as a complete JSON value has arrived
+            parsed_response, response_text = await asyncio.wait_for(
+                self._stream_json(prompt, temperature),
                 timeout=self.timeout
             )
             
+            if parsed_response is not None:
+                return parsed_response
+            
             # Extract the response text
-            if not response.content:
+            response_text = response_text.strip()
+            if not response_text:
                 raise Exception("Empty response from Claude")
             
-            response_text = response.content[0].text.strip()
-            
             # Parse JSON response
             try:
-                parsed_response = json.loads(response_text)
+                parsed_response = json_loads(response_text)
                 return parsed_response
             except json.JSONDecodeError:
                 # Try to extract JSON from response if it contains extra text
@@ -116,31 +133,61 @@ Respond with JSON now:
                 "reasoning": f"Technical error: {str(e)}"
             }
     
+    async def _stream_json(self, prompt: str, temperature: float) -> Tuple[Optional[Any], str]:
+        """
+        Stream a completion, returning (parsed JSON, text) as soon as the top-level
+        JSON value is complete. Parsed value is None if the stream ended without one.
+        """
+        chunks = []
+        
+        async with self.client.messages.stream(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            temperature=temperature,
+            system=_SYSTEM_BLOCKS,
+            messages=[
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+        ) as stream:
+            async for text in stream.text_stream:
+                chunks.append(text)
+                
+                # A value can only have completed on a chunk containing a closing bracket
+                if '}' not in text and ']' not in text:
+                    continue
+                
+                buffered = "".join(chunks)
+                start_idx = min((i for i in (buffered.find('{'), buffered.find('[')) if i != -1), default=-1)
+                if start_idx == -1:
+                    continue
+                
+                try:
+                    parsed, _ = _json_decoder.raw_decode(buffered, start_idx)
+                except json.JSONDecodeError:
+                    continue  # Not balanced yet
+                
+                # Leaving the context manager closes the stream, skipping the remaining tokens
+                return parsed, buffered
+        
+        return None, "".join(chunks)
+    
     def _extract_json_from_text(self, text: str) -> Dict[str, Any]:
         """Try to extract JSON from text that might contain extra content"""
         # Remove common markdown artifacts
         text = text.replace('```json', '').replace('```', '').strip()
         
-        # Look for JSON-like structures
-        start_chars = ['{', '[']
-        end_chars = ['}', ']']
-        
-        for start_char, end_char in zip(start_chars, end_chars):
-            start_idx = text.find(start_char)
-            if start_idx != -1:
-                # Find the matching closing bracket
-                bracket_count = 0
-                for i, char in enumerate(text[start_idx:], start_idx):
-                    if char == start_char:
-                        bracket_count += 1
-                    elif char == end_char:
-                        bracket_count -= 1
-                        if bracket_count == 0:
-                            try:
-                                json_str = text[start_idx:i+1]
-                                return json.loads(json_str)
-                            except json.JSONDecodeError:
-                                continue
+        # Decode from each '{' / '[' in turn with the C decoder; it stops at the end of the value
+        start_idx = min((i for i in (text.find('{'), text.find('[')) if i != -1), default=-1)
+        while start_idx != -1:
+            try:
+                parsed, _ = _json_decoder.raw_decode(text, start_idx)
+                return parsed
+            except json.JSONDecodeError:
+                next_starts = [i for i in (text.find('{', start_idx + 1), text.find('[', start_idx + 1)) if i != -1]
+                start_idx = min(next_starts, default=-1)
         
         # If no valid JSON found, return error response
         return {
@@ -158,7 +205,9 @@ def create_anthropic_client(
     model: str = "claude-3-haiku-20240307",
     max_tokens: int = 1000,
     timeout: int = 30,
-    temperature: float = 0.1
+    temperature: float = 0.1,
+    cache: Optional[LLMCache] = None,
+    cache_ttl: Optional[float] = 300
 ) -> AnthropicLLMClient:
     """
     Factory function to create an Anthropic LLM client
@@ -169,6 +218,8 @@ def create_anthropic_client(
         max_tokens: Maximum tokens in response
         timeout: Request timeout in seconds
         temperature: Creativity level (0.0-1.0)
+        cache: Response cache to use (e.g. one backed by Redis); defaults to an in-memory cache
+        cache_ttl: Lifetime of cached responses in seconds, or None to disable caching
         
     Returns:
         Configured AnthropicLLMClient instance
@@ -178,7 +229,9 @@ def create_anthropic_client(
         model=model,
         max_tokens=max_tokens,
         timeout=timeout,
-        temperature=temperature
+        temperature=temperature,
+        cache=cache,
+        cache_ttl=cache_ttl
     )
 
 
@@ -4,14 +4,35 @@ Provides integration with Google's Gemini API
 """
 
 import asyncio
+import functools
 import json
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List
 
 try:
     import google.generativeai as genai
     from google.generativeai.types import HarmCategory, HarmBlockThreshold
+    from google.api_core import exceptions as google_exceptions
+    
+    # Errors worth retrying with backoff: rate limits and transient server failures
+    _RETRYABLE_ERRORS = (
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.InternalServerError,
+        google_exceptions.BadGateway
+    )
 except ImportError:
     genai = None
+    _RETRYABLE_ERRORS = ()
+
+from ._batching import MicroBatcher
+from ._cache import LLMCache
+from ._json_utils import _iter_json_candidates, loads as json_loads
+from ._resilience import RateLimiter, retry_with_backoff
+
+# JSON-only instructions, identical on every call
+_JSON_INSTRUCTION = """CRITICAL: You must respond with valid JSON only. No markdown, no explanations, no extra text.
+Just pure JSON that can be parsed directly."""
 
 
 class GeminiLLMClient:
@@ -23,7 +44,15 @@ class GeminiLLMClient:
         model: str = "gemini-1.5-flash",  # Fast and efficient model
         max_tokens: int = 1000,
         timeout: int = 30,
-        temperature: float = 0.1
+        temperature: float = 0.1,
+        batch_window_ms: Optional[float] = None,
+        max_batch: int = 16,
+        cache: Optional[LLMCache] = None,
+        cache_ttl: Optional[float] = 300,
+        max_concurrency: int = 8,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 3
     ):
         if genai is None:
             raise ImportError(
@@ -40,14 +69,20 @@ class GeminiLLMClient:
         # Configure the client
         genai.configure(api_key=api_key)
         
+        # Generation config for the default temperature, reused across calls
+        self._default_genconfig = genai.types.GenerationConfig(
+            max_output_tokens=max_tokens,
+            temperature=temperature,
+            response_mime_type="application/json"  # Force JSON output
+        )
+        
+        # Static instruction prefix (see _JSON_INSTRUCTION)
+        self._prompt_prefix = f"{_JSON_INSTRUCTION}\n\n---\nUser query:\n"
+        
         # Initialize the model with safety settings
         self.model = genai.GenerativeModel(
             model_name=model,
-            generation_config=genai.types.GenerationConfig(
-                max_output_tokens=max_tokens,
-                temperature=temperature,
-                response_mime_type="application/json"  # Force JSON output
-            ),
+            generation_config=self._default_genconfig,
             # TODO double check this: Relaxed safety settings for business use cases.
             safety_settings={
                 HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
@@ -56,8 +91,53 @@ class GeminiLLMClient:
                 HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
             }
         )
+        
+        # The SDK is synchronous; run its calls on a dedicated, bounded pool so they
+        # can't starve (or queue behind) other work on the default executor
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="gemini-llm")
+        
+        # Optional micro-batching of concurrent analyze() calls
+        self._batcher = MicroBatcher(self._analyze, batch_window_ms, max_batch) if batch_window_ms else None
+        
+        # Response cache for low-temperature calls (pass cache_ttl=None to disable)
+        self._cache = cache if cache is not None else (LLMCache(ttl=cache_ttl) if cache_ttl else None)
+        
+        # Client-side rate limiting and retry of transient provider errors
+        self._rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.max_retries = max_retries
     
     async def analyze(self, prompt: str, temperature: float = 0.1) -> Dict[str, Any]:
+        """
+        Analyze a prompt and return the structured JSON response
+        
+        Served from the response cache when possible, and goes through the
+        micro-batcher when batching is enabled.
+        """
+        call = self._batcher.submit if self._batcher is not None else self._analyze
+        return await self._call_with_cache(call, prompt, temperature)
+    
+    async def analyze_many(self, prompts: List[str], temperature: float = 0.1) -> List[Dict[str, Any]]:
+        """
+        Analyze several prompts concurrently
+        
+        Args:
+            prompts: The input prompts to analyze
+            temperature: Controls randomness (0.0 = deterministic, 1.0 = creative)
+            
+        Returns:
+            One response dict per prompt, in the same order
+        """
+        return list(await asyncio.gather(
+            *[self._call_with_cache(self._analyze, prompt, temperature) for prompt in prompts]
+        ))
+    
+    async def _call_with_cache(self, call, prompt: str, temperature: float) -> Dict[str, Any]:
+        """Serve repeated low-temperature prompts from the response cache"""
+        if self._cache is None:
+            return await call(prompt, temperature)
+        return await self._cache.get_or_call(self.model_name, prompt, temperature, call)
+    
+    async def _analyze(self, prompt: str, temperature: float = 0.1) -> Dict[str, Any]:
         """
         Analyze a prompt using Gemini and return structured JSON response
         
@@ -70,38 +150,41 @@ class GeminiLLMClient:
         """
         
         try:
-            # Enhance prompt to ensure JSON output
-            enhanced_prompt = f"""
-{prompt}
-
-CRITICAL: You must respond with valid JSON only. No markdown, no explanations, no extra text.
-Just pure JSON that can be parsed directly.
-"""
+            # Static instructions go first so the shared prefix can be served from the prompt cache
+            enhanced_prompt = self._prompt_prefix + prompt
             
-            # Create a new generation config for this specific call
-            generation_config = genai.types.GenerationConfig(
-                max_output_tokens=self.max_tokens,
-                temperature=temperature,
-                response_mime_type="application/json"
-            )
+            # Only build a new generation config when the temperature differs from the default
+            if temperature == self.temperature:
+                generation_config = self._default_genconfig
+            else:
+                generation_config = genai.types.GenerationConfig(
+                    max_output_tokens=self.max_tokens,
+                    temperature=temperature,
+                    response_mime_type="application/json"
+                )
+            
+            # Rough budget: ~4 characters per prompt token plus the completion cap
+            estimated_tokens = len(enhanced_prompt) // 4 + self.max_tokens
+            
+            async def attempt():
+                await self._rate_limiter.acquire(estimated_tokens)
+                return await asyncio.wait_for(
+                    self._generate_content_async(enhanced_prompt, generation_config),
+                    timeout=self.timeout
+                )
             
             # Generate response asynchronously
-            response = await asyncio.wait_for(
-                self._generate_content_async(enhanced_prompt, generation_config),
-                timeout=self.timeout
-            )
+            response = await retry_with_backoff(attempt, _RETRYABLE_ERRORS, self.max_retries)
             
             # Extract and parse the response
             if not response.candidates:
                 raise Exception("No response candidates from Gemini")
             
-            response_text = response.candidates[0].content.parts[0].text.strip()
-            
-            # Parse JSON response
+            # response_mime_type is JSON, so parse directly (the parser already ignores surrounding whitespace)
+            response_text = response.candidates[0].content.parts[0].text
             try:
-                parsed_response = json.loads(response_text)
-                return parsed_response
-            except json.JSONDecodeError as e:
+                return json_loads(response_text)
+            except json.JSONDecodeError:
                 # Try to extract JSON from response if it contains extra text
                 return self._extract_json_from_text(response_text)
                 
@@ -119,38 +202,25 @@ Just pure JSON that can be parsed directly.
     
     async def _generate_content_async(self, prompt: str, generation_config) -> Any:
         """Async wrapper for Gemini content generation"""
-        # Run the synchronous API call in a thread pool
-        loop = asyncio.get_event_loop()
+        # Run the synchronous API call on the dedicated pool; get_running_loop skips the policy lookup
+        loop = asyncio.get_running_loop()
         return await loop.run_in_executor(
-            None,
-            lambda: self.model.generate_content(
-                prompt,
-                generation_config=generation_config
-            )
+            self._executor,
+            functools.partial(self.model.generate_content, prompt, generation_config=generation_config)
         )
     
+    def close(self):
+        """Release the worker threads used for SDK calls"""
+        self._executor.shutdown(wait=False)
+    
     def _extract_json_from_text(self, text: str) -> Dict[str, Any]:
         """Try to extract JSON from text that might contain extra content"""
-        # Look for JSON-like structures
-        start_chars = ['{', '[']
-        end_chars = ['}', ']']
-        
-        for start_char, end_char in zip(start_chars, end_chars):
-            start_idx = text.find(start_char)
-            if start_idx != -1:
-                # Find the matching closing bracket
-                bracket_count = 0
-                for i, char in enumerate(text[start_idx:], start_idx):
-                    if char == start_char:
-                        bracket_count += 1
-                    elif char == end_char:
-                        bracket_count -= 1
-                        if bracket_count == 0:
-                            try:
-                                json_str = text[start_idx:i+1]
-                                return json.loads(json_str)
-                            except json.JSONDecodeError:
-                                continue
+        # Try each balanced JSON-like structure in order
+        for candidate in _iter_json_candidates(text):
+            try:
+                return json_loads(candidate)
+            except json.JSONDecodeError:
+                continue
         
         # If no valid JSON found, return error response
         return {
@@ -167,7 +237,15 @@ def create_gemini_client(
     model: str = "gemini-1.5-flash",
     max_tokens: int = 1000,
     timeout: int = 30,
-    temperature: float = 0.1
+    temperature: float = 0.1,
+    batch_window_ms: Optional[float] = None,
+    max_batch: int = 16,
+    cache: Optional[LLMCache] = None,
+    cache_ttl: Optional[float] = 300,
+    max_concurrency: int = 8,
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+    max_retries: int = 3
 ) -> GeminiLLMClient:
     """
     Factory function to create a Gemini LLM client
@@ -178,6 +256,14 @@ def create_gemini_client(
         max_tokens: Maximum tokens in response
         timeout: Request timeout in seconds
         temperature: Creativity level (0.0-1.0)
+        batch_window_ms: If set, concurrent analyze() calls within this window are dispatched together
+        max_batch: Maximum number of prompts dispatched per batch
+        cache: Response cache to use (e.g. one backed by Redis); defaults to an in-memory cache
+        cache_ttl: Lifetime of cached responses in seconds, or None to disable caching
+        max_concurrency: Maximum number of Gemini calls in flight at once
+        requests_per_minute: Client-side request budget (None for unlimited)
+        tokens_per_minute: Client-side token budget (None for unlimited)
+        max_retries: Retries for rate-limit and transient server errors
         
     Returns:
         Configured GeminiLLMClient instance
@@ -187,7 +273,15 @@ def create_gemini_client(
         model=model,
         max_tokens=max_tokens,
         timeout=timeout,
-        temperature=temperature
+        temperature=temperature,
+        batch_window_ms=batch_window_ms,
+        max_batch=max_batch,
+        cache=cache,
+        cache_ttl=cache_ttl,
+        max_concurrency=max_concurrency,
+        requests_per_minute=requests_per_minute,
+        tokens_per_minute=tokens_per_minute,
+        max_retries=max_retries
     )
 
 
@@ -5,9 +5,30 @@ Provides integration with local LLMs via Ollama
 
 import asyncio
 import json
+import time
 import aiohttp
 from typing import Dict, Any, Optional, List
 
+from ._batching import MicroBatcher
+from ._cache import LLMCache
+from ._json_utils import _iter_json_candidates, loads as json_loads, dumps as json_dumps
+from ._resilience import RETRYABLE_STATUSES, RateLimiter, TransientError, retry_with_backoff
+
+# Errors worth retrying with backoff: overloaded server responses and dropped connections
+_RETRYABLE_ERRORS = (TransientError, aiohttp.ClientConnectionError)
+
+# JSON-only instructions, identical on every call
+_JSON_INSTRUCTION = """IMPORTANT: Respond with valid JSON only. No markdown, no explanations, no extra text.
+Your response must be parseable as JSON.
+
+Example format:
+{
+    "action_type": "NAVIGATE",
+    "entities": ["example"],
+    "confidence": 0.85,
+    "reasoning": "explanation here"
+}"""
+
 
 class OllamaLLMClient:
     """Ollama LLM client for local models that implements the LLMClient protocol"""
@@ -18,7 +39,14 @@ class OllamaLLMClient:
         model: str = "llama3.1:8b",  # Good balance of speed and quality
         timeout: int = 60,  # Local models can be slower
         temperature: float = 0.1,
-        max_tokens: int = 1000
+        max_tokens: int = 1000,
+        batch_window_ms: Optional[float] = None,
+        max_batch: int = 16,
+        cache: Optional[LLMCache] = None,
+        cache_ttl: Optional[float] = 300,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 3
     ):
         self.base_url = base_url.rstrip('/')
         self.model = model
@@ -30,8 +58,82 @@ class OllamaLLMClient:
         self.generate_url = f"{self.base_url}/api/generate"
         self.chat_url = f"{self.base_url}/api/chat"
         self.tags_url = f"{self.base_url}/api/tags"
+        
+        # A successful health probe is trusted for this many seconds
+        self._last_health_ok_at: float = 0.0
+        self._health_ttl: float = 30.0
+        
+        # Shared HTTP session (created lazily, reused for keep-alive/connection pooling)
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # Optional micro-batching of concurrent analyze() calls
+        self._batcher = MicroBatcher(self._analyze, batch_window_ms, max_batch) if batch_window_ms else None
+        
+        # Response cache for low-temperature calls (pass cache_ttl=None to disable)
+        self._cache = cache if cache is not None else (LLMCache(ttl=cache_ttl) if cache_ttl else None)
+        
+        # Client-side rate limiting and retry of transient server errors
+        self._rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.max_retries = max_retries
+        
+        # Set once prewarm() has completed
+        self._prewarmed = asyncio.Event()
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60)
+            )
+        return self._session
+    
+    async def aclose(self):
+        """Close the shared HTTP session"""
+        if self._batcher is not None:
+            await self._batcher.aclose()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def __aenter__(self) -> "OllamaLLMClient":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
     
     async def analyze(self, prompt: str, temperature: float = 0.1) -> Dict[str, Any]:
+        """
+        Analyze a prompt and return the structured JSON response
+        
+        Served from the response cache when possible, and goes through the
+        micro-batcher when batching is enabled.
+        """
+        call = self._batcher.submit if self._batcher is not None else self._analyze
+        return await self._call_with_cache(call, prompt, temperature)
+    
+    async def analyze_many(self, prompts: List[str], temperature: float = 0.1) -> List[Dict[str, Any]]:
+        """
+        Analyze several prompts concurrently
+        
+        Args:
+            prompts: The input prompts to analyze
+            temperature: Controls randomness (0.0 = deterministic, 1.0 = creative)
+            
+        Returns:
+            One response dict per prompt, in the same order
+        """
+        return list(await asyncio.gather(
+            *[self._call_with_cache(self._analyze, prompt, temperature) for prompt in prompts]
+        ))
+    
+    async def _call_with_cache(self, call, prompt: str, temperature: float) -> Dict[str, Any]:
+        """Serve repeated low-temperature prompts from the response cache"""
+        if self._cache is None:
+            return await call(prompt, temperature)
+        return await self._cache.get_or_call(self.model, prompt, temperature, call)
+    
+    async def _analyze(self, prompt: str, temperature: float = 0.1) -> Dict[str, Any]:
         """
         Analyze a prompt using Ollama and return structured JSON response
         
@@ -48,27 +150,14 @@ class OllamaLLMClient:
             if not await self._check_ollama_health():
                 raise Exception("Ollama server not available. Make sure Ollama is running.")
             
-            # Enhance prompt for JSON output
-            enhanced_prompt = f"""
-{prompt}
-
-IMPORTANT: Respond with valid JSON only. No markdown, no explanations, no extra text.
-Your response must be parseable as JSON.
-
-Example format:
-{{
-    "action_type": "NAVIGATE",
-    "entities": ["example"],
-    "confidence": 0.85,
-    "reasoning": "explanation here"
-}}
-"""
+            # Static instructions go first so Ollama can reuse the KV cache for the shared prefix
+            enhanced_prompt = f"{_JSON_INSTRUCTION}\n\n---\nUser query:\n{prompt}"
             
             # Prepare request payload
             payload = {
                 "model": self.model,
                 "prompt": enhanced_prompt,
-                "stream": False,  # Get complete response
+                "stream": True,  # Stream so we can stop as soon as the JSON is complete
                 "options": {
                     "temperature": temperature,
                     "num_predict": self.max_tokens,
@@ -76,36 +165,22 @@ Example format:
                 }
             }
             
-            # Make the request
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.generate_url,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout)
-                ) as response:
-                    
-                    if response.status != 200:
-                        error_text = await response.text()
-                        raise Exception(f"Ollama API error ({response.status}): {error_text}")
-                    
-                    result = await response.json()
-                    
-                    if 'response' not in result:
-                        raise Exception("Invalid response from Ollama")
-                    
-                    response_text = result['response'].strip()
-                    
-                    # Parse JSON response
-                    try:
-                        parsed_response = json.loads(response_text)
-                        return parsed_response
-                    except json.JSONDecodeError:
-                        # Try to extract JSON from response
-                        return self._extract_json_from_text(response_text)
+            # Rough budget: ~4 characters per prompt token plus the completion cap
+            estimated_tokens = len(enhanced_prompt) // 4 + self.max_tokens
+            
+            async def attempt():
+                await self._rate_limiter.acquire(estimated_tokens)
+                return await self._generate(payload)
+            
+            return await retry_with_backoff(attempt, _RETRYABLE_ERRORS, self.max_retries)
         
         except asyncio.TimeoutError:
+            self._last_health_ok_at = 0.0  # Re-probe on the next call
             raise Exception(f"Ollama request timed out after {self.timeout} seconds")
         except Exception as e:
+            if isinstance(e, aiohttp.ClientError):
+                self._last_health_ok_at = 0.0  # Re-probe on the next call
+            
             # Return error response in expected format
             return {
                 "error": f"Ollama error: {str(e)}",
@@ -115,27 +190,128 @@ Example format:
                 "reasoning": f"Local LLM error: {str(e)}"
             }
     
+    async def _generate(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one streaming generate request and parse the JSON it produces"""
+        session = await self._get_session()
+        # Serialize with the fast encoder rather than aiohttp's stdlib json=
+        async with session.post(
+            self.generate_url,
+            data=json_dumps(payload),
+            headers={"Content-Type": "application/json"}
+        ) as response:
+            
+            if response.status != 200:
+                error_text = await response.text()
+                if response.status in RETRYABLE_STATUSES:
+                    raise TransientError(f"Ollama API error ({response.status}): {error_text}", response.status)
+                raise Exception(f"Ollama API error ({response.status}): {error_text}")
+            
+            # Each NDJSON line carries the next piece of the generated text
+            chunks = []
+            async for line in response.content:
+                if not line.strip():
+                    continue
+                
+                result = json_loads(line)
+                if 'error' in result:
+                    raise Exception(f"Ollama API error: {result['error']}")
+                if 'response' not in result:
+                    raise Exception("Invalid response from Ollama")
+                
+                token = result['response']
+                chunks.append(token)
+                
+                if result.get('done'):
+                    break
+                
+                # A value can only have completed on a token containing a closing bracket
+                if '}' not in token and ']' not in token:
+                    continue
+                
+                for candidate in _iter_json_candidates("".join(chunks)):
+                    try:
+                        # Leaving the block closes the stream, so Ollama stops generating
+                        return json_loads(candidate)
+                    except json.JSONDecodeError:
+                        continue
+            
+            response_text = "".join(chunks).strip()
+            
+            # Parse JSON response
+            try:
+                parsed_response = json_loads(response_text)
+                return parsed_response
+            except json.JSONDecodeError:
+                # Try to extract JSON from response
+                return self._extract_json_from_text(response_text)
+    
     async def _check_ollama_health(self) -> bool:
         """Check if Ollama server is running and accessible"""
+        if time.monotonic() - self._last_health_ok_at < self._health_ttl:
+            return True
+        
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    self.tags_url,
-                    timeout=aiohttp.ClientTimeout(total=5)
-                ) as response:
-                    return response.status == 200
+            session = await self._get_session()
+            async with session.get(
+                self.tags_url,
+                timeout=aiohttp.ClientTimeout(total=5)
+            ) as response:
+                healthy = response.status == 200
+        except:
+            return False
+        
+        if healthy:
+            self._last_health_ok_at = time.monotonic()
+        return healthy
+    
+    async def prewarm(self) -> Dict[str, Any]:
+        """
+        Probe the server and load the model into memory concurrently
+        
+        Call once at startup so the first analyze() doesn't pay Ollama's
+        cold model-load latency. Later calls return immediately.
+        
+        Returns:
+            Dict with the health check result and the models available on the server
+        """
+        if self._prewarmed.is_set():
+            return {"healthy": await self._check_ollama_health(), "models": None}
+        
+        healthy, models, _ = await asyncio.gather(
+            self._check_ollama_health(),
+            self.list_models(),
+            self._warmup_generation()
+        )
+        
+        if healthy:
+            self._prewarmed.set()
+        return {"healthy": healthy, "models": models}
+    
+    async def _warmup_generation(self) -> bool:
+        """Generate a single token so Ollama loads the model"""
+        payload = {"model": self.model, "prompt": " ", "stream": False, "options": {"num_predict": 1}}
+        
+        try:
+            session = await self._get_session()
+            async with session.post(
+                self.generate_url,
+                data=json_dumps(payload),
+                headers={"Content-Type": "application/json"}
+            ) as response:
+                await response.read()
+                return response.status == 200
         except:
             return False
     
     async def list_models(self) -> List[str]:
         """List available models in Ollama"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.tags_url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return [model['name'] for model in data.get('models', [])]
-                    return []
+            session = await self._get_session()
+            async with session.get(self.tags_url) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return [model['name'] for model in data.get('models', [])]
+                return []
         except:
             return []
     
@@ -145,13 +321,13 @@ Example format:
             pull_url = f"{self.base_url}/api/pull"
             payload = {"name": model_name}
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    pull_url,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=300)  # 5 min for model download
-                ) as response:
-                    return response.status == 200
+            session = await self._get_session()
+            async with session.post(
+                pull_url,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=300)  # 5 min for model download
+            ) as response:
+                return response.status == 200
         except:
             return False
     
@@ -160,26 +336,12 @@ Example format:
         # Remove common markdown artifacts
         text = text.replace('```json', '').replace('```', '').strip()
         
-        # Look for JSON-like structures
-        start_chars = ['{', '[']
-        end_chars = ['}', ']']
-        
-        for start_char, end_char in zip(start_chars, end_chars):
-            start_idx = text.find(start_char)
-            if start_idx != -1:
-                # Find the matching closing bracket
-                bracket_count = 0
-                for i, char in enumerate(text[start_idx:], start_idx):
-                    if char == start_char:
-                        bracket_count += 1
-                    elif char == end_char:
-                        bracket_count -= 1
-                        if bracket_count == 0:
-                            try:
-                                json_str = text[start_idx:i+1]
-                                return json.loads(json_str)
-                            except json.JSONDecodeError:
-                                continue
+        # Try each balanced JSON-like structure in order
+        for candidate in _iter_json_candidates(text):
+            try:
+                return json_loads(candidate)
+            except json.JSONDecodeError:
+                continue
         
         # If no valid JSON found, try to create a response from the text
         return {
@@ -197,7 +359,14 @@ def create_ollama_client(
     model: str = "llama3.1:8b",
     timeout: int = 60,
     temperature: float = 0.1,
-    max_tokens: int = 1000
+    max_tokens: int = 1000,
+    batch_window_ms: Optional[float] = None,
+    max_batch: int = 16,
+    cache: Optional[LLMCache] = None,
+    cache_ttl: Optional[float] = 300,
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+    max_retries: int = 3
 ) -> OllamaLLMClient:
     """
     Factory function to create an Ollama LLM client
@@ -208,6 +377,13 @@ def create_ollama_client(
         timeout: Request timeout in seconds (local models can be slower)
         temperature: Creativity level (0.0-1.0)
         max_tokens: Maximum tokens in response
+        batch_window_ms: If set, concurrent analyze() calls within this window are dispatched together
+        max_batch: Maximum number of prompts dispatched per batch
+        cache: Response cache to use (e.g. one backed by Redis); defaults to an in-memory cache
+        cache_ttl: Lifetime of cached responses in seconds, or None to disable caching
+        requests_per_minute: Client-side request budget (None for unlimited)
+        tokens_per_minute: Client-side token budget (None for unlimited)
+        max_retries: Retries for overloaded-server and connection errors
         
     Returns:
         Configured OllamaLLMClient instance
@@ -217,7 +393,14 @@ def create_ollama_client(
         model=model,
         timeout=timeout,
         temperature=temperature,
-        max_tokens=max_tokens
+        max_tokens=max_tokens,
+        batch_window_ms=batch_window_ms,
+        max_batch=max_batch,
+        cache=cache,
+        cache_ttl=cache_ttl,
+        requests_per_minute=requests_per_minute,
+        tokens_per_minute=tokens_per_minute,
+        max_retries=max_retries
     )
 
 
@@ -278,6 +461,10 @@ llm_client = create_ollama_client(
     base_url="http://localhost:11434"
 )
 
+# Or scope the client so its HTTP session is closed automatically
+async with create_ollama_client(model="llama3.1:8b") as llm_client:
+    result = await llm_client.analyze("show me John's properties")
+
 # Check available models
 models = await llm_client.list_models()
 print(f"Available models: {models}")
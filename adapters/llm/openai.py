@@ -3,9 +3,42 @@ OpenAI LLM client adapter for Fantastic Router
 """
 
 import json
+import httpx
 import openai
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional, List, Tuple
 import asyncio
+import weakref
+
+from ._batching import MicroBatcher
+from ._cache import LLMCache
+from ._json_utils import loads as json_loads
+from ._resilience import RateLimiter, retry_with_backoff
+
+try:
+    import h2  # noqa: F401 - httpx needs it for HTTP/2
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+# Models that accept response_format={"type": "json_object"}
+JSON_MODE_MODELS = frozenset({
+    "gpt-4-1106-preview", "gpt-4-turbo-preview", "gpt-4-turbo",
+    "gpt-3.5-turbo-1106", "gpt-3.5-turbo-0125"
+})
+
+# Model families where every variant supports JSON mode
+_JSON_MODE_PREFIXES = ("gpt-4o", "gpt-4-turbo", "gpt-4.1", "gpt-5")
+
+# Errors worth retrying with backoff: rate limits, dropped connections and 5xx responses
+_RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+# SDK clients shared by every OpenAILLMClient with the same (api_key, base_url, timeout),
+# so short-lived instances reuse one connection pool and TLS session: event loop -> key -> client.
+# Keyed by loop because the underlying httpx connections are bound to the loop that opened them.
+_OPENAI_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, Optional[str], int], openai.AsyncOpenAI]]" = weakref.WeakKeyDictionary()
+
+# Static system prompt; it stays first so requests share a cacheable prefix
+_SYSTEM_PROMPT = "You are an expert at analyzing user intents and returning structured JSON responses. Always respond with valid JSON only, no extra text."
 
 
 class OpenAILLMClient:
@@ -16,14 +49,123 @@ class OpenAILLMClient:
         api_key: str,
         model: str = "gpt-3.5-turbo-1106",  # Much faster model with JSON support
         max_tokens: int = 1000,
-        timeout: int = 30
+        timeout: int = 30,
+        batch_window_ms: Optional[float] = None,
+        max_batch: int = 16,
+        cache: Optional[LLMCache] = None,
+        cache_ttl: Optional[float] = 300,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 3
     ):
-        self.client = openai.AsyncOpenAI(api_key=api_key)
+        self._client_key = (api_key, getattr(openai, "base_url", None), timeout)
         self.model = model
         self.max_tokens = max_tokens
         self.timeout = timeout
+        
+        # Resolve JSON mode support once rather than on every request
+        self._supports_json_mode = self.model in JSON_MODE_MODELS or self.model.startswith(_JSON_MODE_PREFIXES)
+        
+        # Request parts that never change between calls
+        self._system_msg = {"role": "system", "content": _SYSTEM_PROMPT}
+        self._json_format = {"type": "json_object"}
+        
+        # Optional micro-batching of concurrent analyze() calls
+        self._batcher = MicroBatcher(self._analyze, batch_window_ms, max_batch) if batch_window_ms else None
+        
+        # Response cache for low-temperature calls (pass cache_ttl=None to disable)
+        self._cache = cache if cache is not None else (LLMCache(ttl=cache_ttl) if cache_ttl else None)
+        
+        # Client-side rate limiting and retry of transient provider errors
+        self._rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.max_retries = max_retries
+    
+    @property
+    def client(self) -> openai.AsyncOpenAI:
+        """The SDK client shared by this key on the running event loop"""
+        clients = _OPENAI_CLIENTS.setdefault(asyncio.get_running_loop(), {})
+        client = clients.get(self._client_key)
+        if client is None:
+            api_key, _, timeout = self._client_key
+            # HTTP/2 multiplexes concurrent requests over one connection when h2 is installed
+            http_client = httpx.AsyncClient(
+                http2=_HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                timeout=timeout
+            )
+            # Retries and timeouts are handled by our own backoff/wait_for, so the SDK's are disabled
+            client = clients[self._client_key] = openai.AsyncOpenAI(
+                api_key=api_key, max_retries=0, timeout=timeout, http_client=http_client
+            )
+        return client
+    
+    async def aclose(self):
+        """Stop the micro-batcher; the shared SDK client stays open for other instances"""
+        if self._batcher is not None:
+            await self._batcher.aclose()
+    
+    async def __aenter__(self) -> "OpenAILLMClient":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
     
     async def analyze(self, prompt: str, temperature: float = 0.1) -> Dict[str, Any]:
+        """
+        Analyze a prompt and return the structured JSON response
+        
+        Served from the response cache when possible, and goes through the
+        micro-batcher when batching is enabled.
+        """
+        call = self._batcher.submit if self._batcher is not None else self._analyze
+        return await self._call_with_cache(call, prompt, temperature)
+    
+    async def analyze_many(self, prompts: List[str], temperature: float = 0.1) -> List[Dict[str, Any]]:
+        """
+        Analyze several prompts concurrently
+        
+        Args:
+            prompts: The input prompts to analyze
+            temperature: Controls randomness (0.0 = deterministic, 1.0 = creative)
+            
+        Returns:
+            One response dict per prompt, in the same order
+        """
+        return list(await asyncio.gather(
+            *[self._call_with_cache(self._analyze, prompt, temperature) for prompt in prompts]
+        ))
+    
+    async def analyze_stream(self, prompt: str, temperature: float = 0.1) -> AsyncIterator[str]:
+        """
+        Yield the response text as it is generated
+        
+        Lets callers act on parts of the JSON (e.g. start entity lookups) before
+        the completion finishes. Bypasses the response cache and micro-batcher;
+        only opening the stream is retried.
+        """
+        request_params = self._request_params(prompt, temperature)
+        request_params["stream"] = True
+        estimated_tokens = len(prompt) // 4 + self.max_tokens
+        
+        async def attempt():
+            await self._rate_limiter.acquire(estimated_tokens)
+            return await asyncio.wait_for(
+                self.client.chat.completions.create(**request_params),
+                timeout=self.timeout
+            )
+        
+        stream = await retry_with_backoff(attempt, _RETRYABLE_ERRORS, self.max_retries)
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    async def _call_with_cache(self, call, prompt: str, temperature: float) -> Dict[str, Any]:
+        """Serve repeated low-temperature prompts from the response cache"""
+        if self._cache is None:
+            return await call(prompt, temperature)
+        return await self._cache.get_or_call(self.model, prompt, temperature, call)
+    
+    async def _analyze(self, prompt: str, temperature: float = 0.1) -> Dict[str, Any]:
         """
         Analyze a prompt and return structured response
         
@@ -36,44 +178,29 @@ class OpenAILLMClient:
         """
         
         try:
-            # Check if model supports JSON mode
-            json_mode_models = [
-                "gpt-4-1106-preview", "gpt-4-turbo-preview", "gpt-4-turbo",
-                "gpt-3.5-turbo-1106", "gpt-3.5-turbo-0125"
-            ]
+            request_params = self._request_params(prompt, temperature)
             
-            request_params = {
-                "model": self.model,
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "You are an expert at analyzing user intents and returning structured JSON responses. Always respond with valid JSON only, no extra text."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "temperature": temperature,
-                "max_tokens": self.max_tokens
-            }
+            # Rough budget: ~4 characters per prompt token plus the completion cap
+            estimated_tokens = len(prompt) // 4 + self.max_tokens
             
-            # Only add response_format for models that support it
-            if self.model in json_mode_models:
-                request_params["response_format"] = {"type": "json_object"}
+            async def attempt():
+                await self._rate_limiter.acquire(estimated_tokens)
+                return await asyncio.wait_for(
+                    self.client.chat.completions.create(**request_params),
+                    timeout=self.timeout
+                )
             
-            response = await asyncio.wait_for(
-                self.client.chat.completions.create(**request_params),
-                timeout=self.timeout
-            )
+            response = await retry_with_backoff(attempt, _RETRYABLE_ERRORS, self.max_retries)
             
             content = response.choices[0].message.content
             
             # Parse JSON response
             try:
-                return json.loads(content)
-            except json.JSONDecodeError as e:
-                # Fallback: try to extract JSON from response
+                return json_loads(content)
+            except json.JSONDecodeError:
+                # JSON mode guarantees well-formed output, so only scan free text for other models
+                if self._supports_json_mode:
+                    raise
                 return self._extract_json_from_text(content)
                 
         except asyncio.TimeoutError:
@@ -89,6 +216,21 @@ class OpenAILLMClient:
                 "reasoning": f"Technical error: {str(e)}"
             }
     
+    def _request_params(self, prompt: str, temperature: float) -> Dict[str, Any]:
+        """Build the chat completion request for a prompt"""
+        request_params = {
+            "model": self.model,
+            "messages": [self._system_msg, {"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "max_tokens": self.max_tokens
+        }
+        
+        # Only add response_format for models that support it
+        if self._supports_json_mode:
+            request_params["response_format"] = self._json_format
+        
+        return request_params
+    
     def _extract_json_from_text(self, text: str) -> Dict[str, Any]:
         """Try to extract JSON from text response as fallback"""
         
@@ -98,7 +240,7 @@ class OpenAILLMClient:
         
         if start != -1 and end != -1 and end > start:
             try:
-                return json.loads(text[start:end+1])
+                return json_loads(text[start:end+1])
             except json.JSONDecodeError:
                 pass
         
@@ -125,12 +267,26 @@ def create_openai_client(
     api_key: str,
     model: str = "gpt-3.5-turbo-1106",
     max_tokens: int = 1000,
-    timeout: int = 30
+    timeout: int = 30,
+    batch_window_ms: Optional[float] = None,
+    max_batch: int = 16,
+    cache: Optional[LLMCache] = None,
+    cache_ttl: Optional[float] = 300,
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+    max_retries: int = 3
 ) -> OpenAILLMClient:
     """Create an OpenAI LLM client"""
     return OpenAILLMClient(
         api_key=api_key,
         model=model,
         max_tokens=max_tokens,
-        timeout=timeout
+        timeout=timeout,
+        batch_window_ms=batch_window_ms,
+        max_batch=max_batch,
+        cache=cache,
+        cache_ttl=cache_ttl,
+        requests_per_minute=requests_per_minute,
+        tokens_per_minute=tokens_per_minute,
+        max_retries=max_retries
     )
@@ -160,6 +160,11 @@ CREATE INDEX idx_properties_address ON properties(address);
 CREATE INDEX idx_leases_property_id ON leases(property_id);
 CREATE INDEX idx_leases_tenant_id ON leases(tenant_id);
 
+-- Full-text indexes used by PostgreSQLDatabaseClient.search
+CREATE INDEX idx_users_name_fts ON users USING GIN (to_tsvector('simple', coalesce(name, '')));
+CREATE INDEX idx_users_email_fts ON users USING GIN (to_tsvector('simple', coalesce(email, '')));
+CREATE INDEX idx_properties_address_fts ON properties USING GIN (to_tsvector('simple', coalesce(address, '')));
+
 -- Grant permissions
 GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA public TO fantastic_user;
 GRANT ALL PRIVILEGES ON ALL SEQUENCES IN SCHEMA public TO fantastic_user; 
\ No newline at end of file
@@ -5,13 +5,14 @@ Debug script to understand LLM client creation
 
 import sys
 import os
+import asyncio
 from pathlib import Path
 
 # Add the project root to the path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-def debug_llm_creation():
+async def debug_llm_creation():
     """Debug LLM client creation process"""
     
     print("🔍 Debugging LLM Client Creation")
@@ -56,16 +57,15 @@ def debug_llm_creation():
             temperature = float(llm_config.get('temperature', 0.1))
             max_tokens = int(llm_config.get('max_tokens', 1000))
             
-            client = create_openai_client(
+            # Everything runs on one event loop, so the client's connections are reused between probes
+            async with create_openai_client(
                 api_key=api_key,
                 model=model,
                 max_tokens=max_tokens
-            )
-            print(f"✅ OpenAI client created: {type(client).__name__}")
-            
-            # Test a simple analysis
-            import asyncio
-            async def test_analysis():
+            ) as client:
+                print(f"✅ OpenAI client created: {type(client).__name__}")
+                
+                # Test a simple analysis
                 try:
                     result = await client.analyze("show me properties", temperature=0.1)
                     print(f"✅ Analysis test successful")
@@ -78,8 +78,6 @@ def debug_llm_creation():
                     import traceback
                     traceback.print_exc()
             
-            asyncio.run(test_analysis())
-            
         except Exception as e:
             print(f"❌ OpenAI client creation failed: {e}")
             import traceback
@@ -91,4 +89,4 @@ def debug_llm_creation():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    debug_llm_creation() 
\ No newline at end of file
+    asyncio.run(debug_llm_creation()) 
\ No newline at end of file
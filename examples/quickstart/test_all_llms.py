@@ -4,19 +4,33 @@ Demonstrates drop-in compatibility across OpenAI, Gemini, and Ollama
 """
 
 import asyncio
+import bisect
 import os
 import sys
 import time
 from pathlib import Path
 
-# Add packages to path
-sys.path.append(str(Path(__file__).parent.parent.parent / "packages" / "fantastic_router_core" / "src"))
+# Core is installed editable (see README); only the unpackaged adapters need a path entry
 sys.path.append(str(Path(__file__).parent.parent.parent / "adapters"))
 
 from fantastic_router_core import FantasticRouter
 from db.postgres import PostgreSQLDatabaseClient
-from examples.quickstart.example import parse_site_configuration
-import json
+from examples.quickstart.example import load_site_configuration
+
+# Setup probe budget per provider, and per-query budget so one hung provider can't stall the run
+PROBE_TIMEOUT = 5.0
+PLAN_TIMEOUT = 30.0
+
+# Performance indicator: upper bounds in ms, and one icon per bucket (the last has no bound)
+PERF_THRESHOLDS_MS = (1000, 3000, 5000, 10000)
+PERF_ICONS = ("🚀", "🏃", "🐌", "💩", "💀")
+
+# Optional live results table; falls back to plain buffered output
+try:
+    from rich.live import Live
+    from rich.table import Table
+except ImportError:
+    Live = None
 
 
 async def test_all_llm_providers():
@@ -34,9 +48,7 @@ async def test_all_llm_providers():
         return
     
     config_path = Path(__file__).parent / "routes.json"
-    with open(config_path, 'r') as f:
-        config_dict = json.load(f)
-    config = parse_site_configuration(config_dict)
+    config = load_site_configuration(config_path)
     
     # Try to initialize all LLM clients
     llm_clients = {}
@@ -82,10 +94,11 @@ async def test_all_llm_providers():
         from llm.ollama import create_ollama_client
         ollama_client = create_ollama_client()
         
-        # Check if Ollama is running
-        if await ollama_client._check_ollama_health():
+        # Health check, model listing and default-model warm-up run concurrently on one session
+        status = await ollama_client.prewarm()
+        if status["healthy"]:
             # Check available models
-            models = await ollama_client.list_models()
+            models = status["models"]
             if models:
                 # Use the first available model, prefer llama3.1
                 preferred_models = ["llama3.1:8b", "llama3:8b", "llama2:7b"]
@@ -100,7 +113,9 @@ async def test_all_llm_providers():
                     selected_model = models[0]  # Use first available
                 
                 if selected_model:
-                    llm_clients["Ollama"] = create_ollama_client(model=selected_model)
+                    # Reuse the probed client (and its HTTP session) rather than building another
+                    ollama_client.model = selected_model
+                    llm_clients["Ollama"] = ollama_client
                     print(f"   ✅ Ollama client configured (model: {selected_model})")
                 else:
                     print("   ⚠️  Ollama: No suitable models found")
@@ -111,6 +126,15 @@ async def test_all_llm_providers():
     except ImportError:
         print("   ❌ Ollama: Import failed (pip install aiohttp)")
     
+    # Drop cloud providers whose key is set but don't answer (e.g. revoked keys);
+    # Ollama was already health-checked above
+    cloud_providers = [provider for provider in llm_clients if provider != "Ollama"]
+    probes = await asyncio.gather(*[probe_provider(llm_clients[provider]) for provider in cloud_providers])
+    for provider, ok in zip(cloud_providers, probes):
+        if not ok:
+            print(f"   ❌ {provider}: No response within {PROBE_TIMEOUT:.0f}s, skipping")
+            del llm_clients[provider]
+    
     if not llm_clients:
         print("\n❌ No LLM providers available!")
         print("💡 Setup at least one:")
@@ -127,71 +151,21 @@ async def test_all_llm_providers():
         "list all tenants"
     ]
     
-    # Performance comparison
-    results = {}
+    # Test all providers concurrently; they don't share rate limits or connections.
+    # Queries stay sequential within a provider so each latency is measured on its own.
+    table = Table("Provider", "Query", "Route", "ms", "Conf", "") if Live is not None else None
+    runs = [
+        run_provider(provider, llm_client, db_client, config, test_queries, table)
+        for provider, llm_client in llm_clients.items()
+    ]
     
-    # Test each provider
-    for provider, llm_client in llm_clients.items():
-        print(f"\n🤖 Testing {provider}...")
-        print("-" * 40)
-        
-        router = FantasticRouter(
-            llm_client=llm_client,
-            db_client=db_client,
-            config=config,
-            use_fast_planner=True
-        )
-        
-        provider_results = []
-        
-        for i, query in enumerate(test_queries, 1):
-            print(f"\n  🔍 Test {i}: '{query}'")
-            
-            start_time = time.time()
-            try:
-                action_plan = await router.plan(query)
-                duration_ms = (time.time() - start_time) * 1000
-                
-                print(f"     📍 Route: {action_plan.route}")
-                print(f"     🎯 Action: {action_plan.action_type.value}")
-                print(f"     📊 Confidence: {action_plan.confidence:.2f}")
-                print(f"     ⏱️  Time: {duration_ms:.0f}ms")
-                
-                # Performance indicator
-                if duration_ms < 1000:
-                    perf = "🚀"
-                elif duration_ms < 3000:
-                    perf = "🏃"
-                elif duration_ms < 5000:
-                    perf = "🐌"
-                elif duration_ms < 10000:
-                    perf = "💩"
-                else:
-                    perf = "💀"
-                
-                status = "✅" if action_plan.confidence > 0.5 else "⚠️"
-                print(f"     {status} {perf}")
-                
-                provider_results.append({
-                    "query": query,
-                    "duration_ms": duration_ms,
-                    "confidence": action_plan.confidence,
-                    "success": True
-                })
-                
-            except Exception as e:
-                duration_ms = (time.time() - start_time) * 1000
-                print(f"     ❌ Error: {str(e)[:80]}...")
-                print(f"     ⏱️  Time: {duration_ms:.0f}ms (failed)")
-                
-                provider_results.append({
-                    "query": query,
-                    "duration_ms": duration_ms,
-                    "confidence": 0.0,
-                    "success": False
-                })
-        
-        results[provider] = provider_results
+    if table is not None:
+        # One redrawn table instead of a stream of prints from every provider
+        with Live(table, refresh_per_second=10):
+            provider_runs = await asyncio.gather(*runs)
+    else:
+        provider_runs = await asyncio.gather(*runs)
+    results = dict(zip(llm_clients, provider_runs))
     
     # Summary comparison
     print(f"\n📊 Performance Summary")
@@ -238,6 +212,92 @@ async def test_all_llm_providers():
     print(f"\n🎉 Testing completed! All providers work as drop-in replacements.")
 
 
+async def probe_provider(llm_client) -> bool:
+    """Check that a provider answers within PROBE_TIMEOUT"""
+    try:
+        if hasattr(llm_client, "test_connection"):
+            return await asyncio.wait_for(llm_client.test_connection(), timeout=PROBE_TIMEOUT)
+        
+        result = await asyncio.wait_for(
+            llm_client.analyze('Test query: respond with {"status": "ok"}'),
+            timeout=PROBE_TIMEOUT
+        )
+        return "error" not in result
+    except Exception:
+        return False
+
+
+async def run_provider(provider, llm_client, db_client, config, test_queries, table=None):
+    """
+    Run the test queries against one provider and return its per-query results
+    
+    Rows are added to the live table when one is given; otherwise output is
+    buffered and written once, so concurrent providers don't interleave.
+    """
+    
+    router = FantasticRouter(
+        llm_client=llm_client,
+        db_client=db_client,
+        config=config,
+        use_fast_planner=True
+    )
+    
+    # Local models may legitimately need longer than the default budget
+    plan_timeout = max(PLAN_TIMEOUT, getattr(llm_client, "timeout", 0))
+    
+    provider_results = []
+    out = [f"\n🤖 Testing {provider}...", "-" * 40]
+    
+    for i, query in enumerate(test_queries, 1):
+        start_ns = time.perf_counter_ns()
+        try:
+            action_plan = await asyncio.wait_for(router.plan(query), timeout=plan_timeout)
+            duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
+            
+            # Performance indicator
+            perf = PERF_ICONS[bisect.bisect_right(PERF_THRESHOLDS_MS, duration_ms)]
+            
+            status = "✅" if action_plan.confidence > 0.5 else "⚠️"
+            
+            if table is not None:
+                table.add_row(provider, query, action_plan.route, f"{duration_ms:.0f}", f"{action_plan.confidence:.2f}", f"{status} {perf}")
+            else:
+                out.append(f"\n  🔍 Test {i}: '{query}'")
+                out.append(f"     📍 Route: {action_plan.route}")
+                out.append(f"     🎯 Action: {action_plan.action_type.value}")
+                out.append(f"     📊 Confidence: {action_plan.confidence:.2f}")
+                out.append(f"     ⏱️  Time: {duration_ms:.0f}ms")
+                out.append(f"     {status} {perf}")
+            
+            provider_results.append({
+                "query": query,
+                "duration_ms": duration_ms,
+                "confidence": action_plan.confidence,
+                "success": True
+            })
+            
+        except Exception as e:
+            duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
+            
+            if table is not None:
+                table.add_row(provider, query, f"Error: {str(e)[:40]}", f"{duration_ms:.0f}", "-", "❌")
+            else:
+                out.append(f"\n  🔍 Test {i}: '{query}'")
+                out.append(f"     ❌ Error: {str(e)[:80]}...")
+                out.append(f"     ⏱️  Time: {duration_ms:.0f}ms (failed)")
+            
+            provider_results.append({
+                "query": query,
+                "duration_ms": duration_ms,
+                "confidence": 0.0,
+                "success": False
+            })
+    
+    if table is None:
+        sys.stdout.write("\n".join(out) + "\n")
+    return provider_results
+
+
 async def auto_setup_ollama():
     """Helper to automatically set up Ollama if needed"""
     try:
@@ -272,6 +332,13 @@ async def auto_setup_ollama():
 if __name__ == "__main__":
     import sys
     
+    # uvloop speeds up socket-heavy asyncio code (asyncpg, aiohttp); optional
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     if len(sys.argv) > 1 and sys.argv[1] == "setup-ollama":
         asyncio.run(auto_setup_ollama())
     else:
@@ -3,12 +3,12 @@
 Test script to verify that the API returns multiple alternatives
 """
 
-import requests
-import json
+import asyncio
+import httpx
 import time
 import os
 
-def test_alternatives():
+async def test_alternatives():
     """Test that the API returns multiple alternatives"""
     
     # Test queries that should have multiple interpretations
@@ -19,60 +19,74 @@ def test_alternatives():
         "edit landlord details"
     ]
     
-    for query in test_queries:
+    # Get API key from environment
+    api_key = os.getenv('FR_API_KEY')
+    if not api_key:
+        print("!! No FR_API_KEY set. Set it with: export FR_API_KEY=your_api_key_here")
+        return
+    
+    # Prepare headers (set once on the client rather than per request)
+    headers = {"Content-Type": "application/json"}
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+    
+    # One pooled client, all queries in flight at once
+    async with httpx.AsyncClient(base_url="http://localhost:8000", headers=headers, timeout=30) as client:
+        responses = await asyncio.gather(
+            *[
+                client.post(
+                    "/api/v1/plan",
+                    json={
+                        "query": query,
+                        "max_alternatives": 5  # Request up to 5 alternatives
+                    }
+                )
+                for query in test_queries
+            ],
+            return_exceptions=True
+        )
+    
+    for query, response in zip(test_queries, responses):
         print(f"\n🔍 Testing: '{query}'")
         print("=" * 50)
         
-        # Get API key from environment
-        api_key = os.getenv('FR_API_KEY')
-        if not api_key:
-            print("!! No FR_API_KEY set. Set it with: export FR_API_KEY=your_api_key_here")
-            return
+        if isinstance(response, Exception):
+            print(f"❌ Request failed: {response}")
+        else:
+            print_result(response)
+        
+        print("-" * 50)
+
+def print_result(response):
+    """Print the primary plan and alternatives from one API response"""
+    
+    if response.status_code == 200:
+        data = response.json()
         
-        # Prepare headers
-        headers = {"Content-Type": "application/json"}
-        if api_key:
-            headers["Authorization"] = f"Bearer {api_key}"
+        print(f"✅ Success!")
+        print(f"🛣️  Primary Route: {data['action_plan']['route']}")
+        print(f"🎯 Primary Confidence: {data['action_plan']['confidence']}")
+        print(f"📝 Primary Reasoning: {data['action_plan']['reasoning'][:100]}...")
         
-        # Make API request
-        response = requests.post(
-            "http://localhost:8000/api/v1/plan",
-            json={
-                "query": query,
-                "max_alternatives": 5  # Request up to 5 alternatives
-            },
-            headers=headers
-        )
+        # Check alternatives
+        alternatives = data.get('alternatives', [])
+        print(f"\n🔄 Alternatives ({len(alternatives)} found):")
         
-        if response.status_code == 200:
-            data = response.json()
-            
-            print(f"✅ Success!")
-            print(f"🛣️  Primary Route: {data['action_plan']['route']}")
-            print(f"🎯 Primary Confidence: {data['action_plan']['confidence']}")
-            print(f"📝 Primary Reasoning: {data['action_plan']['reasoning'][:100]}...")
-            
-            # Check alternatives
-            alternatives = data.get('alternatives', [])
-            print(f"\n🔄 Alternatives ({len(alternatives)} found):")
-            
-            if alternatives:
-                for i, alt in enumerate(alternatives, 1):
-                    print(f"  {i}. Route: {alt['route']}")
-                    print(f"     Confidence: {alt['confidence']}")
-                    print(f"     Reasoning: {alt['reasoning'][:80]}...")
-                    print()
-            else:
-                print("  ❌ No alternatives generated")
-            
-            print(f"⏱️  Duration: {data['performance']['duration_ms']}ms")
-            print(f"💾 Cache: {data['performance']['cache_type']} (hits: {data['performance']['cache_hits']})")
-            
+        if alternatives:
+            for i, alt in enumerate(alternatives, 1):
+                print(f"  {i}. Route: {alt['route']}")
+                print(f"     Confidence: {alt['confidence']}")
+                print(f"     Reasoning: {alt['reasoning'][:80]}...")
+                print()
         else:
-            print(f"❌ Error: {response.status_code}")
-            print(f"Response: {response.text}")
+            print("  ❌ No alternatives generated")
         
-        print("-" * 50)
+        print(f"⏱️  Duration: {data['performance']['duration_ms']}ms")
+        print(f"💾 Cache: {data['performance']['cache_type']} (hits: {data['performance']['cache_hits']})")
+        
+    else:
+        print(f"❌ Error: {response.status_code}")
+        print(f"Response: {response.text}")
 
 if __name__ == "__main__":
     print("🧪 Testing Multiple Alternatives Feature")
@@ -81,4 +95,4 @@ if __name__ == "__main__":
     # Wait a moment for server to be ready
     time.sleep(2)
     
-    test_alternatives() 
\ No newline at end of file
+    asyncio.run(test_alternatives()) 
\ No newline at end of file
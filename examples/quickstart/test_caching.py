@@ -1,74 +1,82 @@
 #!/usr/bin/env python3
 """
-Test script to demonstrate the dual caching system:
+Test script to demonstrate the caching system:
 1. Request-level caching (exact matches)
 2. Structural caching (pattern-based matches)
+3. Semantic caching (paraphrases, embedding similarity)
 """
 
-import subprocess
-import json
+import httpx
 import time
 import sys
 
 BASE_URL = "http://localhost:8000"
 
+# One keep-alive connection for every request, so timings reflect the server rather than process/TCP setup
+SESSION = httpx.Client(base_url=BASE_URL, headers={"Content-Type": "application/json"}, timeout=30)
+
 def make_request(query):
-    """Make a request to the planning endpoint using curl"""
-    url = f"{BASE_URL}/api/v1/plan"
-    payload = json.dumps({
-        "query": query,
-        "user_role": "admin"
-    })
-    
+    """Make a request to the planning endpoint"""
     try:
-        result = subprocess.run([
-            "curl", "-s", "-X", "POST", url,
-            "-H", "Content-Type: application/json",
-            "-d", payload
-        ], capture_output=True, text=True, timeout=30)
-        
-        if result.returncode == 0:
-            return json.loads(result.stdout)
-        else:
-            print(f"❌ Curl error: {result.stderr}")
-            return None
+        response = SESSION.post("/api/v1/plan", json={
+            "query": query,
+            "user_role": "admin"
+        })
+        return response.json()
     except Exception as e:
         print(f"❌ Request error: {e}")
         return None
 
 def get_cache_stats():
-    """Get cache statistics using curl"""
-    url = f"{BASE_URL}/api/v1/cache/stats"
-    
+    """Get cache statistics"""
     try:
-        result = subprocess.run([
-            "curl", "-s", "-X", "GET", url
-        ], capture_output=True, text=True, timeout=10)
-        
-        if result.returncode == 0:
-            return json.loads(result.stdout)
-        else:
-            print(f"❌ Curl error: {result.stderr}")
-            return None
+        return SESSION.get("/api/v1/cache/stats", timeout=10).json()
     except Exception as e:
         print(f"❌ Request error: {e}")
         return None
 
-def test_caching():
-    """Test both types of caching"""
+# Canonical query shapes sent before the timed scenarios, so the server is measured
+# in steady state rather than from a cold start. None of them share a shape with the
+# timed queries below, which must still reach the LLM on their first request.
+WARMUP = [
+    "open ${name}'s maintenance requests",
+    "list all ${thing}",
+    "create new ${entity}"
+]
+WARMUP_VALUES = {"${name}": "Warmup", "${thing}": "tenants", "${entity}": "lease"}
+
+def warm_cache():
+    """Send the warmup queries and return how long they took in ms"""
+    start_ns = time.perf_counter_ns()
+    for template in WARMUP:
+        query = template
+        for placeholder, value in WARMUP_VALUES.items():
+            query = query.replace(placeholder, value)
+        make_request(query)
+    return (time.perf_counter_ns() - start_ns) / 1e6
+
+def test_caching(warmup=True):
+    """Test all cache tiers"""
     
-    print("🧪 Testing Dual Caching System")
+    print("🧪 Testing Caching System")
     print("=" * 50)
     
+    # Warmup is timed on its own so it doesn't inflate the comparison below
+    warmup_duration = None
+    if warmup:
+        print(f"\n🔥 Warming cache with {len(WARMUP)} canonical queries...")
+        warmup_duration = warm_cache()
+        print(f"⏱️  Warmup: {warmup_duration:.2f}ms")
+    
     # Test 1: Request-level caching (exact matches)
     print("\n1️⃣ Testing Request-Level Caching")
     print("-" * 30)
     
     # First request - should hit LLM
     print("📤 First request: 'show me Michael's properties'")
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     response1 = make_request("show me Michael's properties")
-    duration1 = (time.time() - start_time) * 1000
+    duration1 = (time.perf_counter_ns() - start_ns) / 1e6
     
     if not response1:
         print("❌ Failed to get response")
@@ -80,9 +88,9 @@ def test_caching():
     
     # Second request - should hit request cache
     print("\n📤 Second request: 'show me Michael's properties' (exact same)")
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     response2 = make_request("show me Michael's properties")
-    duration2 = (time.time() - start_time) * 1000
+    duration2 = (time.perf_counter_ns() - start_ns) / 1e6
     
     if not response2:
         print("❌ Failed to get response")
@@ -98,9 +106,9 @@ def test_caching():
     
     # First request for a new person - should hit LLM
     print("📤 First request: 'show me Sarah's properties'")
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     response3 = make_request("show me Sarah's properties")
-    duration3 = (time.time() - start_time) * 1000
+    duration3 = (time.perf_counter_ns() - start_ns) / 1e6
     
     if not response3:
         print("❌ Failed to get response")
@@ -112,9 +120,9 @@ def test_caching():
     
     # Second request for another person - should hit structural cache
     print("\n📤 Second request: 'show me John's properties' (different person, same pattern)")
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     response4 = make_request("show me John's properties")
-    duration4 = (time.time() - start_time) * 1000
+    duration4 = (time.perf_counter_ns() - start_ns) / 1e6
     
     if not response4:
         print("❌ Failed to get response")
@@ -124,26 +132,48 @@ def test_caching():
     print(f"🎯 Cache type: {response4.get('performance', {}).get('cache_type', 'unknown')}")
     print(f"💾 Cache hits: {response4.get('performance', {}).get('cache_hits', 0)}")
     
-    # Test 3: Check cache statistics
-    print("\n\n3️⃣ Cache Statistics")
+    # Test 3: Semantic caching (paraphrase of an earlier query)
+    print("\n\n3️⃣ Testing Semantic Caching")
+    print("-" * 30)
+    
+    # Different wording, same meaning as the first request - should hit semantic cache
+    print("📤 Request: 'which properties does Michael own' (paraphrase of the first request)")
+    start_ns = time.perf_counter_ns()
+    response5 = make_request("which properties does Michael own")
+    duration5 = (time.perf_counter_ns() - start_ns) / 1e6
+    
+    if not response5:
+        print("❌ Failed to get response")
+        return
+    
+    print(f"⏱️  Duration: {duration5:.2f}ms")
+    print(f"🎯 Cache type: {response5.get('performance', {}).get('cache_type', 'unknown')}")
+    print(f"🔗 Similarity: {response5.get('performance', {}).get('similarity', 'n/a')}")
+    
+    # Test 4: Check cache statistics
+    print("\n\n4️⃣ Cache Statistics")
     print("-" * 30)
     
     stats = get_cache_stats()
     if stats:
         print(f"📊 Request cache entries: {stats.get('request_cache', {}).get('total_entries', 0)}")
         print(f"📊 Structural cache entries: {stats.get('structural_cache', {}).get('total_entries', 0)}")
+        print(f"📊 Semantic cache entries: {stats.get('semantic_cache', {}).get('total_entries', 0)}")
         print(f"📊 Cache patterns: {len(stats.get('cache_patterns', []))}")
     else:
         print("❌ Failed to get cache stats")
     
-    # Test 4: Performance comparison
-    print("\n\n4️⃣ Performance Comparison")
+    # Test 5: Performance comparison
+    print("\n\n5️⃣ Performance Comparison")
     print("-" * 30)
     
+    if warmup_duration is not None:
+        print(f"🔥 Warmup (not included below): {warmup_duration:.2f}ms")
     print(f"🔄 LLM Call (first request): {duration1:.2f}ms")
     print(f"⚡ Request Cache (exact match): {duration2:.2f}ms")
     print(f"🔄 LLM Call (new pattern): {duration3:.2f}ms")
     print(f"⚡ Structural Cache (pattern match): {duration4:.2f}ms")
+    print(f"⚡ Semantic Cache (paraphrase): {duration5:.2f}ms")
     
     if duration2 < duration1:
         speedup1 = duration1 / duration2
@@ -152,6 +182,10 @@ def test_caching():
     if duration4 < duration3:
         speedup2 = duration3 / duration4
         print(f"🚀 Structural cache speedup: {speedup2:.1f}x faster")
+    
+    if duration5 < duration1:
+        speedup3 = duration1 / duration5
+        print(f"🚀 Semantic cache speedup: {speedup3:.1f}x faster")
 
 if __name__ == "__main__":
     print("🚀 Starting caching test...")
@@ -159,7 +193,8 @@ if __name__ == "__main__":
     print()
     
     try:
-        test_caching()
+        # Pass --no-warmup to measure the cold-start path instead
+        test_caching(warmup="--no-warmup" not in sys.argv)
     except Exception as e:
         print(f"❌ Error: {e}")
         print("Make sure the server is running with: make up") 
\ No newline at end of file
@@ -3,12 +3,14 @@
 Test script to verify complex queries generate more alternatives
 """
 
-import requests
-import json
+import asyncio
+import httpx
+import io
+import sys
 import time
 import os
 
-def test_complex_queries():
+async def test_complex_queries():
     """Test complex queries that should have many alternatives"""
     
     # Complex queries that could have multiple interpretations
@@ -27,54 +29,67 @@ def test_complex_queries():
         print("   Or run: make generate-api-key to get a key")
         return
     
-    # Prepare headers
+    # Prepare headers (set once on the client rather than per request)
     headers = {"Content-Type": "application/json"}
     if api_key:
         headers["Authorization"] = f"Bearer {api_key}"
     
-    for query in test_queries:
-        print(f"\n🔍 Testing: '{query}'")
-        print("=" * 60)
-        
-        # Make API request
-        response = requests.post(
-            "http://localhost:8000/api/v1/plan",
-            json={
-                "query": query,
-                "max_alternatives": 5
-            },
-            headers=headers
+    # The queries are independent, so send them all at once over one pooled client
+    async with httpx.AsyncClient(base_url="http://localhost:8000", headers=headers, timeout=30) as client:
+        responses = await asyncio.gather(
+            *[
+                client.post(
+                    "/api/v1/plan",
+                    json={
+                        "query": query,
+                        "max_alternatives": 5
+                    }
+                )
+                for query in test_queries
+            ],
+            return_exceptions=True
         )
+    
+    buf = io.StringIO()
+    
+    for query, response in zip(test_queries, responses):
+        print(f"\n🔍 Testing: '{query}'", file=buf)
+        print("=" * 60, file=buf)
         
-        if response.status_code == 200:
+        if isinstance(response, Exception):
+            print(f"❌ Request failed: {response}", file=buf)
+        elif response.status_code == 200:
             data = response.json()
             
-            print(f"✅ Success!")
-            print(f"🛣️  Primary Route: {data['action_plan']['route']}")
-            print(f"🎯 Primary Confidence: {data['action_plan']['confidence']}")
-            print(f"📝 Primary Reasoning: {data['action_plan']['reasoning'][:100]}...")
+            print(f"✅ Success!", file=buf)
+            print(f"🛣️  Primary Route: {data['action_plan']['route']}", file=buf)
+            print(f"🎯 Primary Confidence: {data['action_plan']['confidence']}", file=buf)
+            print(f"📝 Primary Reasoning: {data['action_plan']['reasoning'][:100]}...", file=buf)
             
             # Check alternatives
             alternatives = data.get('alternatives', [])
-            print(f"\n🔄 Alternatives ({len(alternatives)} found):")
+            print(f"\n🔄 Alternatives ({len(alternatives)} found):", file=buf)
             
             if alternatives:
                 for i, alt in enumerate(alternatives, 1):
-                    print(f"  {i}. Route: {alt['route']}")
-                    print(f"     Confidence: {alt['confidence']}")
-                    print(f"     Reasoning: {alt['reasoning'][:80]}...")
-                    print()
+                    print(f"  {i}. Route: {alt['route']}", file=buf)
+                    print(f"     Confidence: {alt['confidence']}", file=buf)
+                    print(f"     Reasoning: {alt['reasoning'][:80]}...", file=buf)
+                    print(file=buf)
             else:
-                print("  ❌ No alternatives generated")
+                print("  ❌ No alternatives generated", file=buf)
             
-            print(f"⏱️  Duration: {data['performance']['duration_ms']}ms")
-            print(f"💾 Cache: {data['performance']['cache_type']} (hits: {data['performance']['cache_hits']})")
+            print(f"⏱️  Duration: {data['performance']['duration_ms']}ms", file=buf)
+            print(f"💾 Cache: {data['performance']['cache_type']} (hits: {data['performance']['cache_hits']})", file=buf)
             
         else:
-            print(f"❌ Error: {response.status_code}")
-            print(f"Response: {response.text}")
+            print(f"❌ Error: {response.status_code}", file=buf)
+            print(f"Response: {response.text}", file=buf)
         
-        print("-" * 60)
+        print("-" * 60, file=buf)
+    
+    # Write the whole report at once rather than one line at a time
+    sys.stdout.write(buf.getvalue())
 
 if __name__ == "__main__":
     print("🧪 Testing Complex Queries for Multiple Alternatives")
@@ -83,4 +98,4 @@ if __name__ == "__main__":
     # Wait a moment for server to be ready
     time.sleep(2)
     
-    test_complex_queries() 
\ No newline at end of file
+    asyncio.run(test_complex_queries()) 
\ No newline at end of file
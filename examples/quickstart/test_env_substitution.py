@@ -5,11 +5,23 @@ Test script to verify environment variable substitution in YAML config
 
 import sys
 import os
-from pathlib import Path
+from contextlib import contextmanager
 
-# Add the project root to the path
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
+# fantastic_router_server comes from an editable install (make dev-install)
+
+@contextmanager
+def patched_env(values):
+    """Temporarily set environment variables, restoring the previous values on exit"""
+    previous = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
 
 def test_environment_variable_substitution():
     """Test that all environment variables are properly substituted"""
@@ -37,69 +49,61 @@ def test_environment_variable_substitution():
         'LLM_TEMPERATURE': '0.2'
     }
     
-    # Set environment variables
-    for key, value in test_env_vars.items():
-        os.environ[key] = value
-    
-    try:
-        from packages.fantastic_router_server.src.fantastic_router_server.config_loader import get_config
-        
-        config = get_config()
-        
-        # Test LLM configuration
-        llm_config = config.get('llm', {})
-        print(f"✓ LLM Provider: {llm_config.get('provider')}")
-        print(f"✓ LLM Temperature: {llm_config.get('temperature')}")
-        print(f"✓ LLM Max Tokens: {llm_config.get('max_tokens')}")
-        print(f"✓ LLM Timeout: {llm_config.get('timeout')}")
-        
-        # Test LLM provider-specific configs
-        openai_config = llm_config.get('openai', {})
-        print(f"✓ OpenAI API Key: {openai_config.get('api_key')}")
-        print(f"✓ OpenAI Model: {openai_config.get('model')}")
-        
-        gemini_config = llm_config.get('gemini', {})
-        print(f"✓ Gemini API Key: {gemini_config.get('api_key')}")
-        print(f"✓ Gemini Model: {gemini_config.get('model')}")
-        
-        anthropic_config = llm_config.get('anthropic', {})
-        print(f"✓ Anthropic API Key: {anthropic_config.get('api_key')}")
-        print(f"✓ Anthropic Model: {anthropic_config.get('model')}")
-        
-        ollama_config = llm_config.get('ollama', {})
-        print(f"✓ Ollama Base URL: {ollama_config.get('base_url')}")
-        print(f"✓ Ollama Model: {ollama_config.get('model')}")
-        
-        # Test database configuration
-        db_config = config.get('database', {})
-        print(f"✓ Database Type: {db_config.get('type')}")
-        print(f"✓ Database Connection String: {db_config.get('connection_string')}")
-        print(f"✓ Database Max Connections: {db_config.get('max_connections')}")
-        print(f"✓ Database Timeout: {db_config.get('timeout')}")
-        
-        # Test app configuration
-        app_config = config.get('app', {})
-        print(f"✓ App Environment: {app_config.get('environment')}")
-        print(f"✓ Use Fast Planner: {app_config.get('use_fast_planner')}")
-        
-        # Test logging configuration
-        logging_config = config.get('logging', {})
-        print(f"✓ Log Level: {logging_config.get('level')}")
-        
-        print("\n🎉 All environment variables substituted correctly!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Environment variable substitution test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-        
-    finally:
-        # Clean up environment variables
-        for key in test_env_vars.keys():
-            if key in os.environ:
-                del os.environ[key]
+    # Set environment variables for the duration of the test; restored even on failure
+    with patched_env(test_env_vars):
+        try:
+            from fantastic_router_server.config_loader import get_config
+            
+            config = get_config()
+            
+            # Test LLM configuration
+            llm_config = config.get('llm', {})
+            print(f"✓ LLM Provider: {llm_config.get('provider')}")
+            print(f"✓ LLM Temperature: {llm_config.get('temperature')}")
+            print(f"✓ LLM Max Tokens: {llm_config.get('max_tokens')}")
+            print(f"✓ LLM Timeout: {llm_config.get('timeout')}")
+            
+            # Test LLM provider-specific configs
+            openai_config = llm_config.get('openai', {})
+            print(f"✓ OpenAI API Key: {openai_config.get('api_key')}")
+            print(f"✓ OpenAI Model: {openai_config.get('model')}")
+            
+            gemini_config = llm_config.get('gemini', {})
+            print(f"✓ Gemini API Key: {gemini_config.get('api_key')}")
+            print(f"✓ Gemini Model: {gemini_config.get('model')}")
+            
+            anthropic_config = llm_config.get('anthropic', {})
+            print(f"✓ Anthropic API Key: {anthropic_config.get('api_key')}")
+            print(f"✓ Anthropic Model: {anthropic_config.get('model')}")
+            
+            ollama_config = llm_config.get('ollama', {})
+            print(f"✓ Ollama Base URL: {ollama_config.get('base_url')}")
+            print(f"✓ Ollama Model: {ollama_config.get('model')}")
+            
+            # Test database configuration
+            db_config = config.get('database', {})
+            print(f"✓ Database Type: {db_config.get('type')}")
+            print(f"✓ Database Connection String: {db_config.get('connection_string')}")
+            print(f"✓ Database Max Connections: {db_config.get('max_connections')}")
+            print(f"✓ Database Timeout: {db_config.get('timeout')}")
+            
+            # Test app configuration
+            app_config = config.get('app', {})
+            print(f"✓ App Environment: {app_config.get('environment')}")
+            print(f"✓ Use Fast Planner: {app_config.get('use_fast_planner')}")
+            
+            # Test logging configuration
+            logging_config = config.get('logging', {})
+            print(f"✓ Log Level: {logging_config.get('level')}")
+            
+            print("\n🎉 All environment variables substituted correctly!")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Environment variable substitution test failed: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
 
 def test_default_values():
     """Test that default values work when environment variables are not set"""
@@ -107,7 +111,7 @@ def test_default_values():
     print("\nTesting default values...")
     
     try:
-        from packages.fantastic_router_server.src.fantastic_router_server.config_loader import get_config
+        from fantastic_router_server.config_loader import get_config
         
         config = get_config()
         
@@ -4,21 +4,24 @@ Demonstrates drop-in compatibility with different LLM providers
 """
 
 import asyncio
+import bisect
 import os
 import sys
 import time
 from pathlib import Path
 
-# Add packages to path
-sys.path.append(str(Path(__file__).parent.parent.parent / "packages" / "fantastic_router_core" / "src"))
+# Core is installed editable (see README); only the unpackaged adapters need a path entry
 sys.path.append(str(Path(__file__).parent.parent.parent / "adapters"))
 
 from fantastic_router_core import FantasticRouter
 from llm.gemini import create_gemini_client
 from llm.openai import create_openai_client
 from db.postgres import PostgreSQLDatabaseClient
-from examples.quickstart.example import parse_site_configuration
-import json
+from examples.quickstart.example import load_site_configuration
+
+# Performance indicator: upper bounds in ms, and one label per bucket (the last has no bound)
+PERF_THRESHOLDS_MS = (1000, 3000, 5000, 10000)
+PERF_LABELS = ("🚀 [Excellent]", "🏃 [Good]", "🐌 [Needs optimization]", "💩 [Slow]", "💀 [RIP]")
 
 
 async def test_gemini_vs_openai():
@@ -37,9 +40,7 @@ async def test_gemini_vs_openai():
     
     # Load configuration (shared)
     config_path = Path(__file__).parent / "routes.json"
-    with open(config_path, 'r') as f:
-        config_dict = json.load(f)
-    config = parse_site_configuration(config_dict)
+    config = load_site_configuration(config_path)
     
     # Setup LLM clients
     llm_clients = {}
@@ -108,16 +109,7 @@ async def test_gemini_vs_openai():
                 print(f"     ⏱️  Time: {duration_ms:.0f}ms")
                 
                 # Performance indicator
-                if duration_ms < 1000:
-                    perf = "🚀 [Excellent]"
-                elif duration_ms < 3000:
-                    perf = "🏃 [Good]"
-                elif duration_ms < 5000:
-                    perf = "🐌 [Needs optimization]"
-                elif duration_ms < 10000:
-                    perf = "💩 [Slow]"
-                else:
-                    perf = "💀 [RIP]"
+                perf = PERF_LABELS[bisect.bisect_right(PERF_THRESHOLDS_MS, duration_ms)]
                 
                 status = "✅ Success" if action_plan.confidence > 0.5 else "⚠️  Low confidence"
                 print(f"     {status} {perf}")
@@ -170,9 +162,7 @@ async def test_single_provider():
         return
     
     config_path = Path(__file__).parent / "routes.json"
-    with open(config_path, 'r') as f:
-        config_dict = json.load(f)
-    config = parse_site_configuration(config_dict)
+    config = load_site_configuration(config_path)
     
     router = FantasticRouter(
         llm_client=llm_client,
@@ -3,12 +3,12 @@
 Test script to verify that max_alternatives parameter works correctly
 """
 
-import requests
-import json
+import asyncio
+import httpx
 import time
 import os
 
-def test_max_alternatives():
+async def test_max_alternatives():
     """Test different max_alternatives values"""
     
     query = "find properties"
@@ -20,26 +20,36 @@ def test_max_alternatives():
         print("   Or run: make generate-api-key to get a key")
         return
     
-    # Prepare headers
+    # Prepare headers (set once on the client rather than per request)
     headers = {"Content-Type": "application/json"}
     if api_key:
         headers["Authorization"] = f"Bearer {api_key}"
     
-    for max_alt in [1, 3, 5, 10]:
+    max_alt_values = [1, 3, 5, 10]
+    
+    # The requests are independent, so send them all at once over one pooled client
+    async with httpx.AsyncClient(base_url="http://localhost:8000", headers=headers, timeout=30) as client:
+        responses = await asyncio.gather(
+            *[
+                client.post(
+                    "/api/v1/plan",
+                    json={
+                        "query": query,
+                        "max_alternatives": max_alt
+                    }
+                )
+                for max_alt in max_alt_values
+            ],
+            return_exceptions=True
+        )
+    
+    for max_alt, response in zip(max_alt_values, responses):
         print(f"\n🔍 Testing with max_alternatives={max_alt}")
         print("=" * 50)
         
-        # Make API request
-        response = requests.post(
-            "http://localhost:8000/api/v1/plan",
-            json={
-                "query": query,
-                "max_alternatives": max_alt
-            },
-            headers=headers
-        )
-        
-        if response.status_code == 200:
+        if isinstance(response, Exception):
+            print(f"❌ Request failed: {response}")
+        elif response.status_code == 200:
             data = response.json()
             
             alternatives = data.get('alternatives', [])
@@ -67,4 +77,4 @@ if __name__ == "__main__":
     # Wait a moment for server to be ready
     time.sleep(2)
     
-    test_max_alternatives() 
\ No newline at end of file
+    asyncio.run(test_max_alternatives()) 
\ No newline at end of file
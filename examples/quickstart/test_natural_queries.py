@@ -7,37 +7,33 @@ Test script to demonstrate natural query variations:
 - etc.
 """
 
-import subprocess
-import json
+import asyncio
+import httpx
+import io
+import sys
 import time
 
 BASE_URL = "http://localhost:8000"
 
-def make_request(query):
-    """Make a request to the planning endpoint using curl"""
-    url = f"{BASE_URL}/api/v1/plan"
-    payload = json.dumps({
-        "query": query,
-        "user_role": "admin"
-    })
-    
+async def make_request(client, query):
+    """Make a request to the planning endpoint, returning (response, duration in ms)"""
+    start_ns = time.perf_counter_ns()
     try:
-        result = subprocess.run([
-            "curl", "-s", "-X", "POST", url,
-            "-H", "Content-Type: application/json",
-            "-d", payload
-        ], capture_output=True, text=True, timeout=30)
-        
-        if result.returncode == 0:
-            return json.loads(result.stdout)
-        else:
-            print(f"❌ Curl error: {result.stderr}")
-            return None
+        response = await client.post("/api/v1/plan", json={
+            "query": query,
+            "user_role": "admin"
+        })
+        return response.json(), (time.perf_counter_ns() - start_ns) / 1e6
     except Exception as e:
         print(f"❌ Request error: {e}")
-        return None
+        return None, (time.perf_counter_ns() - start_ns) / 1e6
 
-def test_natural_queries():
+async def run_queries(queries):
+    """Send every query at once over one pooled client; results come back in query order"""
+    async with httpx.AsyncClient(base_url=BASE_URL, headers={"Content-Type": "application/json"}, timeout=30) as client:
+        return await asyncio.gather(*[make_request(client, query) for query in queries])
+
+async def test_natural_queries():
     """Test various natural query variations"""
     
     print("🧪 Testing Natural Query Variations")
@@ -61,13 +57,13 @@ def test_natural_queries():
     
     print("\n" + "="*50)
     
-    for i, query in enumerate(queries, 1):
-        print(f"\n{i}️⃣ Testing: '{query}'")
-        print("-" * 30)
-        
-        start_time = time.time()
-        response = make_request(query)
-        duration = (time.time() - start_time) * 1000
+    results = await run_queries(queries)
+    
+    buf = io.StringIO()
+    
+    for i, (query, (response, duration)) in enumerate(zip(queries, results), 1):
+        print(f"\n{i}️⃣ Testing: '{query}'", file=buf)
+        print("-" * 30, file=buf)
         
         if response and response.get('success'):
             action_plan = response.get('action_plan', {})
@@ -76,26 +72,29 @@ def test_natural_queries():
             cache_type = response.get('performance', {}).get('cache_type', 'unknown')
             cache_hits = response.get('performance', {}).get('cache_hits', 0)
             
-            print(f"✅ Success!")
-            print(f"🛣️  Route: {route}")
-            print(f"🎯 Confidence: {confidence:.2f}")
+            print(f"✅ Success!", file=buf)
+            print(f"🛣️  Route: {route}", file=buf)
+            print(f"🎯 Confidence: {confidence:.2f}", file=buf)
             
             # Show alternatives if any
             alternatives = response.get('alternatives', [])
             if alternatives:
-                print(f"🔄 Alternatives ({len(alternatives)}):")
+                print(f"🔄 Alternatives ({len(alternatives)}):", file=buf)
                 for j, alt in enumerate(alternatives, 1):
-                    print(f"   {j}. {alt.get('route', 'N/A')} (conf: {alt.get('confidence', 0):.2f})")
+                    print(f"   {j}. {alt.get('route', 'N/A')} (conf: {alt.get('confidence', 0):.2f})", file=buf)
             
-            print(f"⏱️  Duration: {duration:.2f}ms")
-            print(f"💾 Cache: {cache_type} (hits: {cache_hits})")
+            print(f"⏱️  Duration: {duration:.2f}ms", file=buf)
+            print(f"💾 Cache: {cache_type} (hits: {cache_hits})", file=buf)
         else:
-            print(f"❌ Failed: {response}")
+            print(f"❌ Failed: {response}", file=buf)
     
-    print("\n" + "="*50)
-    print("🎯 Summary:")
-    print("All these variations should ideally route to the same destination!")
-    print("The system should understand that they all mean the same thing.")
+    print("\n" + "="*50, file=buf)
+    print("🎯 Summary:", file=buf)
+    print("All these variations should ideally route to the same destination!", file=buf)
+    print("The system should understand that they all mean the same thing.", file=buf)
+    
+    # Write the whole report at once rather than one line at a time
+    sys.stdout.write(buf.getvalue())
 
 if __name__ == "__main__":
     print("🚀 Starting natural query test...")
@@ -103,7 +102,7 @@ if __name__ == "__main__":
     print()
     
     try:
-        test_natural_queries()
+        asyncio.run(test_natural_queries())
     except Exception as e:
         print(f"❌ Error: {e}")
         print("Make sure the server is running with: make up") 
\ No newline at end of file
@@ -3,11 +3,12 @@
 Test script to verify system database setup
 """
 
-import psycopg2
+import asyncio
+import asyncpg
 import os
 import json
 
-def test_system_database():
+async def test_system_database():
     """Test system database connection and basic operations"""
     
     # System database connection
@@ -15,46 +16,47 @@ def test_system_database():
     
     try:
         print("🔍 Testing System Database Connection...")
-        conn = psycopg2.connect(system_db_url)
-        cursor = conn.cursor()
+        conn = await asyncpg.connect(system_db_url)
+        
+        # Version, tables, users, API keys, LLM providers and domain configs in one round trip
+        summary = json.loads(await conn.fetchval("""
+            SELECT json_build_object(
+                'version', version(),
+                'tables', (
+                    SELECT coalesce(json_agg(table_name ORDER BY table_name), '[]')
+                    FROM information_schema.tables
+                    WHERE table_schema = 'public'
+                ),
+                'user_count', (SELECT COUNT(*) FROM users),
+                'api_key_count', (SELECT COUNT(*) FROM api_keys),
+                'providers', (
+                    SELECT coalesce(json_agg(json_build_array(provider_name, model_name, is_default)), '[]')
+                    FROM llm_providers
+                ),
+                'domains', (SELECT coalesce(json_agg(domain_name), '[]') FROM domain_configs)
+            );
+        """))
         
         # Test basic connection
-        cursor.execute("SELECT version();")
-        version = cursor.fetchone()
-        print(f"✅ Connected to PostgreSQL: {version[0]}")
+        print(f"✅ Connected to PostgreSQL: {summary['version']}")
         
         # Check if tables exist
-        cursor.execute("""
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public'
-            ORDER BY table_name;
-        """)
-        tables = cursor.fetchall()
-        print(f"📋 Available tables: {[table[0] for table in tables]}")
+        print(f"📋 Available tables: {summary['tables']}")
         
         # Check users table
-        cursor.execute("SELECT COUNT(*) FROM users;")
-        user_count = cursor.fetchone()[0]
-        print(f"👥 Users in system: {user_count}")
+        print(f"👥 Users in system: {summary['user_count']}")
         
         # Check API keys table
-        cursor.execute("SELECT COUNT(*) FROM api_keys;")
-        api_key_count = cursor.fetchone()[0]
-        print(f"🔑 API keys in system: {api_key_count}")
+        print(f"🔑 API keys in system: {summary['api_key_count']}")
         
         # Check LLM providers
-        cursor.execute("SELECT provider_name, model_name, is_default FROM llm_providers;")
-        providers = cursor.fetchall()
         print(f"🤖 LLM Providers:")
-        for provider in providers:
+        for provider in summary['providers']:
             default_mark = " (default)" if provider[2] else ""
             print(f"  - {provider[0]}: {provider[1]}{default_mark}")
         
         # Check domain configs
-        cursor.execute("SELECT domain_name FROM domain_configs;")
-        domains = cursor.fetchall()
-        print(f"🌐 Domain Configurations: {[domain[0] for domain in domains]}")
+        print(f"🌐 Domain Configurations: {summary['domains']}")
         
         # Show example of how API key management would work
         print(f"\n🔧 Example API Key Management:")
@@ -64,8 +66,7 @@ def test_system_database():
         print(f"  4. Track usage in request_logs table")
         print(f"  5. Apply rate limiting based on rate_limits table")
         
-        cursor.close()
-        conn.close()
+        await conn.close()
         print(f"\n✅ System database test completed successfully!")
         
     except Exception as e:
@@ -75,4 +76,4 @@ def test_system_database():
 if __name__ == "__main__":
     print("🧪 Testing System Database Setup")
     print("=" * 50)
-    test_system_database() 
\ No newline at end of file
+    asyncio.run(test_system_database()) 
\ No newline at end of file
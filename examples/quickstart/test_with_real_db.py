@@ -4,9 +4,12 @@ This script connects to the PostgreSQL database and tests real queries
 """
 
 import asyncio
+import copy
 import os
+import re
 import sys
 import time
+import traceback
 from pathlib import Path
 
 # Add packages to path
@@ -16,8 +19,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent / "adapters"))
 from fantastic_router_core import FantasticRouter
 from llm.openai import OpenAILLMClient
 from db.postgres import PostgreSQLDatabaseClient
-from examples.quickstart.example import parse_site_configuration
-import json
+from examples.quickstart.example import load_site_configuration
 
 def get_performance_indicator(duration_ms: float) -> str:
     """Get performance indicator based on query duration"""
@@ -33,6 +35,16 @@ def get_performance_indicator(duration_ms: float) -> str:
         return "💀 [RIP]"
 
 
+async def _timed_plan(router, query):
+    """Plan one query, returning (action_plan, duration in ms, exception or None)"""
+    start_ns = time.perf_counter_ns()
+    try:
+        action_plan = await router.plan(query)
+        return action_plan, (time.perf_counter_ns() - start_ns) / 1e6, None
+    except Exception as e:
+        return None, (time.perf_counter_ns() - start_ns) / 1e6, e
+
+
 async def test_real_system():
     """Test the system with real database and LLM"""
     
@@ -66,10 +78,7 @@ async def test_real_system():
     # 2. Load configuration
     print("\n2. Loading configuration...")
     config_path = Path(__file__).parent / "routes.json"
-    with open(config_path, 'r') as f:
-        config_dict = json.load(f)
-    
-    config = parse_site_configuration(config_dict)
+    config = load_site_configuration(config_path)
     print(f"   ✅ Configuration loaded for domain: {config.domain}")
     
     # 3. Create router
@@ -94,82 +103,77 @@ async def test_real_system():
         "show Emily Davis lease information"
     ]
     
-    for i, query in enumerate(test_queries, 1):
-        print(f"\n🔍 Test {i}: '{query}'")
+    # The queries are independent LLM/DB round trips, so plan them all concurrently
+    results = await asyncio.gather(*[_timed_plan(router, query) for query in test_queries])
+    
+    for i, (query, (action_plan, duration_ms, error)) in enumerate(zip(test_queries, results), 1):
+        # Each test's report is written in one go so the output doesn't pay per-line print overhead
+        out = [f"\n🔍 Test {i}: '{query}'"]
         
-        # Start timing
-        start_time = time.time()
+        if error is not None:
+            out.append(f"   ❌ Error: {error}")
+            out.append(f"   ⏱️  Time: {duration_ms:.0f}ms (failed)")
+            sys.stdout.write("\n".join(out) + "\n")
+            traceback.print_exception(type(error), error, error.__traceback__)
+            continue
         
-        try:
-            # Plan the action
-            action_plan = await router.plan(query)
-            
-            # Calculate timing
-            end_time = time.time()
-            duration_ms = (end_time - start_time) * 1000
-            
-            print(f"   📍 Route: {action_plan.route}")
-            print(f"   🎯 Action: {action_plan.action_type.value}")
-            print(f"   📊 Confidence: {action_plan.confidence:.2f}")
-            print(f"   ⏱️  Time: {duration_ms:.0f}ms")
-            
-            if action_plan.entities:
-                print(f"   👥 Entities found:")
-                for entity in action_plan.entities:
-                    print(f"      - {entity.name} (ID: {entity.id}, Table: {entity.table})")
-            
-            if action_plan.parameters:
-                print(f"   ⚙️  Parameters:")
-                for param in action_plan.parameters:
-                    print(f"      - {param.name}: {param.value} (from {param.source})")
-            
-            # Show reasoning for low confidence
-            if action_plan.confidence < 0.7:
-                print(f"   🤔 Reasoning: {action_plan.reasoning}")
-            
-            # Status with performance indicator
-            status = "✅ Success" if action_plan.confidence > 0.5 else "⚠️  Low confidence"
-            print(f"   {status}")
+        out.append(f"   📍 Route: {action_plan.route}")
+        out.append(f"   🎯 Action: {action_plan.action_type.value}")
+        out.append(f"   📊 Confidence: {action_plan.confidence:.2f}")
+        out.append(f"   ⏱️  Time: {duration_ms:.0f}ms")
+        
+        if action_plan.entities:
+            out.append(f"   👥 Entities found:")
+            for entity in action_plan.entities:
+                out.append(f"      - {entity.name} (ID: {entity.id}, Table: {entity.table})")
+        
+        if action_plan.parameters:
+            out.append(f"   ⚙️  Parameters:")
+            for param in action_plan.parameters:
+                out.append(f"      - {param.name}: {param.value} (from {param.source})")
+        
+        # Show reasoning for low confidence
+        if action_plan.confidence < 0.7:
+            out.append(f"   🤔 Reasoning: {action_plan.reasoning}")
+        
+        # Status with performance indicator
+        status = "✅ Success" if action_plan.confidence > 0.5 else "⚠️  Low confidence"
+        out.append(f"   {status}")
 
-            perf_indicator = get_performance_indicator(duration_ms)
-            print(f"   Performance: {perf_indicator}")
-            
-        except Exception as e:
-            end_time = time.time()
-            duration_ms = (end_time - start_time) * 1000
-            print(f"   ❌ Error: {e}")
-            print(f"   ⏱️  Time: {duration_ms:.0f}ms (failed)")
-            import traceback
-            traceback.print_exc()
+        perf_indicator = get_performance_indicator(duration_ms)
+        out.append(f"   Performance: {perf_indicator}")
+        
+        sys.stdout.write("\n".join(out) + "\n")
     
     # 5. Test database queries directly
     print(f"\n5. Testing direct database queries...")
     print("-" * 40)
     
     try:
-        # Test entity search with timing
-        start_time = time.time()
-        results = await db_client.search(
-            query="James Smith",
-            tables=["users"],
-            fields=["name", "email"],
-            limit=5
-        )
-        duration_ms = (time.time() - start_time) * 1000
-        print(f"   🔍 Search 'James Smith' in users: {len(results)} results ({duration_ms:.0f}ms)")
-        for result in results:
+        # Both searches go out as one batch
+        start_ns = time.perf_counter_ns()
+        user_results, smith_results = await db_client.batch_search([
+            {
+                "query": "James Smith",
+                "tables": ["users"],
+                "fields": ["name", "email"],
+                "limit": 5
+            },
+            {
+                "query": "Smith",
+                "tables": ["landlords", "users"],
+                "fields": ["name"],
+                "limit": 5
+            }
+        ])
+        duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
+        
+        print(f"   🔍 Search 'James Smith' in users: {len(user_results)} results")
+        for result in user_results:
             print(f"      - {result.get('name')} ({result.get('email')})")
         
-        # Test landlord search with timing
-        start_time = time.time()
-        results = await db_client.search(
-            query="Smith",
-            tables=["landlords", "users"],
-            fields=["name"],
-            limit=5
-        )
-        duration_ms = (time.time() - start_time) * 1000
-        print(f"   🔍 Search 'Smith' in landlords/users: {len(results)} results ({duration_ms:.0f}ms)")
+        print(f"   🔍 Search 'Smith' in landlords/users: {len(smith_results)} results")
+        print(f"   ⏱️  Batch time: {duration_ms:.0f}ms")
         
     except Exception as e:
         print(f"   ❌ Database search error: {e}")
@@ -188,89 +192,106 @@ async def test_real_system():
     print(f"- Access pgAdmin: http://localhost:{os.getenv('PGADMIN_PORT', '8080')} (admin@pgadmin.com / admin)")
 
 
+# Mock responses, keyed by prompt type and then by query content
+_MOCK_INTENT_JAMES_INCOME = {
+    "action_type": "NAVIGATE",
+    "entities": ["James Smith"],
+    "view_type": "income",
+    "confidence": 0.9,
+    "reasoning": "User wants to view James Smith's income information",
+    "context_clues": ["income", "monthly", "James Smith"]
+}
+
+_MOCK_INTENT_CREATE_PROPERTY = {
+    "action_type": "CREATE",
+    "entities": ["property"],
+    "view_type": None,
+    "confidence": 0.95,
+    "reasoning": "User wants to create a new property",
+    "context_clues": ["create", "new", "property"]
+}
+
+_MOCK_INTENT_GENERIC = {
+    "action_type": "NAVIGATE",
+    "entities": [],
+    "view_type": None,
+    "confidence": 0.6,
+    "reasoning": "Generic navigation request",
+    "context_clues": []
+}
+
+_MOCK_ENTITY_RESOLUTION = {
+    "entity_resolutions": [
+        {
+            "entity_name": "James Smith",
+            "inferred_type": "person",
+            "confidence": 0.9,
+            "recommended_tables": ["users", "landlords"],
+            "search_fields": ["name", "email"],
+            "join_strategy": "landlords.user_id = users.id",
+            "reasoning": "James Smith is likely a person, could be landlord based on income context",
+            "context_clues": ["income", "monthly"]
+        }
+    ],
+    "search_order": ["James Smith"],
+    "estimated_confidence": 0.9
+}
+
+_MOCK_ROUTE_MATCH = {
+    "matched_pattern": "/{entity_type}/{entity_id}/{view_type}",
+    "resolved_route": "/landlords/james-smith-123/financials",
+    "parameters": [
+        {
+            "name": "entity_type",
+            "value": "landlords",
+            "type": "string",
+            "source": "inferred"
+        },
+        {
+            "name": "entity_id", 
+            "value": "james-smith-123",
+            "type": "string",
+            "source": "entity"
+        },
+        {
+            "name": "view_type",
+            "value": "financials",
+            "type": "string",
+            "source": "inferred"
+        }
+    ],
+    "confidence": 0.85,
+    "reasoning": "Matched entity detail view pattern for landlord financial information"
+}
+
+# (prompt type, [(content pattern, response), ...], fallback response), tried in order.
+# Compiled once, case-insensitive, so analyze() needs no lowered copies of the prompt.
+_MOCK_RULES = [
+    (
+        re.compile(r"intent|analyze this query", re.I),
+        [
+            (re.compile(r"james smith.*income|income.*james smith", re.I | re.S), _MOCK_INTENT_JAMES_INCOME),
+            (re.compile(r"create.*property|property.*create", re.I | re.S), _MOCK_INTENT_CREATE_PROPERTY),
+        ],
+        _MOCK_INTENT_GENERIC
+    ),
+    (re.compile(r"entity_resolutions|resolve entities", re.I), [], _MOCK_ENTITY_RESOLUTION),
+    (re.compile(r"route|pattern", re.I), [], _MOCK_ROUTE_MATCH),
+]
+
+
 class MockLLMClient:
     """Mock LLM client for testing without API key"""
     
     async def analyze(self, prompt: str, temperature: float = 0.1):
         """Return mock responses based on prompt content"""
         
-        if "intent" in prompt.lower() or "analyze this query" in prompt.lower():
-            # Mock intent analysis
-            if "james smith" in prompt.lower() and "income" in prompt.lower():
-                return {
-                    "action_type": "NAVIGATE",
-                    "entities": ["James Smith"],
-                    "view_type": "income",
-                    "confidence": 0.9,
-                    "reasoning": "User wants to view James Smith's income information",
-                    "context_clues": ["income", "monthly", "James Smith"]
-                }
-            elif "create" in prompt.lower() and "property" in prompt.lower():
-                return {
-                    "action_type": "CREATE",
-                    "entities": ["property"],
-                    "view_type": None,
-                    "confidence": 0.95,
-                    "reasoning": "User wants to create a new property",
-                    "context_clues": ["create", "new", "property"]
-                }
-            else:
-                return {
-                    "action_type": "NAVIGATE",
-                    "entities": [],
-                    "view_type": None,
-                    "confidence": 0.6,
-                    "reasoning": "Generic navigation request",
-                    "context_clues": []
-                }
-        
-        elif "entity_resolutions" in prompt.lower() or "resolve entities" in prompt.lower():
-            # Mock entity resolution
-            return {
-                "entity_resolutions": [
-                    {
-                        "entity_name": "James Smith",
-                        "inferred_type": "person",
-                        "confidence": 0.9,
-                        "recommended_tables": ["users", "landlords"],
-                        "search_fields": ["name", "email"],
-                        "join_strategy": "landlords.user_id = users.id",
-                        "reasoning": "James Smith is likely a person, could be landlord based on income context",
-                        "context_clues": ["income", "monthly"]
-                    }
-                ],
-                "search_order": ["James Smith"],
-                "estimated_confidence": 0.9
-            }
-        
-        elif "route" in prompt.lower() or "pattern" in prompt.lower():
-            # Mock route matching
-            return {
-                "matched_pattern": "/{entity_type}/{entity_id}/{view_type}",
-                "resolved_route": "/landlords/james-smith-123/financials",
-                "parameters": [
-                    {
-                        "name": "entity_type",
-                        "value": "landlords",
-                        "type": "string",
-                        "source": "inferred"
-                    },
-                    {
-                        "name": "entity_id", 
-                        "value": "james-smith-123",
-                        "type": "string",
-                        "source": "entity"
-                    },
-                    {
-                        "name": "view_type",
-                        "value": "financials",
-                        "type": "string",
-                        "source": "inferred"
-                    }
-                ],
-                "confidence": 0.85,
-                "reasoning": "Matched entity detail view pattern for landlord financial information"
-            }
+        for prompt_type, content_rules, fallback in _MOCK_RULES:
+            if prompt_type.search(prompt):
+                for pattern, response in content_rules:
+                    if pattern.search(prompt):
+                        return copy.deepcopy(response)
+                return copy.deepcopy(fallback)
         
         return {"error": "Mock LLM - unrecognized prompt type"}
 
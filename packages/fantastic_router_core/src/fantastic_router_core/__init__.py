@@ -2,17 +2,67 @@
 Fantastic Router - LLM-powered intent router for web applications
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, FrozenSet
 import json
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 from .models.actions import ActionPlan, PlanningContext
 from .models.site import SiteConfiguration
 from .planning.action_planner import ActionPlanner
 from .planning.single_call_planner import SingleCallActionPlanner
-from .planning.intent_parser import LLMClient
+from .planning.intent_parser import LLMClient, InFlightDedup
+from .planning.plan_cache import SemanticPlanCache
 from .retrieval.vector import EntityResolver, DatabaseClient
 
 
+class _PathTrie:
+    """
+    Route patterns keyed by path segment, for RBAC lookups in O(route depth)
+    
+    Literal segments are dict edges; every {placeholder} segment shares one
+    wildcard edge. When several patterns match a route, the one listed first in
+    the configuration wins, as with a linear scan.
+    """
+    
+    WILDCARD = object()
+    
+    __slots__ = ("children", "payload")
+    
+    def __init__(self):
+        self.children: Dict[Any, "_PathTrie"] = {}
+        self.payload: Optional[Tuple[int, Optional[FrozenSet[str]]]] = None
+    
+    def insert(self, pattern_parts: List[str], payload: Tuple[int, Optional[FrozenSet[str]]]):
+        node = self
+        for part in pattern_parts:
+            key = self.WILDCARD if part.startswith('{') and part.endswith('}') else part
+            node = node.children.setdefault(key, _PathTrie())
+        
+        # Keep the earliest pattern when two patterns have the same shape
+        if node.payload is None:
+            node.payload = payload
+    
+    def match(self, route_parts: List[str], depth: int = 0) -> Optional[Tuple[int, Optional[FrozenSet[str]]]]:
+        """Return the (config index, required roles) payload of the first matching pattern"""
+        if depth == len(route_parts):
+            return self.payload
+        
+        literal = self.children.get(route_parts[depth])
+        wildcard = self.children.get(self.WILDCARD)
+        
+        best = literal.match(route_parts, depth + 1) if literal is not None else None
+        if wildcard is not None:
+            other = wildcard.match(route_parts, depth + 1)
+            if other is not None and (best is None or other[0] < best[0]):
+                best = other
+        return best
+
+
 class FantasticRouter:
     """
     Main router class that provides LLM-powered intent routing for web applications.
@@ -32,20 +82,65 @@ class FantasticRouter:
         llm_client: LLMClient,
         db_client: DatabaseClient,
         config: SiteConfiguration,
-        use_fast_planner: bool = True
+        use_fast_planner: bool = True,
+        plan_cache: Optional[SemanticPlanCache] = None,
+        stream_entity_lookups: bool = False
     ):
         self.config = config
         self.llm_client = llm_client
         self.db_client = db_client
         
+        # Optional cache of plans for repeated/paraphrased queries (None disables it)
+        self.plan_cache = plan_cache
+        
         # Initialize components
         self.entity_resolver = EntityResolver(db_client)
         
+        # Concurrent identical prompts (e.g. a burst of the same query) share one LLM call
+        planner_llm = InFlightDedup(llm_client)
+        
         # Choose planner based on performance preference
         if use_fast_planner:
-            self.action_planner = SingleCallActionPlanner(llm_client, self.entity_resolver)
+            # Streaming overlaps entity lookups with generation but skips the LLM response cache
+            self.action_planner = SingleCallActionPlanner(
+                planner_llm, self.entity_resolver, stream_entity_lookups=stream_entity_lookups
+            )
         else:
-            self.action_planner = ActionPlanner(llm_client, self.entity_resolver)
+            self.action_planner = ActionPlanner(planner_llm, self.entity_resolver)
+        
+        # The config doesn't change per query, so serialize it once up front
+        self._build_config_caches()
+    
+    def refresh_config(self, config: Optional[SiteConfiguration] = None):
+        """
+        Rebuild the serialized schema and route patterns passed to the planner
+        
+        Call this after replacing or mutating the configuration, e.g. on hot reload.
+        
+        Args:
+            config: New site configuration to use (optional; defaults to the current one)
+        """
+        if config is not None:
+            self.config = config
+        
+        self._build_config_caches()
+        
+        # Plans made under the old configuration may no longer be valid
+        if self.plan_cache is not None:
+            self.plan_cache.clear()
+    
+    def _build_config_caches(self):
+        """Serialize the schema and route patterns, and index the patterns for RBAC checks"""
+        self._schema_serialized = self._serialize_database_schema()
+        self._routes_serialized = self._serialize_route_patterns()
+        
+        # Payload per pattern: (config index, required roles or None)
+        self._route_trie = _PathTrie()
+        for index, pattern in enumerate(self.config.route_patterns):
+            self._route_trie.insert(
+                pattern.pattern.strip('/').split('/'),
+                (index, frozenset(pattern.required_roles) if pattern.required_roles else None)
+            )
     
     async def plan(
         self,
@@ -67,19 +162,27 @@ class FantasticRouter:
             ActionPlan with the recommended action and route
         """
         
-        # Build planning context
-        context = PlanningContext(
-            user_query=query,
-            domain=self.config.domain,
-            user_role=user_role,
-            session_data=session_data or {},
-            database_schema=self._serialize_database_schema(),
-            route_patterns=self._serialize_route_patterns(),
-            max_results=max_results
-        )
+        # Session data can change the plan, so only context-free queries are cached
+        use_cache = self.plan_cache is not None and not session_data
+        action_plan = await self.plan_cache.get(query, user_role, max_results) if use_cache else None
         
-        # Generate action plan
-        action_plan = await self.action_planner.plan_action(context)
+        if action_plan is None:
+            # Built from trusted router state, so skip re-validating the serialized schema and routes
+            context = PlanningContext.model_construct(
+                user_query=query,
+                domain=self.config.domain,
+                user_role=user_role,
+                session_data=session_data or {},
+                database_schema=self._schema_serialized,
+                route_patterns=self._routes_serialized,
+                max_results=max_results
+            )
+            
+            # Generate action plan
+            action_plan = await self.action_planner.plan_action(context)
+            
+            if use_cache:
+                await self.plan_cache.put(query, user_role, max_results, action_plan)
         
         # Apply RBAC if configured
         if user_role and not self._check_route_permissions(action_plan.route, user_role):
@@ -144,31 +247,14 @@ class FantasticRouter:
         """Check if user has permission to access the route"""
         
         # Find matching route pattern
-        for pattern in self.config.route_patterns:
-            if self._route_matches_pattern(route, pattern.pattern):
-                if pattern.required_roles:
-                    return user_role in pattern.required_roles
-                return True  # No specific role requirements
-        
-        return True  # Default allow if no pattern matches
-    
-    def _route_matches_pattern(self, route: str, pattern: str) -> bool:
-        """Check if a route matches a pattern (simple implementation)"""
+        match = self._route_trie.match(route.strip('/').split('/'))
+        if match is None:
+            return True  # Default allow if no pattern matches
         
-        # Simple pattern matching - could be enhanced with proper regex
-        route_parts = route.strip('/').split('/')
-        pattern_parts = pattern.strip('/').split('/')
-        
-        if len(route_parts) != len(pattern_parts):
-            return False
-        
-        for route_part, pattern_part in zip(route_parts, pattern_parts):
-            if pattern_part.startswith('{') and pattern_part.endswith('}'):
-                continue  # Variable part, matches anything
-            elif route_part != pattern_part:
-                return False
-        
-        return True
+        required_roles = match[1]
+        if required_roles:
+            return user_role in required_roles
+        return True  # No specific role requirements
 
 
 # Convenience function for creating router from configuration file
@@ -179,12 +265,14 @@ async def create_router_from_config(
 ) -> FantasticRouter:
     """Create a FantasticRouter from a configuration file"""
     
-    with open(config_path, 'r') as f:
-        if config_path.endswith('.json'):
-            config_dict = json.load(f)
-        else:
-            import yaml
-            config_dict = yaml.safe_load(f)
+    if config_path.endswith('.json'):
+        with open(config_path, 'rb') as f:
+            config_dict = _json_loads(f.read())
+    else:
+        import yaml
+        with open(config_path, 'r') as f:
+            # libyaml's C loader when PyYAML was built with it
+            config_dict = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
     
     # Convert dict to SiteConfiguration
     # This is a simplified conversion - in practice you'd want proper validation
@@ -198,5 +286,6 @@ __all__ = [
     'FantasticRouter',
     'ActionPlan',
     'SiteConfiguration',
+    'SemanticPlanCache',
     'create_router_from_config'
 ]
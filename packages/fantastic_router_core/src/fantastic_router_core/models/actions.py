@@ -1,6 +1,6 @@
 from enum import Enum
 from typing import Dict, Any, Optional, List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ActionType(str, Enum):
@@ -13,8 +13,21 @@ class ActionType(str, Enum):
     DELETE = "DELETE"
 
 
+_ACTION_TYPE_BY_VALUE: Dict[str, ActionType] = {member.value: member for member in ActionType}
+
+
+def action_type_of(value: str) -> ActionType:
+    """Look up an ActionType by value with a plain dict lookup instead of the Enum constructor"""
+    try:
+        return _ACTION_TYPE_BY_VALUE[value]
+    except (KeyError, TypeError):
+        raise ValueError(f"{value!r} is not a valid ActionType") from None
+
+
 class EntityMatch(BaseModel):
     """Represents a matched entity from the database"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     id: str = Field(..., description="Unique identifier for the entity")
     name: str = Field(..., description="Display name of the entity")
     table: str = Field(..., description="Database table where entity was found")
@@ -24,6 +37,8 @@ class EntityMatch(BaseModel):
 
 class RouteParameter(BaseModel):
     """A parameter in a route pattern"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     name: str = Field(..., description="Parameter name")
     value: str = Field(..., description="Resolved parameter value")
     type: str = Field(default="string", description="Parameter type")
@@ -32,6 +47,9 @@ class RouteParameter(BaseModel):
 
 class ActionPlan(BaseModel):
     """The result of planning an action based on user query"""
+    # Not frozen: the router lowers confidence and appends to reasoning on RBAC denial
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+    
     action_type: ActionType = Field(..., description="Type of action to perform")
     route: str = Field(..., description="Target route/URL for the action")
     confidence: float = Field(..., ge=0.0, le=1.0, description="Confidence in this action plan")
@@ -51,6 +69,8 @@ class ActionPlan(BaseModel):
 
 class PlanningContext(BaseModel):
     """Context information for planning actions"""
+    model_config = ConfigDict(extra="ignore")
+    
     user_query: str = Field(..., description="Original user query")
     domain: str = Field(..., description="Application domain (e.g., 'property_management')")
     user_role: Optional[str] = Field(None, description="User's role for RBAC")
@@ -1,10 +1,15 @@
 import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+
+from pydantic import TypeAdapter
 
 from ..models.actions import ActionPlan, ActionType, RouteParameter, PlanningContext
-from ..models.entities import EntityMatch, EntityResolutionPlan
+from ..models.entities import DomainContext, EntityMatch, EntityResolutionPlan
 from ..models.site import RoutePattern, SiteConfiguration
-from .intent_parser import IntentParser, IntentAnalysis, LLMClient
+from .intent_parser import IntentParser, IntentAnalysis, LLMClient, PromptSectionCache
+
+# Validates every route parameter in an LLM response in one call into pydantic-core
+_PARAMETERS_ADAPTER = TypeAdapter(List[RouteParameter])
 
 
 class RouteMatch:
@@ -31,6 +36,10 @@ class ActionPlanner:
         self.llm = llm_client
         self.intent_parser = IntentParser(llm_client)
         self.entity_resolver = entity_resolver
+        self._sections = PromptSectionCache()
+        
+        # (domain, database_schema, DomainContext) for the config seen last
+        self._domain_context: Optional[Tuple[str, Dict[str, Any], DomainContext]] = None
     
     async def plan_action(
         self, 
@@ -52,7 +61,22 @@ class ActionPlanner:
     
     async def _parse_intent(self, context: PlanningContext) -> IntentAnalysis:
         """Parse user intent from query"""
-        from ..models.entities import DomainContext
+        return await self.intent_parser.parse_intent(
+            context.user_query,
+            self._get_domain_context(context),
+            context.route_patterns
+        )
+    
+    def _get_domain_context(self, context: PlanningContext) -> DomainContext:
+        """
+        Return the DomainContext for the site configuration
+        
+        Built once and reused while the router passes the same serialized schema
+        (it builds a new one on refresh_config).
+        """
+        cached = self._domain_context
+        if cached is not None and cached[0] == context.domain and cached[1] is context.database_schema:
+            return cached[2]
         
         # Build domain context from site configuration
         domain_context = DomainContext(
@@ -61,12 +85,8 @@ class ActionPlanner:
             common_relationships={},  # TODO: Extract from schema
             domain_vocabulary={}  # TODO: Load from configuration
         )
-        
-        return await self.intent_parser.parse_intent(
-            context.user_query,
-            domain_context,
-            context.route_patterns
-        )
+        self._domain_context = (context.domain, context.database_schema, domain_context)
+        return domain_context
     
     async def _resolve_entities(
         self, 
@@ -79,19 +99,11 @@ class ActionPlanner:
             return []
         
         # Get entity resolution plan from LLM
-        from ..models.entities import DomainContext
-        domain_context = DomainContext(
-            domain_name=context.domain,
-            primary_entities=list(context.database_schema.get('entities', {}).keys()),
-            common_relationships={},
-            domain_vocabulary={}
-        )
-        
         resolution_plan = await self.intent_parser.analyze_entities_in_context(
             context.user_query,
             intent.entities,
             context.database_schema,
-            domain_context
+            self._get_domain_context(context)
         )
         
         # Execute entity search using the resolver
@@ -128,15 +140,8 @@ class ActionPlanner:
     ) -> str:
         """Build prompt for route pattern matching"""
         
-        # Format available patterns
-        patterns_text = ""
-        for pattern in context.route_patterns:
-            patterns_text += f"""
-Pattern: {pattern.get('pattern', '')}
-Description: {pattern.get('description', '')}
-Intent Patterns: {pattern.get('intent_patterns', [])}
-Parameters: {list(pattern.get('parameters', {}).keys())}
-"""
+        # Format available patterns (reused until the router's config changes)
+        patterns_text = self._sections.get("route_patterns", context.route_patterns, self._format_route_patterns)
         
         # Format resolved entities
         entities_text = ""
@@ -189,6 +194,18 @@ EXAMPLES:
 Match the route now:
 """
 
+    def _format_route_patterns(self, route_patterns: List[Dict[str, Any]]) -> str:
+        """Format route patterns for the route matching prompt"""
+        patterns_text = ""
+        for pattern in route_patterns:
+            patterns_text += f"""
+Pattern: {pattern.get('pattern', '')}
+Description: {pattern.get('description', '')}
+Intent Patterns: {pattern.get('intent_patterns', [])}
+Parameters: {list(pattern.get('parameters', {}).keys())}
+"""
+        return patterns_text
+
     # TODO: check why entities are not used in the response
     def _parse_route_match_response(
         self, 
@@ -198,14 +215,15 @@ Match the route now:
         """Parse LLM response into RouteMatch"""
         
         try:
-            parameters = []
-            for param in response.get('parameters', []):
-                parameters.append(RouteParameter(
-                    name=param.get('name', ''),
-                    value=param.get('value', ''),
-                    type=param.get('type', 'string'),
-                    source=param.get('source', 'unknown')
-                ))
+            parameters = _PARAMETERS_ADAPTER.validate_python([
+                {
+                    "name": param.get('name', ''),
+                    "value": param.get('value', ''),
+                    "type": param.get('type', 'string'),
+                    "source": param.get('source', 'unknown')
+                }
+                for param in response.get('parameters', [])
+            ])
             
             return RouteMatch(
                 pattern=response.get('matched_pattern', ''),
@@ -235,12 +253,12 @@ Match the route now:
     ) -> ActionPlan:
         """Build the final action plan"""
         
-        # Convert EntityMatch to the ActionPlan's EntityMatch format
+        # Convert EntityMatch to the ActionPlan's EntityMatch format; fields were already validated on the retrieval model
         from ..models.actions import EntityMatch as ActionEntityMatch
         
         action_entities = []
         for entity in entities:
-            action_entity = ActionEntityMatch(
+            action_entity = ActionEntityMatch.model_construct(
                 id=entity.id,
                 name=entity.name,
                 table=entity.table,
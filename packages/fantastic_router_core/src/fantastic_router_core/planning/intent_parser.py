@@ -1,10 +1,17 @@
+import asyncio
+import copy
 import json
-from typing import Dict, List, Any, Optional, Protocol
+from typing import Callable, Dict, List, Any, Optional, Protocol, Tuple
 from abc import ABC, abstractmethod
 
-from ..models.actions import ActionType
+from pydantic import TypeAdapter
+
+from ..models.actions import ActionType, action_type_of
 from ..models.entities import EntityResolutionPlan, ContextualEntityResolution, DomainContext
 
+# Validates every resolution in an LLM response in one call into pydantic-core
+_RESOLUTIONS_ADAPTER = TypeAdapter(List[ContextualEntityResolution])
+
 
 class LLMClient(Protocol):
     """Protocol for LLM clients"""
@@ -13,6 +20,67 @@ class LLMClient(Protocol):
         ...
 
 
+class InFlightDedup:
+    """
+    LLMClient wrapper that coalesces identical concurrent analyze() calls
+    
+    While a (prompt, temperature) call is in flight, further identical calls
+    wait for it instead of issuing their own request; each waiter gets its own
+    copy of the response. Nothing is kept once the call completes.
+    """
+    
+    def __init__(self, llm_client: LLMClient):
+        self.llm_client = llm_client
+        self._inflight: Dict[Tuple[str, float], "asyncio.Task[Dict[str, Any]]"] = {}
+    
+    async def analyze(self, prompt: str, temperature: float = 0.1) -> Dict[str, Any]:
+        key = (prompt, temperature)
+        
+        task = self._inflight.get(key)
+        if task is not None:
+            # shield: a cancelled waiter must not cancel the shared call
+            return copy.deepcopy(await asyncio.shield(task))
+        
+        # The call runs as its own task so cancelling the caller that started it
+        # leaves it running for everyone else waiting on the same prompt
+        task = asyncio.ensure_future(self.llm_client.analyze(prompt, temperature))
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(task)
+    
+    def _finished(self, key: Tuple[str, float], task: "asyncio.Task[Dict[str, Any]]"):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # Mark retrieved so a failure nobody awaited anymore isn't logged
+    
+    def __getattr__(self, name: str) -> Any:
+        # Everything else (analyze_many, test_connection, model, ...) goes to the wrapped client
+        return getattr(self.llm_client, name)
+
+
+class PromptSectionCache:
+    """
+    Memoizes prompt sections formatted from the schema, route patterns and domain context
+    
+    The router passes the same serialized objects to every plan() call (and
+    new ones after refresh_config), and ActionPlanner reuses one DomainContext
+    per config, so a section is only reformatted when its source object changes.
+    """
+    
+    def __init__(self):
+        self._sections: Dict[str, Tuple[Any, str]] = {}
+    
+    def get(self, name: str, source: Any, build: Callable[[Any], str]) -> str:
+        cached = self._sections.get(name)
+        if cached is not None and cached[0] is source:
+            return cached[1]
+        
+        text = build(source)
+        self._sections[name] = (source, text)
+        return text
+
+
 class IntentAnalysis:
     """Result of intent analysis"""
     def __init__(
@@ -37,6 +105,7 @@ class IntentParser:
     
     def __init__(self, llm_client: LLMClient):
         self.llm = llm_client
+        self._sections = PromptSectionCache()
     
     async def parse_intent(
         self, 
@@ -75,7 +144,8 @@ class IntentParser:
     ) -> str:
         """Build prompt for intent analysis"""
         
-        pattern_examples = self._format_pattern_examples(route_patterns)
+        pattern_examples = self._sections.get("pattern_examples", route_patterns, self._format_pattern_examples)
+        domain_vocabulary = self._sections.get("domain_vocabulary", domain_context, self._format_domain_vocabulary)
         
         # TODO: The only actions should be NAVIGATE and QUERY. Navigate should redirect to views were user creates/edit something.
         return f"""
@@ -84,7 +154,7 @@ You are an expert at understanding user intents for web application navigation.
 DOMAIN CONTEXT:
 - Domain: {domain_context.domain_name}
 - Primary entities: {', '.join(domain_context.primary_entities)}
-- Domain vocabulary: {json.dumps(domain_context.domain_vocabulary, indent=2)}
+- Domain vocabulary: {domain_vocabulary}
 
 AVAILABLE ROUTE PATTERNS:
 {pattern_examples}
@@ -125,7 +195,8 @@ Analyze the query now:
     ) -> str:
         """Build prompt for entity resolution analysis"""
         
-        schema_summary = self._format_schema_summary(database_schema)
+        schema_summary = self._sections.get("schema", database_schema, self._format_schema_summary)
+        relationships = self._sections.get("relationships", domain_context, self._format_relationships)
         
         # TODO: im not sure if this is able to redirect to URLs, since it does not create them
         return f"""
@@ -139,7 +210,7 @@ DATABASE SCHEMA:
 {schema_summary}
 
 DOMAIN RELATIONSHIPS:
-{json.dumps(domain_context.common_relationships, indent=2)}
+{relationships}
 
 TASK: For each entity, determine:
 1. What TYPE of entity it is (person, property, etc.)
@@ -172,6 +243,16 @@ RESPONSE FORMAT (JSON):
 Analyze the entities now:
 """
 
+    @staticmethod
+    def _format_domain_vocabulary(domain_context: DomainContext) -> str:
+        """Format the domain vocabulary for the intent prompt"""
+        return json.dumps(domain_context.domain_vocabulary, indent=2)
+    
+    @staticmethod
+    def _format_relationships(domain_context: DomainContext) -> str:
+        """Format the domain relationships for the entity resolution prompt"""
+        return json.dumps(domain_context.common_relationships, indent=2)
+    
     def _format_pattern_examples(self, route_patterns: List[Dict[str, Any]]) -> str:
         """Format route patterns for the prompt"""
         examples = []
@@ -201,7 +282,7 @@ Analyze the entities now:
     def _parse_llm_response(self, response: Dict[str, Any]) -> IntentAnalysis:
         """Parse LLM response into IntentAnalysis"""
         try:
-            action_type = ActionType(response.get('action_type', 'NAVIGATE'))
+            action_type = action_type_of(response.get('action_type', 'NAVIGATE'))
             entities = response.get('entities', [])
             view_type = response.get('view_type')
             confidence = float(response.get('confidence', 0.0))
@@ -235,21 +316,23 @@ Analyze the entities now:
         """Parse LLM response into EntityResolutionPlan"""
         
         try:
-            resolutions = []
-            for res in response.get('entity_resolutions', []):
-                resolution = ContextualEntityResolution(
-                    entity_name=res.get('entity_name', ''),
-                    inferred_type=res.get('inferred_type', ''),
-                    confidence=float(res.get('confidence', 0.0)),
-                    recommended_tables=res.get('recommended_tables', []),
-                    search_fields=res.get('search_fields', []),
-                    join_strategy=res.get('join_strategy'),
-                    reasoning=res.get('reasoning', ''),
-                    context_clues=res.get('context_clues', [])
-                )
-                resolutions.append(resolution)
+            # LLM output, so it is still validated
+            resolutions = _RESOLUTIONS_ADAPTER.validate_python([
+                {
+                    "entity_name": res.get('entity_name', ''),
+                    "inferred_type": res.get('inferred_type', ''),
+                    "confidence": float(res.get('confidence', 0.0)),
+                    "recommended_tables": res.get('recommended_tables', []),
+                    "search_fields": res.get('search_fields', []),
+                    "join_strategy": res.get('join_strategy'),
+                    "reasoning": res.get('reasoning', ''),
+                    "context_clues": res.get('context_clues', [])
+                }
+                for res in response.get('entity_resolutions', [])
+            ])
             
-            return EntityResolutionPlan(
+            # Downstream code only reads resolution_strategies, validated above, so skip re-validating the wrapper
+            return EntityResolutionPlan.model_construct(
                 query=query,
                 entities_to_resolve=entities,
                 resolution_strategies=resolutions,
@@ -261,7 +344,7 @@ Analyze the entities now:
             
         except (ValueError, KeyError) as e:
             # Fallback for malformed responses
-            return EntityResolutionPlan(
+            return EntityResolutionPlan.model_construct(
                 query=query,
                 entities_to_resolve=entities,
                 resolution_strategies=[],
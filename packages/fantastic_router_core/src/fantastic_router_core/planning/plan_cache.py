@@ -0,0 +1,170 @@
+"""
+Plan cache for FantasticRouter
+Serves repeated and paraphrased queries without another LLM round trip
+"""
+
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    np = None
+    SentenceTransformer = None
+
+from ..models.actions import ActionPlan
+
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# (user_role, max_results): plans are only reused within the same scope
+Scope = Tuple[Optional[str], int]
+
+
+class SemanticPlanCache:
+    """
+    Two-tier cache of ActionPlans
+    
+    1. Exact: keyed on the normalized query text within a scope.
+    2. Semantic: cosine similarity between query embeddings, kept as rows of one
+       contiguous float32 matrix so a lookup is a single matrix-vector product.
+    
+    The semantic tier needs sentence-transformers; without it only the exact tier
+    is used. Hits are deep copies, so callers may modify the returned plan.
+    """
+    
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL,
+        threshold: float = 0.92,
+        ttl_seconds: float = 300,
+        max_entries: int = 1000,
+        semantic: bool = True
+    ):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        
+        self._exact: "OrderedDict[Tuple[str, Optional[str], int], Tuple[float, ActionPlan]]" = OrderedDict()
+        
+        self.model = None
+        if semantic:
+            if SentenceTransformer is None:
+                print("⚠️  sentence-transformers not installed, plan cache is exact-match only")
+            else:
+                self.model = SentenceTransformer(model_name)
+                
+                # Ring buffer: row i of _vectors belongs to _entries[i]
+                dim = self.model.get_sentence_embedding_dimension()
+                self._vectors = np.zeros((max_entries, dim), dtype=np.float32)
+        
+        self._entries: List[Tuple[Scope, float, ActionPlan]] = []
+        self._next = 0
+        
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def _normalize(query: str) -> str:
+        return " ".join(query.lower().split())
+    
+    async def _embed(self, query: str) -> "np.ndarray":
+        """Embed a query off the event loop, normalized to unit length"""
+        vector = await asyncio.to_thread(
+            self.model.encode, query, convert_to_numpy=True, normalize_embeddings=True
+        )
+        return vector.astype(np.float32, copy=False)
+    
+    async def get(self, query: str, user_role: Optional[str], max_results: int) -> Optional[ActionPlan]:
+        """Return a copy of the cached plan for this query, or None on a miss"""
+        normalized = self._normalize(query)
+        scope = (user_role, max_results)
+        now = time.monotonic()
+        
+        entry = self._exact.get((normalized, *scope))
+        if entry is not None:
+            expires_at, plan = entry
+            if now < expires_at:
+                self._exact.move_to_end((normalized, *scope))
+                self.hits += 1
+                return plan.model_copy(deep=True)
+            del self._exact[(normalized, *scope)]
+        
+        if self.model is not None and self._entries:
+            query_vector = await self._embed(query)
+            
+            # Snapshot after the await: a concurrent put() may have added rows meanwhile
+            entries = list(self._entries)
+            sims = self._vectors[:len(entries)] @ query_vector
+            
+            # Rule out other scopes, expired entries and plans about other entities
+            for i, (entry_scope, expires_at, plan) in enumerate(entries):
+                if entry_scope != scope or now >= expires_at or not _mentions_entities(normalized, plan):
+                    sims[i] = -1.0
+            
+            best = int(np.argmax(sims))
+            if sims[best] >= self.threshold:
+                self.hits += 1
+                self.semantic_hits += 1
+                return entries[best][2].model_copy(deep=True)
+        
+        self.misses += 1
+        return None
+    
+    async def put(self, query: str, user_role: Optional[str], max_results: int, plan: ActionPlan):
+        """Store a plan; failed (zero-confidence) plans are never cached"""
+        if plan.confidence <= 0.0:
+            return
+        
+        normalized = self._normalize(query)
+        scope = (user_role, max_results)
+        expires_at = time.monotonic() + self.ttl_seconds
+        stored = plan.model_copy(deep=True)
+        
+        self._exact[(normalized, *scope)] = (expires_at, stored)
+        self._exact.move_to_end((normalized, *scope))
+        while len(self._exact) > self.max_entries:
+            self._exact.popitem(last=False)
+        
+        if self.model is not None:
+            self._vectors[self._next] = await self._embed(query)
+            entry = (scope, expires_at, stored)
+            if self._next < len(self._entries):
+                self._entries[self._next] = entry
+            else:
+                self._entries.append(entry)
+            self._next = (self._next + 1) % self.max_entries
+    
+    def clear(self):
+        self._exact.clear()
+        self._entries = []
+        self._next = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "exact_entries": len(self._exact),
+            "semantic_entries": len(self._entries),
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
+def _mentions_entities(normalized_query: str, plan: ActionPlan) -> bool:
+    """
+    Check that the query names every entity the cached plan resolved
+    
+    "James Smith's income" and "John Doe's income" embed very close together,
+    but their routes differ.
+    """
+    for entity in plan.entities:
+        for token in (entity.name or "").lower().split():
+            if not re.search(rf"\b{re.escape(token)}\b", normalized_query):
+                return False
+    return True
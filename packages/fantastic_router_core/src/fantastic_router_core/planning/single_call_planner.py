@@ -2,30 +2,132 @@
 Optimized single-call action planner for faster performance
 """
 
+import asyncio
 import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import re # Added for regex validation
 
-from ..models.actions import ActionPlan, ActionType, RouteParameter, PlanningContext
+from pydantic import TypeAdapter
+
+from ..models.actions import ActionPlan, ActionType, RouteParameter, PlanningContext, action_type_of
 from ..models.entities import EntityMatch
-from .intent_parser import LLMClient
+from .intent_parser import LLMClient, PromptSectionCache
+
+# Validates every route parameter in an LLM response in one call into pydantic-core
+_PARAMETERS_ADAPTER = TypeAdapter(List[RouteParameter])
+
+
+class _EntityResolutionScanner:
+    """
+    Picks completed items out of the "entity_resolution" array of streamed JSON text
+    
+    Fed one chunk at a time; string literals are tracked so brackets inside
+    values don't affect the depth. Stops scanning once the array closes.
+    """
+    
+    _KEY = '"entity_resolution"'
+    
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._in_array = False
+        self._done = False
+        self._depth = 0
+        self._item_start = -1
+        self._in_string = False
+        self._escape = False
+    
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Add a chunk and return the array items it completed"""
+        if self._done:
+            return []
+        
+        self._text += chunk
+        text = self._text
+        
+        if not self._in_array and not self._find_array_start():
+            return []
+        
+        items = []
+        for i in range(self._pos, len(text)):
+            char = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            
+            if char == '"':
+                self._in_string = True
+            elif char in '{[':
+                if self._depth == 0:
+                    self._item_start = i
+                self._depth += 1
+            elif char in '}]':
+                if self._depth == 0:
+                    # End of the array
+                    self._done = True
+                    break
+                
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        item = json.loads(text[self._item_start:i + 1])
+                    except ValueError:
+                        continue
+                    if isinstance(item, dict):
+                        items.append(item)
+        
+        self._pos = len(text)
+        return items
+    
+    def _find_array_start(self) -> bool:
+        """Advance past `"entity_resolution": [`, returning False until it has arrived"""
+        key = self._text.find(self._KEY, self._pos)
+        if key == -1:
+            # The key may be split across chunks
+            self._pos = max(0, len(self._text) - len(self._KEY))
+            return False
+        
+        self._pos = key
+        for i in range(key + len(self._KEY), len(self._text)):
+            char = self._text[i]
+            if char == '[':
+                self._in_array = True
+                self._pos = i + 1
+                return True
+            if char not in ': \t\r\n':
+                # Not an array (e.g. null); nothing to prefetch
+                self._done = True
+                return False
+        return False
 
 
 class SingleCallActionPlanner:
     """Optimized planner that does intent parsing, entity resolution, and route matching in one LLM call"""
     
-    def __init__(self, llm_client: LLMClient, entity_resolver: Any):
+    def __init__(self, llm_client: LLMClient, entity_resolver: Any, stream_entity_lookups: bool = False):
         self.llm = llm_client
         self.entity_resolver = entity_resolver
+        self._sections = PromptSectionCache()
+        
+        # Start entity lookups while the LLM is still generating (needs a client with analyze_stream)
+        self.stream_entity_lookups = stream_entity_lookups and hasattr(llm_client, "analyze_stream")
     
     async def plan_action(self, context: PlanningContext) -> ActionPlan:
         """Plan an action with a single LLM call instead of three"""
         
         # Single comprehensive LLM call with alternatives
-        llm_response = await self._comprehensive_analysis(context)
+        if self.stream_entity_lookups:
+            llm_response, prefetched = await self._streaming_analysis(context)
+        else:
+            llm_response, prefetched = await self._comprehensive_analysis(context), {}
         
         # Resolve entities based on LLM suggestions
-        entities = await self._resolve_suggested_entities(llm_response, context)
+        entities = await self._resolve_suggested_entities(llm_response, context, prefetched)
         
         # Build final action plan with alternatives
         return self._build_action_plan_with_alternatives(context, llm_response, entities)
@@ -36,14 +138,53 @@ class SingleCallActionPlanner:
         prompt = self._build_comprehensive_prompt(context)
         return await self.llm.analyze(prompt, temperature=0.1)
     
+    async def _streaming_analysis(
+        self,
+        context: PlanningContext
+    ) -> Tuple[Dict[str, Any], Dict[Tuple[str, str, str], "asyncio.Future[List[EntityMatch]]"]]:
+        """
+        Stream the comprehensive analysis, starting each entity lookup as soon as
+        its entity_resolution item is complete
+        
+        Returns the parsed response and the lookups started, keyed by _resolution_key.
+        """
+        prompt = self._build_comprehensive_prompt(context)
+        scanner = _EntityResolutionScanner()
+        prefetched: Dict[Tuple[str, str, str], "asyncio.Future[List[EntityMatch]]"] = {}
+        chunks = []
+        
+        try:
+            async for chunk in self.llm.analyze_stream(prompt, temperature=0.1):
+                chunks.append(chunk)
+                for resolution in scanner.feed(chunk):
+                    key = self._resolution_key(resolution)
+                    if key not in prefetched:
+                        prefetched[key] = asyncio.ensure_future(self._search_resolution(resolution))
+        except Exception as e:
+            for task in prefetched.values():
+                task.cancel()
+            print(f"Warning: Streaming analysis failed, falling back to a single call: {e}")
+            return await self._comprehensive_analysis(context), {}
+        
+        text = "".join(chunks)
+        start, end = text.find('{'), text.rfind('}')
+        try:
+            return json.loads(text[start:end + 1]), prefetched
+        except ValueError:
+            for task in prefetched.values():
+                task.cancel()
+            return {
+                "error": "Could not parse streamed LLM response as JSON",
+                "confidence": 0.0,
+                "reasoning": "LLM returned unparseable response"
+            }, {}
+    
     def _build_comprehensive_prompt(self, context: PlanningContext) -> str:
         """Build a single comprehensive prompt that handles all analysis steps"""
         
-        # Format database schema
-        schema_summary = self._format_schema_summary(context.database_schema)
-        
-        # Format route patterns
-        patterns_text = self._format_route_patterns(context.route_patterns)
+        # Format database schema and route patterns (reused until the router's config changes)
+        schema_summary = self._sections.get("schema", context.database_schema, self._format_schema_summary)
+        patterns_text = self._sections.get("route_patterns", context.route_patterns, self._format_route_patterns)
         
         return f"""
 You are an expert at analyzing user queries for web application routing. Complete ALL analysis in one response.
@@ -280,29 +421,59 @@ Analyze the query now:
     async def _resolve_suggested_entities(
         self, 
         llm_response: Dict[str, Any], 
-        context: PlanningContext
+        context: PlanningContext,
+        prefetched: Optional[Dict[Tuple[str, str, str], "asyncio.Future[List[EntityMatch]]"]] = None
     ) -> List[EntityMatch]:
-        """Resolve entities based on LLM suggestions"""
+        """Resolve entities based on LLM suggestions, reusing lookups already started while streaming"""
         
-        entities = []
-        entity_resolutions = llm_response.get('entity_resolution', [])
+        prefetched = dict(prefetched or {})
         
-        for resolution in entity_resolutions:
-            try:
-                matches = await self.entity_resolver.search_entity(
-                    entity_name=resolution.get('entity_name', ''),
-                    tables=resolution.get('search_tables', []),
-                    search_fields=resolution.get('search_fields', []),
-                    max_results=5,
-                    min_confidence=0.5
-                )
-                entities.extend(matches)
-            except Exception as e:
-                print(f"Error resolving entity {resolution.get('entity_name')}: {e}")
+        # The prompt asks for entity_resolution inside primary_plan, which is where the streaming
+        # scanner picks items up; the default path keeps reading only the top-level key
+        entity_resolutions = llm_response.get('entity_resolution')
+        if entity_resolutions is None and self.stream_entity_lookups:
+            entity_resolutions = (llm_response.get('primary_plan') or {}).get('entity_resolution')
+        entity_resolutions = entity_resolutions or []
+        entity_resolutions = [resolution for resolution in entity_resolutions if isinstance(resolution, dict)]
+        
+        lookups = [
+            prefetched.pop(self._resolution_key(resolution), None) or self._search_resolution(resolution)
+            for resolution in entity_resolutions
+        ]
+        
+        # Lookups for items the final response no longer contains
+        for task in prefetched.values():
+            task.cancel()
+        
+        entities = []
+        results = await asyncio.gather(*lookups, return_exceptions=True)
+        for resolution, matches in zip(entity_resolutions, results):
+            if isinstance(matches, BaseException):
+                print(f"Error resolving entity {resolution.get('entity_name')}: {matches}")
                 continue
+            entities.extend(matches)
         
         return entities
     
+    async def _search_resolution(self, resolution: Dict[str, Any]) -> List[EntityMatch]:
+        """Run the entity search for one entity_resolution item"""
+        return await self.entity_resolver.search_entity(
+            entity_name=resolution.get('entity_name', ''),
+            tables=resolution.get('search_tables', []),
+            search_fields=resolution.get('search_fields', []),
+            max_results=5,
+            min_confidence=0.5
+        )
+    
+    @staticmethod
+    def _resolution_key(resolution: Dict[str, Any]) -> Tuple[str, str, str]:
+        """Identify an entity_resolution item by what it searches for"""
+        return (
+            str(resolution.get('entity_name', '')),
+            repr(resolution.get('search_tables', [])),
+            repr(resolution.get('search_fields', []))
+        )
+    
     def _build_action_plan_with_alternatives(
         self,
         context: PlanningContext,
@@ -368,18 +539,19 @@ Analyze the query now:
                 param_value = entities[0].id  # Use first found entity
                 resolved_route = resolved_route.replace('ENTITY_ID_PLACEHOLDER', param_value)
             
-            parameters.append(RouteParameter(
-                name=param.get('name') or '',  # Handle None values
-                value=param_value,
-                type=param.get('type') or 'string',  # Handle None values
-                source=param.get('source') or 'llm'  # Handle None values
-            ))
-        
-        # Convert entities to ActionPlan format
+            parameters.append({
+                "name": param.get('name') or '',  # Handle None values
+                "value": param_value,
+                "type": param.get('type') or 'string',  # Handle None values
+                "source": param.get('source') or 'llm'  # Handle None values
+            })
+        parameters = _PARAMETERS_ADAPTER.validate_python(parameters)
+        
+        # Convert entities to ActionPlan format; fields were already validated on the retrieval model
         from ..models.actions import EntityMatch as ActionEntityMatch
         action_entities = []
         for entity in entities:
-            action_entity = ActionEntityMatch(
+            action_entity = ActionEntityMatch.model_construct(
                 id=entity.id,
                 name=entity.name,
                 table=entity.table,
@@ -391,7 +563,7 @@ Analyze the query now:
         # Safely extract action type
         action_type_str = intent.get('action_type') or 'NAVIGATE'
         try:
-            action_type = ActionType(action_type_str)
+            action_type = action_type_of(action_type_str)
         except ValueError:
             action_type = ActionType.NAVIGATE
         
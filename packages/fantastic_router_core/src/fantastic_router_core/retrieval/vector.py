@@ -161,10 +161,10 @@ class EntityResolver:
                         limit=max_results
                     )
                     
-                    for result in results:
-                        # Calculate fuzzy confidence based on similarity
-                        confidence = self._calculate_fuzzy_confidence(entity_name, result, search_fields)
-                        
+                    # Calculate fuzzy confidence based on similarity, for the whole batch at once
+                    confidences = self._fuzzy_confidences(entity_name, results, search_fields)
+                    
+                    for result, confidence in zip(results, confidences):
                         if confidence > 0.6:  # Only include reasonable matches
                             match = self._convert_to_entity_match(
                                 result, table, entity_name, search_fields,
@@ -220,9 +220,9 @@ class EntityResolver:
                             limit=max_results
                         )
                         
-                        for result in results:
-                            confidence = self._calculate_text_match_confidence(entity_name, result, search_fields)
-                            
+                        confidences = self._text_match_confidences(entity_name, results, search_fields)
+                        
+                        for result, confidence in zip(results, confidences):
                             if confidence > 0.4:  # Lower threshold for text search
                                 match = self._convert_to_entity_match(
                                     result, table, entity_name, search_fields,
@@ -264,10 +264,11 @@ class EntityResolver:
                 return None
             
             # Determine which fields matched
-            matched_fields = []
-            for field in search_fields:
-                if field in result and original_query.lower() in str(result[field]).lower():
-                    matched_fields.append(field)
+            query_lower = original_query.lower()
+            matched_fields = [
+                field for field in search_fields
+                if field in result and query_lower in str(result[field]).lower()
+            ]
             
             return EntityMatch(
                 id=entity_id,
@@ -284,41 +285,48 @@ class EntityResolver:
             print(f"Error converting result to EntityMatch: {e}")
             return None
     
-    def _calculate_fuzzy_confidence(
-        self, 
-        query: str, 
-        result: Dict[str, Any], 
+    def _fuzzy_confidences(
+        self,
+        query: str,
+        results: List[Dict[str, Any]],
         search_fields: List[str]
-    ) -> float:
-        """Calculate confidence for fuzzy matches"""
+    ) -> List[float]:
+        """Calculate fuzzy-match confidence for a batch of results, normalizing the query once"""
         
         query_lower = query.lower()
-        max_confidence = 0.0
+        query_words = query_lower.split()
+        confidences = []
         
-        for field in search_fields:
-            if field in result and result[field]:
-                field_value = str(result[field]).lower()
-                
-                # Simple similarity calculation
-                if query_lower == field_value:
-                    max_confidence = max(max_confidence, 0.95)
-                elif query_lower in field_value or field_value in query_lower:
-                    max_confidence = max(max_confidence, 0.8)
-                elif any(word in field_value for word in query_lower.split()):
-                    max_confidence = max(max_confidence, 0.6)
+        for result in results:
+            max_confidence = 0.0
+            
+            for field in search_fields:
+                if field in result and result[field]:
+                    field_value = str(result[field]).lower()
+                    
+                    # Simple similarity calculation; an exact match can't be beaten
+                    if query_lower == field_value:
+                        max_confidence = 0.95
+                        break
+                    elif query_lower in field_value or field_value in query_lower:
+                        max_confidence = max(max_confidence, 0.8)
+                    elif max_confidence < 0.6 and any(word in field_value for word in query_words):
+                        max_confidence = 0.6
+            
+            confidences.append(max_confidence)
         
-        return max_confidence
+        return confidences
     
-    def _calculate_text_match_confidence(
+    def _text_match_confidences(
         self,
         query: str,
-        result: Dict[str, Any],
+        results: List[Dict[str, Any]],
         search_fields: List[str]
-    ) -> float:
-        """Calculate confidence for text matches"""
+    ) -> List[float]:
+        """Calculate confidence for a batch of text matches"""
         
         # Similar to fuzzy but with lower baseline confidence
-        return max(0.4, self._calculate_fuzzy_confidence(query, result, search_fields) * 0.7)
+        return [max(0.4, confidence * 0.7) for confidence in self._fuzzy_confidences(query, results, search_fields)]
     
     def _infer_entity_type_from_table(self, table: str) -> str:
         """Infer entity type from table name"""
@@ -65,6 +65,10 @@ class DependencyContainer:
                 max_tokens = int(llm_config.get('max_tokens', 1000))
                 timeout = int(llm_config.get('timeout', 60))
                 
+                # Micro-batching of concurrent requests (0 disables it)
+                batch_window_ms = float(llm_config.get('batch_window_ms', 0)) or None
+                max_batch = int(llm_config.get('max_batch', 16))
+                
                 # Get provider-specific configuration
                 if provider == "openai":
                     openai_config = llm_config.get('openai', {})
@@ -79,7 +83,9 @@ class DependencyContainer:
                             return create_openai_client(
                                 api_key=api_key, 
                                 model=model, 
-                                max_tokens=max_tokens
+                                max_tokens=max_tokens,
+                                batch_window_ms=batch_window_ms,
+                                max_batch=max_batch
                             )
                         except ImportError:
                             pass
@@ -97,7 +103,9 @@ class DependencyContainer:
                             return create_gemini_client(
                                 api_key=api_key, 
                                 model=model,
-                                temperature=temperature
+                                temperature=temperature,
+                                batch_window_ms=batch_window_ms,
+                                max_batch=max_batch
                             )
                         except ImportError:
                             pass
@@ -132,7 +140,9 @@ class DependencyContainer:
                         return create_ollama_client(
                             base_url=base_url, 
                             model=model,
-                            temperature=temperature
+                            temperature=temperature,
+                            batch_window_ms=batch_window_ms,
+                            max_batch=max_batch
                         )
                     except ImportError:
                         pass
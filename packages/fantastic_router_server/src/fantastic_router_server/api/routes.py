@@ -3,6 +3,7 @@ API Routes for Fantastic Router Server
 Defines the main endpoints for routing and planning functionality
 """
 
+import asyncio
 import time
 import hashlib
 import json
@@ -12,10 +13,16 @@ from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from pydantic import BaseModel, Field
 
 from fantastic_router_core import FantasticRouter
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
 from .deps import get_router, get_settings
+from .semantic_cache import SemanticCache, create_semantic_cache
 from fastapi import Request
 
-# Dual caching system: Request cache + Structural cache
+# Caching tiers: Request cache + Structural cache (+ Semantic cache, see semantic_cache.py)
 # TODO: use redis instead of in-memory cache
 _request_cache: Dict[str, Dict[str, Any]] = {}
 _request_cache_ttl: Dict[str, float] = {}
@@ -25,6 +32,38 @@ _structural_cache_ttl: Dict[str, float] = {}
 CACHE_TTL_SECONDS = 300  # 5 minutes
 STRUCTURAL_CACHE_TTL_SECONDS = 1800  # 30 minutes (longer for structural patterns)
 
+# Query normalization, compiled once at import
+# Filler prefixes are tried longest first, so "show me ..." isn't cut down to "me ..." by "show"
+_FILLER_PREFIXES = (
+    'show me', 'show', 'get', 'find', 'look up', 'search for',
+    'display', 'view', 'see', 'give me', 'bring up'
+)
+_FILLER_PREFIX_RE = re.compile(
+    r'^(?:' + '|'.join(re.escape(f) for f in sorted(_FILLER_PREFIXES, key=len, reverse=True)) + r') \s*'
+)
+_POSSESSIVE_RE = re.compile(r'(\w+)s\s+(\w+)')
+# Synonyms collapsed to one canonical word, in a single pass
+_SYNONYMS = {
+    'properties': 'properties', 'property': 'properties',
+    'income': 'income', 'earnings': 'income', 'salary': 'income',
+    'contact': 'contact', 'info': 'contact', 'information': 'contact'
+}
+_SYNONYM_RE = re.compile(r'\b(' + '|'.join(sorted(_SYNONYMS, key=len, reverse=True)) + r')\b')
+
+# Third tier: embedding-similarity cache for paraphrases (built lazily, None if unavailable)
+_semantic_cache: Optional[SemanticCache] = None
+_semantic_cache_initialized = False
+
+async def _get_semantic_cache(settings: Dict[str, Any]) -> Optional[SemanticCache]:
+    """Return the semantic cache, loading the embedding model on first use"""
+    global _semantic_cache, _semantic_cache_initialized
+    
+    if not _semantic_cache_initialized:
+        _semantic_cache_initialized = True  # Concurrent requests skip this tier while the model loads
+        _semantic_cache = await asyncio.to_thread(create_semantic_cache, settings.get('caching', {}))
+    
+    return _semantic_cache
+
 def _extract_structural_pattern(query: str, action_plan: Dict[str, Any]) -> Tuple[str, Dict[str, str]]:
     """
     Extract structural pattern from query and action plan.
@@ -94,36 +133,25 @@ def _normalize_query(query: str) -> str:
     normalized = query.lower().strip()
     
     # Remove common filler words that don't affect meaning
-    filler_words = {
-        'show me', 'show', 'get', 'find', 'look up', 'search for',
-        'display', 'view', 'see', 'give me', 'bring up'
-    }
-    
-    for filler in filler_words:
-        if normalized.startswith(filler + ' '):
-            normalized = normalized[len(filler):].strip()
-            break
+    normalized = _FILLER_PREFIX_RE.sub('', normalized, count=1)
     
     # Handle possessive variations
     # "michaels properties" -> "michael's properties"
-    normalized = re.sub(r'(\w+)s\s+(\w+)', r"\1's \2", normalized)
+    normalized = _POSSESSIVE_RE.sub(r"\1's \2", normalized)
     
     # Handle common contractions and variations
-    normalized = re.sub(r'\b(properties|property)\b', 'properties', normalized)
-    normalized = re.sub(r'\b(income|earnings|salary)\b', 'income', normalized)
-    normalized = re.sub(r'\b(contact|info|information)\b', 'contact', normalized)
+    normalized = _SYNONYM_RE.sub(lambda m: _SYNONYMS[m.group(1)], normalized)
     
     return normalized
 
 def _generate_request_cache_key(query: str, user_id: Optional[str], user_role: Optional[str]) -> str:
     """Generate cache key for exact request matching"""
-    cache_data = {
-        "query": query.lower().strip(),
-        "user_id": user_id,
-        "user_role": user_role
-    }
-    cache_str = json.dumps(cache_data, sort_keys=True)
-    return hashlib.md5(cache_str.encode()).hexdigest()
+    # The cache is an in-process dict, so a fast non-cryptographic hash is enough;
+    # repr() keeps None distinct from the string "None"
+    cache_str = "\0".join((query.lower().strip(), repr(user_id), repr(user_role)))
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(cache_str)
+    return hashlib.blake2b(cache_str.encode(), digest_size=8).hexdigest()
 
 def _get_cached_response(cache_key: str, cache_type: str = "request") -> Optional[Dict[str, Any]]:
     """Get cached response if available and not expired"""
@@ -501,6 +529,29 @@ async def plan_route(
             
             print(f"✅ Cache hit! Returning cached response")
             return PlanResponse(**structural_hit)
+        
+        # Step 3: Check semantic cache (paraphrases of recent queries)
+        semantic_cache = await _get_semantic_cache(settings)
+        semantic_hit = None
+        query_vector = None  # Reused by add() on a miss
+        if semantic_cache is not None:
+            try:
+                semantic_hit, query_vector = await semantic_cache.lookup(request.query, (request.user_id, request.user_role))
+            except Exception as e:
+                print(f"❌ Semantic cache check failed: {e}")
+                semantic_hit = None
+        
+        if semantic_hit:
+            cached, similarity = semantic_hit
+            semantic_response = json.loads(json.dumps(cached))  # Copy so the cached entry isn't mutated
+            cache_hits = 1
+            duration_ms = (time.time() - start_time) * 1000
+            semantic_response["performance"]["duration_ms"] = round(duration_ms, 2)
+            semantic_response["performance"]["cache_hits"] = cache_hits
+            semantic_response["performance"]["cache_type"] = "semantic"
+            semantic_response["performance"]["similarity"] = round(similarity, 4)
+            print(f"✅ Semantic cache hit (similarity={similarity:.3f})! Returning cached response")
+            return PlanResponse(**semantic_response)
     else:
         print("🚫 Cache disabled - skipping cache checks")
     
@@ -617,6 +668,20 @@ async def plan_route(
             _cache_response(request_cache_key, response.dict(), "request")
             print(f"💾 Cached response for key={request_cache_key[:10]}...")
             
+            if semantic_cache is not None:
+                try:
+                    semantic_entry = json.loads(json.dumps(response.dict(), default=str))
+                    background_tasks.add_task(
+                        add_semantic_entry,
+                        semantic_cache,
+                        request.query,
+                        (request.user_id, request.user_role),
+                        semantic_entry,
+                        query_vector
+                    )
+                except Exception as e:
+                    print(f"❌ Failed to cache semantic entry: {e}")
+            
             # Step 3: Extract and cache structural pattern for similar queries
             try:
                 structural_key, entity_mapping = _extract_structural_pattern(request.query, action_plan_dict)
@@ -856,6 +921,7 @@ async def get_cache_stats():
             "ttl_seconds": STRUCTURAL_CACHE_TTL_SECONDS,
             "estimated_memory_mb": len(_structural_cache) * 0.15  # Rough estimate
         },
+        "semantic_cache": _semantic_cache.get_stats() if _semantic_cache is not None else {"enabled": False},
         "cache_patterns": list(_structural_cache.keys())[:10]  # Show first 10 patterns
     }
 
@@ -864,7 +930,7 @@ async def clear_cache():
     """
     Clear all caches
     
-    Clears both request-level and structural caches.
+    Clears the request-level, structural and semantic caches.
     Useful for testing or when cache becomes stale.
     """
     global _request_cache, _request_cache_ttl, _structural_cache, _structural_cache_ttl
@@ -876,12 +942,14 @@ async def clear_cache():
     _request_cache_ttl.clear()
     _structural_cache.clear()
     _structural_cache_ttl.clear()
+    semantic_cache_size = _semantic_cache.clear() if _semantic_cache is not None else 0
     
     return {
         "message": "Cache cleared successfully",
         "cleared_entries": {
             "request_cache": request_cache_size,
-            "structural_cache": structural_cache_size
+            "structural_cache": structural_cache_size,
+            "semantic_cache": semantic_cache_size
         }
     }
 
@@ -893,6 +961,20 @@ async def log_performance(query: str, duration_ms: float, confidence: float, lev
     print(f"PERF: {level} | {duration_ms:.0f}ms | conf={confidence:.2f} | query='{query[:50]}...'")
 
 
+async def add_semantic_entry(
+    semantic_cache: SemanticCache,
+    query: str,
+    scope: Tuple[Optional[str], Optional[str]],
+    response: Dict[str, Any],
+    query_vector: Any = None
+):
+    """Store a response in the semantic cache in background"""
+    try:
+        await semantic_cache.add(query, scope, response, query_vector)
+    except Exception as e:
+        print(f"❌ Failed to cache semantic entry: {e}")
+
+
 async def log_error(query: str, error: str, duration_ms: float):
     """Log errors in background"""
     # TODO: Implement actual error logging
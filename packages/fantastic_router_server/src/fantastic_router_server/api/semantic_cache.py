@@ -0,0 +1,162 @@
+"""
+Semantic (embedding-based) response cache for the planning endpoint
+Catches paraphrases that miss both the request and structural caches
+"""
+
+import asyncio
+import re
+import time
+from typing import Dict, Any, Optional, List, Tuple
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    np = None
+    SentenceTransformer = None
+
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+class SemanticCache:
+    """
+    Cache of plan responses looked up by cosine similarity between queries
+    
+    Query embeddings are L2-normalized and kept in one contiguous float32
+    matrix, so a lookup is a single matrix-vector product; only entries above
+    the similarity threshold are then checked individually.
+    Entries are scoped by (user_id, user_role) like the request cache.
+    """
+    
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL,
+        threshold: float = 0.9,
+        ttl_seconds: float = 1800,
+        max_entries: int = 1000
+    ):
+        if SentenceTransformer is None:
+            raise ImportError(
+                "sentence-transformers package not found. "
+                "Install with: pip install sentence-transformers"
+            )
+        
+        self.model = SentenceTransformer(model_name)
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        
+        # Ring buffer: row i of _vectors belongs to _entries[i]
+        dim = self.model.get_sentence_embedding_dimension()
+        self._vectors = np.zeros((max_entries, dim), dtype=np.float32)
+        self._entries: List[Tuple[str, Tuple[Optional[str], Optional[str]], float, Dict[str, Any]]] = []
+        self._next = 0
+        
+        self.hits = 0
+        self.misses = 0
+    
+    async def _embed(self, query: str) -> "np.ndarray":
+        """Embed a query off the event loop, normalized to unit length"""
+        vector = await asyncio.to_thread(
+            self.model.encode, query, convert_to_numpy=True, normalize_embeddings=True
+        )
+        return vector.astype(np.float32, copy=False)
+    
+    async def lookup(
+        self, query: str, scope: Tuple[Optional[str], Optional[str]]
+    ) -> Tuple[Optional[Tuple[Dict[str, Any], float]], "np.ndarray"]:
+        """
+        Find the closest fresh entry above the threshold
+        
+        Returns ((cached response, similarity) or None, query vector); pass the
+        vector to add() on a miss so the query isn't embedded twice.
+        """
+        query_vector = await self._embed(query)
+        
+        # Snapshot after the await: a concurrent add() may have added rows meanwhile
+        entries = list(self._entries)
+        if not entries:
+            self.misses += 1
+            return None, query_vector
+        
+        sims = self._vectors[:len(entries)] @ query_vector
+        
+        # Only candidates above the threshold are checked, best first, so the per-entry
+        # filters (other users, expired, answers about other entities) stay off the hot path
+        now = time.time()
+        lowered = query.lower()
+        candidates = np.flatnonzero(sims >= self.threshold)
+        for i in candidates[np.argsort(-sims[candidates])]:
+            _, entry_scope, expires_at, response = entries[i]
+            if entry_scope == scope and now <= expires_at and _mentions_entities(lowered, response):
+                self.hits += 1
+                return (response, float(sims[i])), query_vector
+        
+        self.misses += 1
+        return None, query_vector
+    
+    async def add(
+        self,
+        query: str,
+        scope: Tuple[Optional[str], Optional[str]],
+        response: Dict[str, Any],
+        query_vector: Optional["np.ndarray"] = None
+    ):
+        """Store a response, overwriting the oldest entry once full"""
+        vector = query_vector if query_vector is not None else await self._embed(query)
+        entry = (query, scope, time.time() + self.ttl_seconds, response)
+        
+        self._vectors[self._next] = vector
+        if self._next < len(self._entries):
+            self._entries[self._next] = entry
+        else:
+            self._entries.append(entry)
+        self._next = (self._next + 1) % self.max_entries
+    
+    def clear(self) -> int:
+        """Drop all entries and return how many there were"""
+        count = len(self._entries)
+        self._entries = []
+        self._next = 0
+        return count
+    
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.time()
+        total = self.hits + self.misses
+        return {
+            "total_entries": len(self._entries),
+            "active_entries": sum(1 for _, _, expires_at, _ in self._entries if now <= expires_at),
+            "ttl_seconds": self.ttl_seconds,
+            "similarity_threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+def _mentions_entities(lowered_query: str, response: Dict[str, Any]) -> bool:
+    """
+    Check that the query names every entity the cached plan resolved
+    
+    Paraphrases about a different person ("Sarah's properties" vs "John's
+    properties") embed very close together, but their routes differ.
+    """
+    for entity in response.get("action_plan", {}).get("entities", []):
+        for token in (entity.get("name") or "").lower().split():
+            if not re.search(rf"\b{re.escape(token)}\b", lowered_query):
+                return False
+    return True
+
+def create_semantic_cache(caching_settings: Dict[str, Any]) -> Optional[SemanticCache]:
+    """Build the semantic cache from the `caching` settings, or None if disabled/unavailable"""
+    if not caching_settings.get("semantic_cache_enabled", False):
+        return None
+    
+    try:
+        return SemanticCache(
+            model_name=caching_settings.get("semantic_model", DEFAULT_MODEL),
+            threshold=float(caching_settings.get("semantic_similarity_threshold", 0.9)),
+            ttl_seconds=float(caching_settings.get("semantic_cache_ttl_seconds", 1800)),
+            max_entries=int(caching_settings.get("max_cache_size", 1000))
+        )
+    except Exception as e:
+        print(f"⚠️  Semantic cache disabled: {e}")
+        return None
@@ -7,36 +7,69 @@ import os
 import re
 import yaml
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+
+# libyaml's C loader parses the same documents several times faster; fall back when PyYAML was built without it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Matches ${VAR_NAME} or ${VAR_NAME:-default}
+_ENV_VAR_PATTERN = re.compile(r'\$\{([^}]+)\}')
 
 
 class ConfigLoader:
     """Loads and processes configuration files with environment variable substitution"""
     
     def __init__(self):
-        self.config_cache: Dict[str, Any] = {}
+        # path -> (file mtime, referenced env vars and their values, parsed config)
+        self.config_cache: Dict[str, Tuple[int, Tuple[Tuple[str, Optional[str]], ...], Dict[str, Any]]] = {}
+        # Default config file found by the last probe, so get_config() doesn't re-probe every location
+        self._default_path: Optional[str] = None
     
-    def load_config(self, config_path: Optional[str] = None) -> Dict[str, Any]:
+    def load_config(self, config_path: Optional[str] = None, reload: bool = False) -> Dict[str, Any]:
         """
         Load configuration from file with environment variable substitution
         
+        The parsed config is reused until the file changes or one of the
+        environment variables it references is set to a different value.
+        
         Args:
             config_path: Path to config file. If None, tries default locations
+            reload: Re-read the file even if a cached copy is still valid
             
         Returns:
             Configuration dictionary
         """
         if config_path is None:
-            config_path = self._find_config_file()
+            if reload or self._default_path is None:
+                self._default_path = self._find_config_file()
+            config_path = self._default_path
         
-        if config_path in self.config_cache:
-            return self.config_cache[config_path]
+        try:
+            mtime_ns = os.stat(config_path).st_mtime_ns
+        except FileNotFoundError:
+            if config_path != self._default_path:
+                raise
+            # The default config went away; probe the locations again
+            config_path = self._default_path = self._find_config_file()
+            mtime_ns = os.stat(config_path).st_mtime_ns
+        
+        cached = None if reload else self.config_cache.get(config_path)
+        if cached is not None:
+            cached_mtime_ns, env_values, config_data = cached
+            if cached_mtime_ns == mtime_ns and all(os.environ.get(name) == value for name, value in env_values):
+                return config_data
         
         # Load and process the config file
-        config_data = self._load_yaml_with_env_substitution(config_path)
-        self.config_cache[config_path] = config_data
+        config_data, env_names = self._load_yaml_with_env_substitution(config_path)
+        env_values = tuple((name, os.environ.get(name)) for name in env_names)
+        self.config_cache[config_path] = (mtime_ns, env_values, config_data)
         return config_data
     
+    def clear_cache(self):
+        """Forget all parsed configs so the next load re-reads them"""
+        self.config_cache.clear()
+        self._default_path = None
+    
     def _find_config_file(self) -> str:
         """Find the appropriate config file to load"""
         config_paths = [
@@ -59,26 +92,40 @@ class ConfigLoader:
         
         raise FileNotFoundError("No configuration file found")
     
-    def _load_yaml_with_env_substitution(self, config_path: str) -> Dict[str, Any]:
-        """Load YAML file and substitute environment variables"""
+    def _load_yaml_with_env_substitution(self, config_path: str) -> Tuple[Dict[str, Any], Tuple[str, ...]]:
+        """Load YAML file and substitute environment variables, returning the config and the variables it references"""
         with open(config_path, 'r') as f:
             content = f.read()
         
-        # Substitute environment variables
-        processed_content = self._substitute_env_vars(content)
+        # Substitute environment variables (files without a ${ sentinel skip the regex pass)
+        if "${" in content:
+            processed_content, env_names = self._substitute_env_vars(content)
+        else:
+            processed_content = content
+            env_names = ()
         
         if config_path.endswith('.yaml') or config_path.endswith('.yml'):
-            config_data = yaml.safe_load(processed_content)
+            config_data = self._parse_yaml(processed_content)
             # Return full config for YAML files (includes llm, database, etc.)
-            return config_data
+            return config_data, env_names
         else:
             import json
-            return json.loads(processed_content)
+            return json.loads(processed_content), env_names
     
-    def _substitute_env_vars(self, content: str) -> str:
-        """Substitute environment variables in string content"""
-        # Pattern to match ${VAR_NAME} or ${VAR_NAME:-default}
-        pattern = r'\$\{([^}]+)\}'
+    def _parse_yaml(self, content: str) -> Dict[str, Any]:
+        """Parse YAML content; multi-document files are merged, later documents overriding top-level keys"""
+        if not (content.startswith('---') or '\n---' in content):
+            return yaml.load(content, Loader=_YAML_LOADER)
+        
+        config_data: Dict[str, Any] = {}
+        for document in yaml.load_all(content, Loader=_YAML_LOADER):
+            if document:
+                config_data.update(document)
+        return config_data
+    
+    def _substitute_env_vars(self, content: str) -> Tuple[str, Tuple[str, ...]]:
+        """Substitute environment variables in string content, returning it with the referenced variable names"""
+        env_names: Dict[str, None] = {}
         
         def replace_env_var(match):
             var_expr = match.group(1)
@@ -86,20 +133,27 @@ class ConfigLoader:
             # Check if there's a default value
             if ':-' in var_expr:
                 var_name, default_value = var_expr.split(':-', 1)
+                env_names[var_name] = None
                 return os.getenv(var_name, default_value)
             else:
+                env_names[var_expr] = None
                 return os.getenv(var_expr, '')
         
-        return re.sub(pattern, replace_env_var, content)
+        return _ENV_VAR_PATTERN.sub(replace_env_var, content), tuple(env_names)
 
 
 # Global config loader instance
 _config_loader = ConfigLoader()
 
 
-def get_config() -> Dict[str, Any]:
-    """Get application configuration"""
-    return _config_loader.load_config()
+def get_config(reload: bool = False) -> Dict[str, Any]:
+    """Get application configuration (pass reload=True to bypass the parsed-config cache)"""
+    return _config_loader.load_config(reload=reload)
+
+
+def clear_config_cache():
+    """Drop cached configs, e.g. after changing config files or environment in tests"""
+    _config_loader.clear_cache()
 
 
 def get_llm_config() -> Dict[str, Any]:
@@ -0,0 +1,73 @@
+"""
+Tests for the intent parser's LLM client wrappers
+"""
+
+import asyncio
+
+import pytest
+
+from fantastic_router_core.planning.intent_parser import InFlightDedup
+
+pytestmark = pytest.mark.asyncio
+
+
+class SlowLLMClient:
+    """Answers every prompt once the gate opens, counting the calls it receives"""
+
+    def __init__(self):
+        self.calls = 0
+        self.gate = asyncio.Event()
+
+    async def analyze(self, prompt, temperature=0.1):
+        self.calls += 1
+        await self.gate.wait()
+        return {"prompt": prompt, "items": []}
+
+
+async def test_identical_concurrent_calls_share_one_request():
+    llm = SlowLLMClient()
+    dedup = InFlightDedup(llm)
+
+    calls = [asyncio.create_task(dedup.analyze("show properties")) for _ in range(3)]
+    await asyncio.sleep(0)
+    llm.gate.set()
+    results = await asyncio.gather(*calls)
+
+    assert llm.calls == 1
+    assert all(result == {"prompt": "show properties", "items": []} for result in results)
+    assert results[0]["items"] is not results[1]["items"]
+
+
+async def test_cancelling_the_first_caller_keeps_the_call_for_waiters():
+    llm = SlowLLMClient()
+    dedup = InFlightDedup(llm)
+
+    leader = asyncio.create_task(dedup.analyze("show properties"))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(dedup.analyze("show properties"))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    await asyncio.sleep(0)
+    llm.gate.set()
+
+    assert await waiter == {"prompt": "show properties", "items": []}
+    assert leader.cancelled()
+    assert llm.calls == 1
+
+
+async def test_failed_call_is_not_reused():
+    class FailingOnceLLMClient:
+        calls = 0
+
+        async def analyze(self, prompt, temperature=0.1):
+            self.calls += 1
+            if self.calls == 1:
+                raise RuntimeError("provider down")
+            return {"ok": True}
+
+    dedup = InFlightDedup(FailingOnceLLMClient())
+
+    with pytest.raises(RuntimeError):
+        await dedup.analyze("show properties")
+    assert await dedup.analyze("show properties") == {"ok": True}
@@ -0,0 +1,113 @@
+"""
+Tests for SemanticPlanCache
+"""
+
+import asyncio
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from fantastic_router_core.models.actions import ActionPlan, ActionType, EntityMatch
+from fantastic_router_core.planning import plan_cache as plan_cache_module
+from fantastic_router_core.planning.plan_cache import SemanticPlanCache
+
+pytestmark = pytest.mark.asyncio
+
+# Unit vectors standing in for sentence embeddings; paraphrases share a direction
+EMBEDDINGS = {
+    "show properties": [1.0, 0.0, 0.0],
+    "list properties": [1.0, 0.0, 0.0],
+    "show tenants": [0.0, 1.0, 0.0],
+    "show john smith's income": [0.0, 0.0, 1.0],
+    "show john doe's income": [0.0, 0.0, 1.0],
+    "show johnson smith's income": [0.0, 0.0, 1.0],
+}
+
+
+def make_plan(route: str, entities=()) -> ActionPlan:
+    return ActionPlan(
+        action_type=ActionType.NAVIGATE,
+        route=route,
+        confidence=0.9,
+        entities=[
+            EntityMatch(id=entity_id, name=name, table="users", confidence=0.9)
+            for entity_id, name in entities
+        ],
+        reasoning="test"
+    )
+
+
+def make_cache(monkeypatch, **kwargs) -> SemanticPlanCache:
+    """Build a cache whose semantic tier uses the fixed vectors above instead of a model"""
+    monkeypatch.setattr(plan_cache_module, "np", np)
+
+    cache = SemanticPlanCache(semantic=False, **kwargs)
+    cache.model = object()
+    cache._vectors = np.zeros((cache.max_entries, 3), dtype=np.float32)
+
+    async def embed(query):
+        return np.asarray(EMBEDDINGS[query.lower()], dtype=np.float32)
+
+    cache._embed = embed
+    return cache
+
+
+async def test_semantic_hit_for_paraphrase(monkeypatch):
+    cache = make_cache(monkeypatch)
+    await cache.put("show properties", "admin", 3, make_plan("/properties"))
+
+    plan = await cache.get("list properties", "admin", 3)
+
+    assert plan is not None and plan.route == "/properties"
+    assert cache.semantic_hits == 1
+
+
+async def test_scope_miss(monkeypatch):
+    cache = make_cache(monkeypatch)
+    await cache.put("show properties", "admin", 3, make_plan("/properties"))
+
+    assert await cache.get("show properties", "tenant", 3) is None
+    assert await cache.get("list properties", "admin", 5) is None
+    assert cache.misses == 2
+
+
+async def test_ttl_miss(monkeypatch):
+    cache = make_cache(monkeypatch, ttl_seconds=0)
+    await cache.put("show properties", "admin", 3, make_plan("/properties"))
+
+    assert await cache.get("show properties", "admin", 3) is None
+    assert await cache.get("list properties", "admin", 3) is None
+
+
+async def test_entity_guard_requires_every_name_token(monkeypatch):
+    cache = make_cache(monkeypatch)
+    plan = make_plan("/users/u1/financials", entities=[("u1", "John Smith")])
+    await cache.put("show John Smith's income", "admin", 3, plan)
+
+    assert await cache.get("show John Doe's income", "admin", 3) is None
+    assert await cache.get("show Johnson Smith's income", "admin", 3) is None
+
+
+async def test_put_during_get_embedding(monkeypatch):
+    cache = make_cache(monkeypatch)
+    await cache.put("show properties", "admin", 3, make_plan("/properties"))
+
+    gate = asyncio.Event()
+    embed = cache._embed
+
+    async def slow_embed(query):
+        if query == "list properties":
+            await gate.wait()
+        return await embed(query)
+
+    cache._embed = slow_embed
+
+    # Let get() reach its embedding await, then grow the entry list underneath it
+    lookup = asyncio.create_task(cache.get("list properties", "admin", 3))
+    await asyncio.sleep(0)
+    await cache.put("show tenants", "admin", 3, make_plan("/tenants"))
+    gate.set()
+
+    plan = await lookup
+    assert plan is not None and plan.route == "/properties"
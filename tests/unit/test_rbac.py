@@ -0,0 +1,72 @@
+"""
+Tests for route-level RBAC checks in FantasticRouter
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from fantastic_router_core import FantasticRouter
+from fantastic_router_core.models.site import DatabaseSchema, RoutePattern
+
+
+def make_router(patterns):
+    """Build a router whose only configuration is the given (pattern, required_roles) list"""
+    router = FantasticRouter.__new__(FantasticRouter)
+    router.config = SimpleNamespace(
+        route_patterns=[
+            RoutePattern(
+                pattern=pattern,
+                name=f"pattern_{index}",
+                description="test pattern",
+                intent_patterns=[],
+                required_roles=roles
+            )
+            for index, (pattern, roles) in enumerate(patterns)
+        ],
+        database_schema=DatabaseSchema(tables={})
+    )
+    router._build_config_caches()
+    return router
+
+
+# Expected results are those of the original linear scan over the configured patterns:
+# the first pattern (in config order) with the same segment count whose literal segments
+# match decides, and a route no pattern matches is allowed.
+@pytest.mark.parametrize("patterns, route, role, allowed", [
+    # Overlapping literal and placeholder patterns: config order wins, not specificity
+    ([("/{entity_type}/{entity_id}", ["admin"]), ("/landlords/{id}", None)], "/landlords/5", "tenant", False),
+    ([("/landlords/{id}", None), ("/{entity_type}/{entity_id}", ["admin"])], "/landlords/5", "tenant", True),
+    ([("/{entity_type}/{entity_id}", ["admin"]), ("/landlords/{id}", None)], "/tenants/5", "admin", True),
+    # A literal branch that dead-ends deeper still falls back to a wildcard match
+    ([("/landlords/new", ["admin"]), ("/{t}/{id}/edit", ["manager"])], "/landlords/new/edit", "manager", True),
+    ([("/landlords/new", ["admin"]), ("/{t}/{id}/edit", ["manager"])], "/landlords/new/edit", "admin", False),
+    # The same pattern shape listed twice: the first one decides
+    ([("/reports/{id}", ["admin"]), ("/reports/{report_id}", ["tenant"])], "/reports/7", "tenant", False),
+    ([("/reports/{id}", ["admin"]), ("/reports/{report_id}", ["tenant"])], "/reports/7", "admin", True),
+    # Empty segments from "//" are matched by placeholders
+    ([("/{a}/{b}/{c}", ["admin"])], "/landlords//financials", "tenant", False),
+    ([("/landlords/{id}/financials", ["admin"])], "/landlords//financials", "admin", True),
+    # Root routes
+    ([("/", ["admin"])], "/", "tenant", False),
+    ([("/", ["admin"])], "", "admin", True),
+    ([("/{page}", ["admin"])], "/", "tenant", False),
+    # Patterns without required roles allow everyone
+    ([("/properties/{id}", None)], "/properties/3", "tenant", True),
+    # No matching pattern falls back to allow
+    ([("/landlords/{id}", ["admin"])], "/landlords/5/financials", "tenant", True),
+    ([("/landlords/{id}", ["admin"])], "/tenants", "tenant", True),
+    ([], "/anything", "tenant", True),
+])
+def test_check_route_permissions(patterns, route, role, allowed):
+    router = make_router(patterns)
+    assert router._check_route_permissions(route, role) is allowed
+
+
+def test_refresh_config_rebuilds_the_index():
+    router = make_router([("/landlords/{id}", ["admin"])])
+    assert router._check_route_permissions("/landlords/5", "tenant") is False
+
+    router.config.route_patterns[0].required_roles = None
+    router._build_config_caches()
+    assert router._check_route_permissions("/landlords/5", "tenant") is True